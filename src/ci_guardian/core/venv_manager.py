@@ -8,8 +8,12 @@ entornos virtuales de Python en diferentes plataformas (Linux/Windows/macOS).
 import logging
 import os
 import platform
+import re
+import stat
 import subprocess  # nosec B404 - subprocess is needed for venv creation with shell=False
 import sys
+import venv
+from functools import cache
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -19,6 +23,27 @@ VENV_NAMES = ["venv", ".venv", "env", ".env", "ENV"]
 
 # Caracteres peligrosos para nombres de venv
 CARACTERES_PELIGROSOS = {";", "&", "|", "$", "`", "\n", "\r", ":"}
+_PATRON_CARACTERES_PELIGROSOS = re.compile(
+    "[" + re.escape("".join(sorted(CARACTERES_PELIGROSOS))) + "]", re.ASCII
+)
+
+# Nombres de dispositivo reservados en Windows (sin importar extensión ni mayúsculas)
+NOMBRES_RESERVADOS_WINDOWS = frozenset(
+    {"CON", "PRN", "AUX", "NUL"}
+    | {f"COM{i}" for i in range(1, 10)}
+    | {f"LPT{i}" for i in range(1, 10)}
+)
+
+
+@cache
+def _sistema() -> str:
+    """
+    Retorna platform.system(), consultado una sola vez por proceso.
+
+    El sistema operativo no cambia durante la ejecución; los tests que
+    mockean platform.system deben limpiar la caché con _sistema.cache_clear().
+    """
+    return platform.system()
 
 
 def obtener_python_ejecutable(ruta_venv: Path) -> Path:
@@ -40,25 +65,23 @@ def obtener_python_ejecutable(ruta_venv: Path) -> Path:
         >>> print(python_exe)
         /home/user/proyecto/venv/bin/python
     """
-    sistema = platform.system()
+    sistema = _sistema()
 
     if sistema == "Windows":
-        python_path = ruta_venv / "Scripts" / "python.exe"
+        python_path = ruta_venv.joinpath("Scripts", "python.exe")
     else:
         # Linux, Darwin (macOS), y otros Unix-like
-        python_path = ruta_venv / "bin" / "python"
+        directorio_bin = ruta_venv / "bin"
+        python_path = directorio_bin / "python"
         # Si no existe python, intentar python3
         if not python_path.exists():
-            python_path = ruta_venv / "bin" / "python3"
-
-    # Resolver el path
-    python_path = python_path.resolve()
-
-    # Verificar que existe
-    if not python_path.exists():
-        raise FileNotFoundError(f"Ejecutable Python no encontrado en {ruta_venv}")
+            python_path = directorio_bin / "python3"
 
-    return python_path
+    # Resolver el path verificando a la vez que existe
+    try:
+        return python_path.resolve(strict=True)
+    except (FileNotFoundError, NotADirectoryError) as e:
+        raise FileNotFoundError(f"Ejecutable Python no encontrado en {ruta_venv}") from e
 
 
 def esta_en_venv() -> bool:
@@ -74,12 +97,8 @@ def esta_en_venv() -> bool:
         >>> if esta_en_venv():
         ...     print("Ejecutando dentro de un venv")
     """
-    # Check 1: sys.prefix != sys.base_prefix
-    if sys.prefix != sys.base_prefix:
-        return True
-
-    # Check 2: Variable de entorno VIRTUAL_ENV
-    return bool(os.environ.get("VIRTUAL_ENV"))
+    # sys.prefix != sys.base_prefix, o variable de entorno VIRTUAL_ENV no vacía
+    return sys.prefix != sys.base_prefix or bool(os.environ.get("VIRTUAL_ENV"))
 
 
 def validar_venv(ruta_venv: Path) -> bool:
@@ -100,20 +119,18 @@ def validar_venv(ruta_venv: Path) -> bool:
         ...     print("Venv válido")
     """
     try:
-        # Verificar que la ruta existe y es un directorio
-        if not ruta_venv.exists() or not ruta_venv.is_dir():
-            return False
-
-        # Obtener el ejecutable Python
+        # Obtener el ejecutable Python (FileNotFoundError si el venv no existe,
+        # no es un directorio o no tiene ejecutable)
         python_exe = obtener_python_ejecutable(ruta_venv)
 
-        # Verificar que el ejecutable existe
-        if not python_exe.exists():
+        # Un único stat: debe ser un archivo regular
+        modo = python_exe.stat().st_mode
+        if not stat.S_ISREG(modo):
             return False
 
         # En Linux/macOS, verificar permisos de ejecución
         # En Windows, siempre retorna True si el ejecutable existe
-        return platform.system() == "Windows" or bool(python_exe.stat().st_mode & 0o111)
+        return _sistema() == "Windows" or bool(modo & 0o111)
 
     except (FileNotFoundError, PermissionError, OSError):
         # Cualquier error indica que el venv no es válido
@@ -139,8 +156,18 @@ def detectar_venv(ruta_proyecto: Path) -> Path | None:
         ...     print(f"Venv encontrado: {venv}")
     """
     try:
+        # Un único listado del proyecto en lugar de un stat por candidato.
+        # Se compara en minúsculas para respetar los filesystems que no
+        # distinguen mayúsculas (Windows, macOS); en Linux, validar_venv
+        # descarta el candidato si el nombre exacto no existe.
+        with os.scandir(ruta_proyecto) as entradas:
+            nombres = {entrada.name.lower() for entrada in entradas}
+
         # Buscar cada nombre de venv en orden de prioridad
         for nombre_venv in VENV_NAMES:
+            if nombre_venv.lower() not in nombres:
+                continue
+
             ruta_venv = ruta_proyecto / nombre_venv
 
             # Verificar si el venv existe y es válido
@@ -156,20 +183,24 @@ def detectar_venv(ruta_proyecto: Path) -> Path | None:
         return None
 
 
-def crear_venv(ruta_proyecto: Path, nombre_venv: str = "venv") -> Path:
+def crear_venv(ruta_proyecto: Path, nombre_venv: str = "venv", en_proceso: bool = False) -> Path:
     """
     Crea un nuevo entorno virtual.
 
     Args:
         ruta_proyecto: Path al directorio del proyecto
         nombre_venv: Nombre del directorio del venv (por defecto "venv")
+        en_proceso: Si True, usa venv.EnvBuilder en el proceso actual en lugar
+            de lanzar `python -m venv` (ahorra el arranque de un intérprete,
+            pero sin timeout)
 
     Returns:
         Path al venv creado
 
     Raises:
-        RuntimeError: Si la creación falla o el venv no es válido
+        RuntimeError: Si ruta_proyecto no existe, la creación falla o el venv no es válido
         ValueError: Si nombre_venv contiene caracteres peligrosos
+        PermissionError: Si ruta_proyecto existe pero no hay permisos de escritura
 
     Example:
         >>> proyecto = Path("/home/user/mi_proyecto")
@@ -183,19 +214,20 @@ def crear_venv(ruta_proyecto: Path, nombre_venv: str = "venv") -> Path:
 
     # 2. Rechazar paths absolutos (Linux/Windows)
     # Detecta: /path, \path, C:\path, D:/path, \\network\share, etc.
-    if Path(nombre_venv).is_absolute():
+    path_nombre = Path(nombre_venv)
+    if path_nombre.is_absolute():
         raise ValueError(f"Nombre de venv no válido (path absoluto): {nombre_venv}")
 
     # 3. Rechazar nombres reservados de Windows (CON, PRN, AUX, etc.)
-    try:
-        if Path(nombre_venv).is_reserved():
-            raise ValueError(f"Nombre de venv no válido (nombre reservado): {nombre_venv}")
-    except (AttributeError, NotImplementedError):
-        # is_reserved() no está disponible en todas las plataformas/versiones
-        pass
+    # Como PurePath.is_reserved() (obsoleto desde Python 3.13): se ignora la
+    # extensión y los espacios finales, así que "con.venv" también es reservado
+    if _sistema() == "Windows" and (
+        path_nombre.name.partition(".")[0].rstrip(" ").upper() in NOMBRES_RESERVADOS_WINDOWS
+    ):
+        raise ValueError(f"Nombre de venv no válido (nombre reservado): {nombre_venv}")
 
     # 4. Rechazar caracteres peligrosos
-    if any(c in nombre_venv for c in CARACTERES_PELIGROSOS):
+    if _PATRON_CARACTERES_PELIGROSOS.search(nombre_venv):
         raise ValueError(f"Nombre de venv no válido (caracteres peligrosos): {nombre_venv}")
 
     # Path al venv a crear
@@ -212,6 +244,39 @@ def crear_venv(ruta_proyecto: Path, nombre_venv: str = "venv") -> Path:
             "Path traversal detectado: el venv resuelto está fuera del proyecto"
         ) from err
 
+    # 6. Fallar antes de lanzar `python -m venv` si el proyecto no existe o no es escribible
+    if not ruta_proyecto.is_dir():
+        raise RuntimeError(
+            f"Error al crear el entorno virtual: el directorio del proyecto no existe: "
+            f"{ruta_proyecto}"
+        )
+    if not os.access(ruta_proyecto, os.W_OK):
+        raise PermissionError(
+            f"Error al crear el entorno virtual: sin permisos de escritura en {ruta_proyecto}"
+        )
+
+    if en_proceso:
+        try:
+            venv.EnvBuilder(with_pip=True, symlinks=os.name != "nt").create(ruta_venv)
+        except (OSError, subprocess.CalledProcessError) as err:
+            raise RuntimeError(f"Error al crear el entorno virtual: {err}") from err
+    else:
+        _crear_venv_subprocess(ruta_venv)
+
+    # Validar que el venv creado es funcional
+    if not validar_venv(ruta_venv):
+        raise RuntimeError("El entorno virtual creado no es válido")
+
+    return ruta_venv
+
+
+def _crear_venv_subprocess(ruta_venv: Path) -> None:
+    """
+    Crea el venv lanzando `python -m venv` con timeout.
+
+    Raises:
+        RuntimeError: Si el comando falla o supera el timeout
+    """
     # Comando para crear venv
     comando = [sys.executable, "-m", "venv", str(ruta_venv)]
 
@@ -232,9 +297,3 @@ def crear_venv(ruta_proyecto: Path, nombre_venv: str = "venv") -> Path:
 
     except subprocess.TimeoutExpired as err:
         raise RuntimeError("Timeout al crear el entorno virtual (más de 5 minutos)") from err
-
-    # Validar que el venv creado es funcional
-    if not validar_venv(ruta_venv):
-        raise RuntimeError("El entorno virtual creado no es válido")
-
-    return ruta_venv
@@ -13,6 +13,7 @@ El sistema de tokens previene que los usuarios bypasseen las validaciones
 usando 'git commit --no-verify'.
 """
 
+import subprocess
 import sys
 from pathlib import Path
 
@@ -22,18 +23,47 @@ from ci_guardian.validators.no_verify_blocker import (
 )
 
 
-def main() -> int:
+def obtener_branch_ref(repo_path: Path) -> str | None:
+    """
+    Obtiene la referencia del branch actual leyendo .git/HEAD.
+
+    Equivale a 'git symbolic-ref HEAD' pero sin lanzar un proceso git.
+
+    Args:
+        repo_path: Path al repositorio Git
+
+    Returns:
+        Referencia del branch (ej: "refs/heads/master"), o None si HEAD
+        está detached o no se puede leer
+    """
+    try:
+        contenido = (repo_path / ".git" / "HEAD").read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    if not contenido.startswith("ref: "):
+        # HEAD detached (contiene un SHA, no una referencia simbólica)
+        return None
+    return contenido[len("ref: ") :]
+
+
+def main(repo_path: Path | None = None) -> int:
     """
     Ejecuta validación post-commit.
 
     Verifica que el commit haya pasado por pre-commit usando el sistema de tokens.
     Si no hay token (commit con --no-verify), revierte el commit.
 
+    Args:
+        repo_path: Path al repositorio Git (por defecto, el directorio actual,
+            que es donde git ejecuta los hooks)
+
     Returns:
         0 si token válido (commit normal), 1 si commit revertido (bypass detectado)
     """
     try:
-        repo_path = Path.cwd()
+        if repo_path is None:
+            repo_path = Path.cwd()
 
         # Intentar validar y consumir token
         token_valido = validar_y_consumir_token(repo_path)
@@ -63,26 +93,22 @@ def main() -> int:
 
         if not exito and "No hay commits para revertir" in mensaje:
             # Caso especial: root commit (primer commit del repo)
-            # En este caso, eliminar el branch actual y recrearlo
-            import subprocess
-
-            resultado_branch = subprocess.run(
-                ["git", "symbolic-ref", "HEAD"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                shell=False,
-            )
-
-            if resultado_branch.returncode == 0:
-                branch_ref = resultado_branch.stdout.strip()
+            # En este caso, eliminar el branch actual (queda "unborn" con los
+            # cambios en stage). El branch se lee de .git/HEAD para lanzar un
+            # único proceso git (update-ref) en vez de dos.
+            branch_ref = obtener_branch_ref(repo_path)
+            resultado_update = None
+            if branch_ref:
                 # Eliminar el branch actual (ej: refs/heads/master)
-                subprocess.run(
+                resultado_update = subprocess.run(
                     ["git", "update-ref", "-d", branch_ref],
                     cwd=repo_path,
                     capture_output=True,
+                    text=True,
                     shell=False,
                 )
+
+            if resultado_update is not None and resultado_update.returncode == 0:
                 print("   ✅ Root commit revertido exitosamente", file=sys.stderr)
                 print("", file=sys.stderr)
                 print("💡 Tus cambios se mantienen en el staging area.", file=sys.stderr)
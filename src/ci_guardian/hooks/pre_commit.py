@@ -72,7 +72,7 @@ def obtener_archivos_python_staged(repo_path: Path) -> list[Path]:
         sys.exit(1)
 
 
-def main() -> int:
+def main(repo_path: Path | None = None) -> int:
     """
     Ejecuta validaciones pre-commit.
 
@@ -85,6 +85,10 @@ def main() -> int:
     5. Si todas pasan → generar token
     6. Si alguna falla → exit 1 (rechazar commit)
 
+    Args:
+        repo_path: Path al repositorio Git (por defecto, el directorio actual,
+            que es donde git ejecuta los hooks)
+
     Returns:
         0 si todas las validaciones pasan, 1 si alguna falla
 
@@ -97,7 +101,8 @@ def main() -> int:
         triggers que justificarían crear hook_runner.py en el futuro.
     """
     try:
-        repo_path = Path.cwd()
+        if repo_path is None:
+            repo_path = Path.cwd()
 
         print("🔍 CI Guardian pre-commit hook ejecutándose...")
 
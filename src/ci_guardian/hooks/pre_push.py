@@ -3,6 +3,7 @@
 Este hook ejecuta validaciones antes de permitir un push al repositorio:
 - Ejecuta tests con pytest
 - Ejecuta GitHub Actions localmente (si está configurado)
+- Ejecuta la auditoría de seguridad con Bandit y Safety (si está configurada)
 
 Este módulo fue originalmente documentado en v0.1.0 pero no implementado,
 causando el bug crítico ModuleNotFoundError. Implementación en v0.2.0.
@@ -69,10 +70,66 @@ def _ejecutar_github_actions(repo_path: Path) -> tuple[bool, str]:
         return False, f"✗ Error ejecutando GitHub Actions: {e}"
 
 
-def main() -> int:
+def _ejecutar_auditoria_seguridad(repo_path: Path) -> tuple[bool, str]:
+    """
+    Ejecuta Bandit y Safety en paralelo sobre el repositorio.
+
+    Solo bloquea el push si hay vulnerabilidades HIGH (Bandit) o dependencias
+    con CVEs (Safety). Si una herramienta no está instalada o falla, avisa y
+    continúa, igual que pre-commit con Bandit.
+
+    Args:
+        repo_path: Ruta al repositorio
+
+    Returns:
+        Tupla (éxito: bool, mensaje: str)
+    """
+    from ci_guardian.validators.security import ejecutar_auditoria_seguridad
+
+    archivo_deps = next(
+        (
+            repo_path / nombre
+            for nombre in ("pyproject.toml", "requirements.txt")
+            if (repo_path / nombre).exists()
+        ),
+        None,
+    )
+
+    try:
+        _, resultados_bandit, vulnerabilidades = ejecutar_auditoria_seguridad(
+            repo_path, archivo_deps
+        )
+    except Exception as e:
+        return False, f"✗ Error ejecutando auditoría de seguridad: {e}"
+
+    avisos = []
+    if "error" in resultados_bandit:
+        avisos.append(f"⚠️  Bandit omitido: {resultados_bandit['error']}")
+    avisos.extend(f"⚠️  Safety omitido: {v['error']}" for v in vulnerabilidades if "error" in v)
+
+    high_count = sum(
+        1 for r in resultados_bandit.get("results", []) if r.get("issue_severity") == "HIGH"
+    )
+    cve_count = sum(1 for v in vulnerabilidades if "error" not in v)
+
+    if high_count or cve_count:
+        mensaje = (
+            f"✗ Auditoría de seguridad fallida: {high_count} vulnerabilidad(es) HIGH (Bandit), "
+            f"{cve_count} dependencia(s) con CVEs (Safety)"
+        )
+        return False, "\n   ".join([mensaje, *avisos])
+
+    return True, "\n   ".join(["✓ Sin vulnerabilidades HIGH ni CVEs conocidos", *avisos])
+
+
+def main(repo_path: Path | None = None) -> int:
     """
     Punto de entrada principal del hook pre-push.
 
+    Args:
+        repo_path: Ruta al repositorio (por defecto, el directorio actual,
+            que es donde git ejecuta los hooks)
+
     Returns:
         0 si todas las validaciones pasan, 1 si alguna falla
 
@@ -90,7 +147,8 @@ def main() -> int:
         con el sistema de config protegida (hash SHA256).
     """
     # Obtener directorio del repositorio
-    repo_path = Path.cwd()
+    if repo_path is None:
+        repo_path = Path.cwd()
 
     print("🔍 Ejecutando validaciones pre-push...")
 
@@ -137,6 +195,14 @@ def main() -> int:
         if not exito:
             todas_exitosas = False
 
+    # Ejecutar auditoría de seguridad si está configurada
+    if "security" in validadores and todas_exitosas:
+        print("\n3. Ejecutando auditoría de seguridad (Bandit + Safety)...")
+        exito, mensaje = _ejecutar_auditoria_seguridad(repo_path)
+        print(f"   {mensaje}")
+        if not exito:
+            todas_exitosas = False
+
     if todas_exitosas:
         print("\n✅ Todas las validaciones pasaron. Push permitido.")
         return 0
@@ -50,11 +50,9 @@ def validar_path_seguro(path: Path | str, nombre_contexto: str = "path") -> Path
         - Validación de UNC paths en Windows
         - Resolución de paths y verificación de que estén dentro del repo
     """
-    # Convertir a Path si es string
-    path_obj = Path(path) if isinstance(path, str) else path
-
-    # Convertir a string para validación
-    path_str = str(path_obj)
+    # Validar sobre el string (un Path ya cachea su str): así no se construye
+    # un Path para los paths que se van a rechazar
+    path_str = path if isinstance(path, str) else str(path)
 
     # Validar path traversal básico
     # IMPORTANTE: Cualquier ocurrencia de ".." es sospechosa y se rechaza
@@ -65,4 +63,5 @@ def validar_path_seguro(path: Path | str, nombre_contexto: str = "path") -> Path
             f"ruta inválida fuera del proyecto"
         )
 
-    return path_obj
+    # Convertir a Path si es string
+    return Path(path) if isinstance(path, str) else path
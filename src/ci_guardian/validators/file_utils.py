@@ -6,6 +6,8 @@ código duplicado entre cli.py y code_quality.py.
 
 from pathlib import Path
 
+from ci_guardian.validators.common import validar_path_seguro
+
 # Constante global para directorios excluidos
 DIRECTORIOS_EXCLUIDOS: set[str] = {
     "venv",
@@ -64,8 +66,6 @@ def filtrar_archivos_python_seguros(
     for archivo in archivos:
         # 1. Validar path traversal (seguridad crítica)
         if validar_path_traversal:
-            from ci_guardian.validators.common import validar_path_seguro
-
             validar_path_seguro(archivo, "archivo")
 
         # 2. Filtrar por extensión .py
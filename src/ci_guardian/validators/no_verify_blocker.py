@@ -74,34 +74,30 @@ def guardar_token(repo_path: Path, token: str) -> None:
         ValueError: Si repo no es válido o token vacío/inválido
         TypeError: Si token no es una cadena
     """
-    # Validar tipo de dato
+    # Validar el token completo ANTES de tocar el filesystem (validaciones
+    # baratas primero: tipo, longitud y contenido)
     if not isinstance(token, str):
         raise TypeError("Token debe ser una cadena de texto (str)")
 
-    # Validar que es un repositorio Git válido
-    if not (repo_path / ".git").is_dir():
-        raise ValueError("no es un repositorio Git válido")
-
-    # Validar que token no esté vacío
-    if not token or not token.strip():
-        raise ValueError("Token no puede estar vacío")
-
     # Validar longitud máxima (1KB es razonable para un token)
     if len(token) > 1000:
         raise ValueError("Token demasiado largo, excede el límite de 1000 caracteres")
 
-    # Validar que solo contenga caracteres seguros
-    # Permitir: a-z (minúsculas), 0-9, guión bajo
-    # Rechazar: caracteres peligrosos para command injection y mayúsculas
-    caracteres_peligrosos = {";", "|", "&", "$", "`", "(", ")", "<", ">", "\n", "\r", " ", "\t"}
-    if any(c in caracteres_peligrosos for c in token):
-        raise ValueError("Token contiene caracteres no permitidos")
+    # Validar que token no esté vacío
+    if not token.strip():
+        raise ValueError("Token no puede estar vacío")
 
-    # Validar que solo contenga minúsculas, dígitos y guión bajo
-    # NO permitir mayúsculas (para rechazar XYZ pero aceptar abc)
+    # Validar que solo contenga minúsculas, dígitos y guión bajo (una sola pasada).
+    # Esto ya rechaza los caracteres peligrosos para command injection
+    # (; | & $ ` ( ) < > espacios y saltos de línea) y las mayúsculas
+    # (para rechazar XYZ pero aceptar abc)
     if not all(c.islower() or c.isdigit() or c == "_" for c in token):
         raise ValueError("Token contiene caracteres no permitidos")
 
+    # Validar que es un repositorio Git válido
+    if not (repo_path / ".git").is_dir():
+        raise ValueError("no es un repositorio Git válido")
+
     # Path al archivo de token
     token_path = repo_path / ".git" / TOKEN_FILENAME
 
@@ -137,19 +133,26 @@ def validar_y_consumir_token(repo_path: Path) -> bool:
 
     token_path = repo_path / ".git" / TOKEN_FILENAME
 
-    # Verificar que existe
-    if not token_path.exists():
+    # Verificar que existe (un único stat: se reutiliza para permisos y tamaño)
+    try:
+        stat_token = token_path.stat()
+    except FileNotFoundError:
         return False
 
     # Verificar permisos seguros en Linux (rechazar solo 777)
     if platform.system() != "Windows":
-        permisos = token_path.stat().st_mode & 0o777
+        permisos = stat_token.st_mode & 0o777
         if permisos == 0o777:
             raise PermissionError(
                 f"Archivo de token tiene permisos inseguros: {oct(permisos)} "
                 "(demasiado permisivo, debe ser 600)"
             )
 
+    # Archivo vacío: inválido sin necesidad de leerlo
+    if stat_token.st_size == 0:
+        token_path.unlink()
+        return False
+
     try:
         # Leer token
         token = token_path.read_text(encoding="utf-8")
@@ -6,16 +6,157 @@ Este módulo ejecuta herramientas de auditoría de seguridad:
 - Safety: Vulnerability scanner para dependencias
 """
 
+import importlib.util
 import json
+import logging
+import multiprocessing
+import os
 import subprocess
+import sys
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from pathlib import Path
 from typing import Any
 
+# orjson es opcional (pip install ci-guardian[orjson]): parsea los reportes JSON
+# grandes de Bandit varias veces más rápido. Su JSONDecodeError hereda de
+# json.JSONDecodeError, así que el manejo de errores es el mismo.
+_json_loads: Callable[[str | bytes], Any]
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Directorios que Bandit no escanea (CLI y API)
+_BANDIT_EXCLUIDOS = "tests,venv,.git"
+
+# Tiempo máximo de un escaneo de Bandit en segundos (CLI y API)
+_TIMEOUT_BANDIT = 120
+
+# Separadores del reporte de seguridad (precalculados al importar el módulo)
+_SEPARADOR_DOBLE = "═" * 50
+_SEPARADOR_SIMPLE = "─" * 50
+
+
+def _decodificar(salida: bytes, limite: int | None = None) -> str:
+    """Decodifica (opcionalmente truncada) la salida en bytes de un proceso."""
+    return salida[:limite].decode("utf-8", errors="replace")
+
+
+@cache
+def _api_bandit_disponible() -> bool:
+    """Indica si Bandit es importable en este intérprete (sin importarlo)."""
+    return importlib.util.find_spec("bandit") is not None
+
+
+def _escanear_bandit_en_proceso(directorio: Path) -> dict[str, Any]:
+    """
+    Escanea un directorio con la API de Bandit, sin lanzar el CLI.
+
+    Evita el arranque de un intérprete nuevo en cada ejecución. El dict
+    resultante tiene la misma forma que el JSON de `bandit -f json`
+    (results con more_info, errors, metrics).
+
+    Args:
+        directorio: Path al directorio a escanear (ya validado)
+
+    Returns:
+        Dict con los resultados del escaneo
+    """
+    from bandit.core import config as bandit_config
+    from bandit.core import docs_utils
+    from bandit.core import manager as bandit_manager
+
+    # Los archivos que Bandit no puede analizar ya se devuelven en "errors":
+    # sus warnings por logging solo ensuciarían la salida del hook
+    logger_bandit = logging.getLogger("bandit")
+    nivel_anterior = logger_bandit.level
+    logger_bandit.setLevel(logging.CRITICAL)
+    try:
+        b_mgr = bandit_manager.BanditManager(bandit_config.BanditConfig(), "file", quiet=True)
+        b_mgr.discover_files([str(directorio)], recursive=True, excluded_paths=_BANDIT_EXCLUIDOS)
+        b_mgr.run_tests()
+    finally:
+        logger_bandit.setLevel(nivel_anterior)
+
+    resultados = [issue.as_dict() for issue in b_mgr.get_issue_list()]
+    for resultado in resultados:
+        resultado["more_info"] = docs_utils.get_url(resultado["test_id"])
+
+    return {
+        "results": sorted(resultados, key=lambda r: r["filename"]),
+        "errors": [{"filename": f, "reason": r} for f, r in b_mgr.get_skipped()],
+        "metrics": b_mgr.metrics.data,
+    }
+
+
+def _ejecutar_bandit_en_proceso(directorio: Path) -> tuple[bool, dict[str, Any]]:
+    """
+    Ejecuta _escanear_bandit_en_proceso con el mismo timeout y manejo de errores del CLI.
+
+    El escaneo corre en un proceso hijo de un Pool para que el timeout sea un
+    límite real: al superar _TIMEOUT_BANDIT segundos, pool.terminate() mata el
+    hijo y el hook no queda bloqueado. En Linux el hijo se crea con fork, que
+    no arranca un intérprete nuevo (el coste que evita la API frente al CLI).
+    """
+    contexto = multiprocessing.get_context("fork" if sys.platform == "linux" else None)
+    pool = contexto.Pool(processes=1)
+    try:
+        data: dict[str, Any] = pool.apply_async(_escanear_bandit_en_proceso, (directorio,)).get(
+            timeout=_TIMEOUT_BANDIT
+        )
+    except multiprocessing.TimeoutError:
+        return (
+            False,
+            {"error": f"timeout ejecutando Bandit después de {_TIMEOUT_BANDIT} segundos"},
+        )
+    except Exception as e:
+        return (False, {"error": f"Error al ejecutar Bandit: {e}"})
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return (_sin_vulnerabilidades_high(data), data)
+
+
+def _contiene_archivos_python(directorio: Path) -> bool:
+    """
+    Indica si hay algún archivo .py bajo el directorio.
+
+    Recorre con os.walk y corta en el primer .py, sin listar el árbol completo.
+    """
+    if directorio.is_file():
+        return directorio.suffix == ".py"
+
+    for _, _, archivos in os.walk(directorio):
+        if any(archivo.endswith(".py") for archivo in archivos):
+            return True
+    return False
+
+
+def _sin_vulnerabilidades_high(data: dict[str, Any]) -> bool:
+    """
+    Indica si un reporte de Bandit no contiene vulnerabilidades HIGH.
+
+    Nota: _totals a veces no se actualiza correctamente en Bandit,
+    mejor contar directamente desde results.
+    """
+    results = data.get("results", [])
+    return not any(r.get("issue_severity") == "HIGH" for r in results)
+
 
 def ejecutar_bandit(directorio: Path, formato: str = "json") -> tuple[bool, dict[str, Any]]:
     """
     Ejecuta Bandit en un directorio.
 
+    Con formato JSON, Bandit importable y sin archivo .bandit en el directorio,
+    escanea con su API en un proceso hijo (ver _ejecutar_bandit_en_proceso);
+    en otro caso ejecuta el CLI `bandit` como subproceso.
+
     Args:
         directorio: Path al directorio a escanear
         formato: Formato de output (json, txt, html)
@@ -42,6 +183,22 @@ def ejecutar_bandit(directorio: Path, formato: str = "json") -> tuple[bool, dict
     if not directorio.exists():
         raise ValueError(f"El directorio {directorio} no existe: directorio inválido")
 
+    # Sin archivos Python no hay nada que escanear: evitar arrancar Bandit
+    if formato == "json" and not _contiene_archivos_python(directorio):
+        return (
+            True,
+            {
+                "results": [],
+                "errors": [],
+                "metrics": {"_totals": {"HIGH": 0, "MEDIUM": 0, "LOW": 0}},
+            },
+        )
+
+    # Escaneo con la API (sin arranque de intérprete en Linux)
+    # El CLI aplica el .bandit del directorio escaneado y la API no: con uno presente, usar el CLI
+    if formato == "json" and _api_bandit_disponible() and not (directorio / ".bandit").is_file():
+        return _ejecutar_bandit_en_proceso(directorio)
+
     # Ejecutar bandit
     try:
         resultado = subprocess.run(
@@ -52,11 +209,13 @@ def ejecutar_bandit(directorio: Path, formato: str = "json") -> tuple[bool, dict
                 "-f",
                 formato,
                 "--exclude",
-                "tests,venv,.git",
+                _BANDIT_EXCLUIDOS,
             ],
             capture_output=True,
-            text=True,
-            timeout=120,
+            # Bytes: json/orjson parsean stdout sin decodificarlo antes, y
+            # stderr solo se decodifica si hace falta para diagnosticar
+            text=False,
+            timeout=_TIMEOUT_BANDIT,
             shell=False,  # CRÍTICO: prevenir command injection
         )
 
@@ -69,31 +228,35 @@ def ejecutar_bandit(directorio: Path, formato: str = "json") -> tuple[bool, dict
                         False,
                         {
                             "error": "Bandit no retornó output",
-                            "stderr": resultado.stderr[:200] if resultado.stderr else "Sin stderr",
+                            "stderr": (
+                                _decodificar(resultado.stderr, 200)
+                                if resultado.stderr
+                                else "Sin stderr"
+                            ),
                         },
                     )
 
-                data = json.loads(resultado.stdout)
+                data = _json_loads(resultado.stdout)
             except json.JSONDecodeError as e:
                 return (
                     False,
                     {
                         "error": "Error parseando output de Bandit: JSON inválido",
                         "detalle": str(e)[:100],
-                        "stdout_preview": resultado.stdout[:200],  # Primeros 200 chars para debug
-                        "stderr": resultado.stderr[:200] if resultado.stderr else "Sin stderr",
+                        # Primeros 200 bytes para debug
+                        "stdout_preview": _decodificar(resultado.stdout, 200),
+                        "stderr": (
+                            _decodificar(resultado.stderr, 200)
+                            if resultado.stderr
+                            else "Sin stderr"
+                        ),
                     },
                 )
         else:
-            data = {"raw": resultado.stdout}
+            data = {"raw": _decodificar(resultado.stdout)}
 
         # Verificar si hay vulnerabilidades HIGH
-        # Nota: _totals a veces no se actualiza correctamente en Bandit,
-        # mejor contar directamente desde results
-        results = data.get("results", [])
-        high_count = sum(1 for r in results if r.get("issue_severity") == "HIGH")
-
-        return (high_count == 0, data)
+        return (_sin_vulnerabilidades_high(data), data)
 
     except FileNotFoundError:
         # Bandit no está instalado
@@ -101,7 +264,10 @@ def ejecutar_bandit(directorio: Path, formato: str = "json") -> tuple[bool, dict
 
     except subprocess.TimeoutExpired:
         # Timeout ejecutando Bandit
-        return (False, {"error": "timeout ejecutando Bandit después de 120 segundos"})
+        return (
+            False,
+            {"error": f"timeout ejecutando Bandit después de {_TIMEOUT_BANDIT} segundos"},
+        )
 
 
 def ejecutar_safety(
@@ -158,7 +324,7 @@ def ejecutar_safety(
 
         # Parsear JSON de forma segura
         try:
-            vulnerabilidades = json.loads(resultado.stdout)
+            vulnerabilidades = _json_loads(resultado.stdout)
         except json.JSONDecodeError as e:
             return (
                 False,
@@ -186,6 +352,42 @@ def ejecutar_safety(
         return (False, [])
 
 
+def ejecutar_auditoria_seguridad(
+    directorio: Path, archivo_deps: Path | None = None
+) -> tuple[bool, dict[str, Any], list[dict[str, Any]]]:
+    """
+    Ejecuta Bandit y Safety concurrentemente.
+
+    Ambos escaneos corren fuera del intérprete actual (Safety como subproceso,
+    Bandit como subproceso o en un proceso hijo, ver ejecutar_bandit), así que se
+    lanzan en paralelo: el tiempo total se acerca a max(T_bandit, T_safety) en
+    lugar de la suma. Lo usa el hook pre-push con el validador "security".
+
+    Args:
+        directorio: Path al directorio a escanear con Bandit
+        archivo_deps: Path al archivo de dependencias para Safety
+                     Si es None, se auto-detecta
+
+    Returns:
+        Tupla (exito, resultados_bandit, vulnerabilidades_safety):
+        - exito: True si ambos escaneos pasan
+        - resultados_bandit: Dict con resultados de Bandit
+        - vulnerabilidades_safety: Lista de CVEs encontrados por Safety
+
+    Raises:
+        ValueError: Si el directorio es inválido (ver ejecutar_bandit)
+        FileNotFoundError: Si archivo_deps no existe (ver ejecutar_safety)
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futuro_bandit = executor.submit(ejecutar_bandit, directorio)
+        futuro_safety = executor.submit(ejecutar_safety, archivo_deps)
+
+        bandit_ok, resultados_bandit = futuro_bandit.result()
+        safety_ok, vulnerabilidades_safety = futuro_safety.result()
+
+    return (bandit_ok and safety_ok, resultados_bandit, vulnerabilidades_safety)
+
+
 def generar_reporte_seguridad(
     resultados_bandit: dict[str, Any], vulnerabilidades_safety: list[dict[str, Any]]
 ) -> str:
@@ -212,14 +414,14 @@ def generar_reporte_seguridad(
 
     # Construir reporte
     reporte = []
-    reporte.append("═" * 50)
+    reporte.append(_SEPARADOR_DOBLE)
     reporte.append("    REPORTE DE AUDITORÍA DE SEGURIDAD")
-    reporte.append("═" * 50)
+    reporte.append(_SEPARADOR_DOBLE)
     reporte.append("")
 
     # Sección Bandit
     reporte.append("📊 BANDIT (Static Analysis Security Testing)")
-    reporte.append("─" * 50)
+    reporte.append(_SEPARADOR_SIMPLE)
     if high_count > 0:
         reporte.append(f"❌ Vulnerabilidades HIGH: {high_count}")
     else:
@@ -235,7 +437,7 @@ def generar_reporte_seguridad(
 
     # Sección Safety
     reporte.append("📦 SAFETY (Dependency Vulnerability Scanner)")
-    reporte.append("─" * 50)
+    reporte.append(_SEPARADOR_SIMPLE)
 
     if total_safety == 0:
         reporte.append("✅ No se encontraron vulnerabilidades en dependencias")
@@ -253,8 +455,8 @@ def generar_reporte_seguridad(
             reporte.append("")
 
     # Total
-    reporte.append("═" * 50)
+    reporte.append(_SEPARADOR_DOBLE)
     reporte.append(f"TOTAL: {total} vulnerabilidades encontradas")
-    reporte.append("═" * 50)
+    reporte.append(_SEPARADOR_DOBLE)
 
     return "\n".join(reporte)
@@ -112,43 +112,45 @@ exit /b 0
 """
 
 
-@pytest.fixture
-def venv_linux_mock(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def venv_linux_mock(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """
     Crea un entorno virtual mock para Linux/macOS.
 
+    Se crea una vez por módulo: los tests que lo usan solo LEEN el venv.
+
     Args:
-        tmp_path: Directorio temporal proporcionado por pytest
+        tmp_path_factory: Fábrica de directorios temporales de pytest
 
     Returns:
         Path al directorio del venv mock con estructura bin/python
     """
-    venv = tmp_path / "venv"
+    venv = tmp_path_factory.mktemp("venv_linux") / "venv"
     venv.mkdir()
     bin_dir = venv / "bin"
     bin_dir.mkdir()
     python_exe = bin_dir / "python"
-    python_exe.touch()
-    python_exe.chmod(0o755)
+    python_exe.touch(mode=0o755)
     # También crear python3 como symlink común
     python3_exe = bin_dir / "python3"
-    python3_exe.touch()
-    python3_exe.chmod(0o755)
+    python3_exe.touch(mode=0o755)
     return venv
 
 
-@pytest.fixture
-def venv_windows_mock(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def venv_windows_mock(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """
     Crea un entorno virtual mock para Windows.
 
+    Se crea una vez por módulo: los tests que lo usan solo LEEN el venv.
+
     Args:
-        tmp_path: Directorio temporal proporcionado por pytest
+        tmp_path_factory: Fábrica de directorios temporales de pytest
 
     Returns:
         Path al directorio del venv mock con estructura Scripts/python.exe
     """
-    venv = tmp_path / "venv"
+    venv = tmp_path_factory.mktemp("venv_windows") / "venv"
     venv.mkdir()
     scripts_dir = venv / "Scripts"
     scripts_dir.mkdir()
@@ -175,8 +177,7 @@ def proyecto_con_venv_linux(tmp_path: Path) -> Path:
     bin_dir = venv / "bin"
     bin_dir.mkdir()
     python_exe = bin_dir / "python"
-    python_exe.touch()
-    python_exe.chmod(0o755)
+    python_exe.touch(mode=0o755)
     return proyecto
 
 
@@ -220,23 +221,24 @@ def proyecto_con_dotvenv(tmp_path: Path) -> Path:
     bin_dir = venv / "bin"
     bin_dir.mkdir()
     python_exe = bin_dir / "python"
-    python_exe.touch()
-    python_exe.chmod(0o755)
+    python_exe.touch(mode=0o755)
     return proyecto
 
 
-@pytest.fixture
-def venv_corrupto(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def venv_corrupto(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """
     Crea un directorio venv corrupto (sin ejecutable Python).
 
+    Se crea una vez por módulo: los tests que lo usan solo LEEN el venv.
+
     Args:
-        tmp_path: Directorio temporal proporcionado por pytest
+        tmp_path_factory: Fábrica de directorios temporales de pytest
 
     Returns:
         Path al directorio del venv corrupto
     """
-    venv = tmp_path / "venv"
+    venv = tmp_path_factory.mktemp("venv_corrupto") / "venv"
     venv.mkdir()
     bin_dir = venv / "bin"
     bin_dir.mkdir()
@@ -244,22 +246,23 @@ def venv_corrupto(tmp_path: Path) -> Path:
     return venv
 
 
-@pytest.fixture
-def venv_sin_permisos(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def venv_sin_permisos(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """
     Crea un venv con ejecutable Python sin permisos de ejecución.
 
+    Se crea una vez por módulo: los tests que lo usan solo LEEN el venv.
+
     Args:
-        tmp_path: Directorio temporal proporcionado por pytest
+        tmp_path_factory: Fábrica de directorios temporales de pytest
 
     Returns:
         Path al directorio del venv sin permisos
     """
-    venv = tmp_path / "venv"
+    venv = tmp_path_factory.mktemp("venv_sin_permisos") / "venv"
     venv.mkdir()
     bin_dir = venv / "bin"
     bin_dir.mkdir()
     python_exe = bin_dir / "python"
-    python_exe.touch()
-    python_exe.chmod(0o644)  # Sin permisos de ejecución
+    python_exe.touch(mode=0o644)  # Sin permisos de ejecución
     return venv
@@ -13,6 +13,8 @@ Crean repositorios Git temporales reales y ejecutan comandos reales.
 
 from __future__ import annotations
 
+import platform
+import stat
 import subprocess
 from pathlib import Path
 
@@ -191,11 +193,7 @@ def test_debe_instalar_hooks_exitosamente_en_repo_limpio(repo_git_real: Path) ->
     assert "CI-GUARDIAN-HOOK" in pre_commit_content, "Hook debe tener marca CI-GUARDIAN-HOOK"
 
     # Assert: Permisos correctos en Linux (solo si no es Windows)
-    import platform
-
     if platform.system() != "Windows":
-        import stat
-
         permisos = pre_commit_path.stat().st_mode
         assert permisos & stat.S_IXUSR, "Hook debe tener permisos de ejecución"
 
@@ -0,0 +1,37 @@
+"""
+Fixtures compartidas para los tests unitarios.
+
+Los tests unitarios NUNCA deben lanzar procesos reales (git, pytest, ruff...).
+Los tests que necesiten subprocess.run deben mockearlo explícitamente.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _sin_subprocess_real(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Reemplaza subprocess.run por un stub que falla si se llama sin mockear.
+
+    Un patch explícito en el test (patch/mocker/monkeypatch) lo sustituye,
+    y al terminar vuelve a quedar este stub.
+    """
+    monkeypatch.setattr(
+        "subprocess.run",
+        MagicMock(side_effect=AssertionError("subprocess.run no mockeado en test unitario")),
+    )
+
+
+@pytest.fixture
+def subprocess_run(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """
+    Reemplaza subprocess.run por un MagicMock que cada test configura.
+
+    Sustituye al stub de _sin_subprocess_real, y monkeypatch lo restaura en el
+    teardown del test, sin un `with patch(...)` por test.
+    """
+    mock_run = MagicMock()
+    monkeypatch.setattr("subprocess.run", mock_run)
+    return mock_run
@@ -8,6 +8,7 @@ Fase RED del TDD: TODOS los tests deben FALLAR inicialmente.
 from __future__ import annotations
 
 import platform
+from importlib import import_module
 from pathlib import Path
 from unittest.mock import patch
 
@@ -1328,8 +1329,6 @@ def test_debe_validar_que_todos_los_hooks_esperados_tienen_modulo_correspondient
 
     Previene: ModuleNotFoundError en runtime cuando se ejecuta el hook
     """
-    from importlib import import_module
-
     from ci_guardian.cli import HOOKS_ESPERADOS
 
     for hook_name in HOOKS_ESPERADOS:
@@ -5,12 +5,21 @@ Este módulo contiene todos los tests necesarios para validar el sistema de toke
 que previene el uso de `git commit --no-verify` para saltarse los hooks.
 """
 
+import inspect
 import platform
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
+from ci_guardian.validators.no_verify_blocker import (
+    generar_token_seguro,
+    guardar_token,
+    revertir_ultimo_commit,
+    validar_y_consumir_token,
+    verificar_commit_sin_hooks,
+)
+
 
 class TestGeneracionTokens:
     """Tests para la generación de tokens criptográficamente seguros."""
@@ -18,8 +27,6 @@ class TestGeneracionTokens:
     def test_debe_generar_token_con_longitud_minima(self) -> None:
         """Debe generar token de al menos 32 caracteres (256 bits)."""
         # Act
-        from ci_guardian.validators.no_verify_blocker import generar_token_seguro
-
         token = generar_token_seguro()
 
         # Assert
@@ -30,9 +37,6 @@ class TestGeneracionTokens:
 
     def test_debe_generar_tokens_unicos(self) -> None:
         """Cada invocación debe generar un token diferente."""
-        # Arrange
-        from ci_guardian.validators.no_verify_blocker import generar_token_seguro
-
         # Act
         token1 = generar_token_seguro()
         token2 = generar_token_seguro()
@@ -45,9 +49,6 @@ class TestGeneracionTokens:
 
     def test_debe_usar_secrets_module_no_random(self) -> None:
         """Debe usar el módulo secrets (criptográficamente seguro), no random."""
-        # Arrange
-        import inspect
-
         # Act & Assert
         # Verificar que el código usa secrets.token_hex
         from ci_guardian.validators import no_verify_blocker
@@ -62,8 +63,6 @@ class TestGeneracionTokens:
     def test_debe_generar_token_hexadecimal_valido(self) -> None:
         """Debe generar token en formato hexadecimal válido."""
         # Act
-        from ci_guardian.validators.no_verify_blocker import generar_token_seguro
-
         token = generar_token_seguro()
 
         # Assert
@@ -75,8 +74,6 @@ class TestGeneracionTokens:
     def test_debe_generar_token_sin_espacios_ni_saltos_linea(self) -> None:
         """Debe generar token sin espacios, saltos de línea u otros caracteres."""
         # Act
-        from ci_guardian.validators.no_verify_blocker import generar_token_seguro
-
         token = generar_token_seguro()
 
         # Assert
@@ -100,8 +97,6 @@ class TestGuardadoTokens:
     def test_debe_guardar_token_en_archivo_correcto(self, repo_mock: Path) -> None:
         """Debe guardar token en .git/CI_GUARDIAN_TOKEN."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         token = "a" * 64  # Token de ejemplo
 
         # Act
@@ -115,8 +110,6 @@ class TestGuardadoTokens:
     def test_debe_guardar_contenido_token_correctamente(self, repo_mock: Path) -> None:
         """Debe escribir el contenido del token exactamente como se proporcionó."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         token = "abc123def456" * 5  # Token de prueba
 
         # Act
@@ -130,8 +123,6 @@ class TestGuardadoTokens:
     def test_debe_sobrescribir_token_anterior_si_existe(self, repo_mock: Path) -> None:
         """Debe sobrescribir el token anterior sin error si ya existe."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         token_viejo = "old_token_12345" * 4
         token_nuevo = "new_token_67890" * 4
 
@@ -148,8 +139,6 @@ class TestGuardadoTokens:
     def test_debe_rechazar_repo_sin_directorio_git(self, tmp_path: Path) -> None:
         """Debe rechazar guardar token en directorio sin .git/."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         dir_no_repo = tmp_path / "no_repo"
         dir_no_repo.mkdir()
         token = "a" * 64
@@ -161,8 +150,6 @@ class TestGuardadoTokens:
     def test_debe_validar_path_para_prevenir_path_traversal(self, repo_mock: Path) -> None:
         """Debe prevenir path traversal en el nombre del archivo."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         token = "a" * 64
 
         # Act
@@ -178,8 +165,6 @@ class TestGuardadoTokens:
     def test_debe_crear_archivo_con_permisos_seguros(self, repo_mock: Path) -> None:
         """Debe crear archivo con permisos 600 (solo dueño lee/escribe)."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         token = "a" * 64
 
         # Act
@@ -194,8 +179,6 @@ class TestGuardadoTokens:
     def test_debe_rechazar_token_vacio(self, repo_mock: Path) -> None:
         """Debe rechazar guardar token vacío."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         token_vacio = ""
 
         # Act & Assert
@@ -217,8 +200,6 @@ class TestValidacionConsumoTokens:
     def test_debe_retornar_true_cuando_token_existe(self, repo_mock: Path) -> None:
         """Debe retornar True cuando el archivo de token existe y es válido."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
         token_path.write_text("valid_token_abc123" * 4, encoding="utf-8")
 
@@ -231,8 +212,6 @@ class TestValidacionConsumoTokens:
     def test_debe_retornar_false_cuando_token_no_existe(self, repo_mock: Path) -> None:
         """Debe retornar False cuando el archivo de token no existe."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         # No crear archivo de token
 
         # Act
@@ -244,8 +223,6 @@ class TestValidacionConsumoTokens:
     def test_debe_eliminar_archivo_token_despues_validar(self, repo_mock: Path) -> None:
         """Debe eliminar el archivo de token después de validarlo (consumir)."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
         token_path.write_text("valid_token_abc123" * 4, encoding="utf-8")
 
@@ -258,8 +235,6 @@ class TestValidacionConsumoTokens:
     def test_debe_retornar_false_cuando_token_esta_vacio(self, repo_mock: Path) -> None:
         """Debe retornar False cuando el archivo existe pero está vacío."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
         token_path.write_text("", encoding="utf-8")  # Archivo vacío
 
@@ -269,11 +244,24 @@ class TestValidacionConsumoTokens:
         # Assert
         assert resultado is False, "Debe retornar False cuando token está vacío"
 
+    def test_no_debe_leer_archivo_token_vacio(self, repo_mock: Path) -> None:
+        """Debe descartar un token vacío usando solo stat, sin leer el archivo."""
+        # Arrange
+        token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
+        token_path.write_text("", encoding="utf-8")
+
+        # Act
+        with patch.object(Path, "read_text") as mock_read:
+            resultado = validar_y_consumir_token(repo_mock)
+
+        # Assert
+        assert resultado is False, "Debe retornar False cuando token está vacío"
+        mock_read.assert_not_called()
+        assert not token_path.exists(), "Token vacío debe ser eliminado"
+
     def test_debe_retornar_false_cuando_token_solo_espacios(self, repo_mock: Path) -> None:
         """Debe retornar False cuando el token contiene solo espacios."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
         token_path.write_text("   \n\t  ", encoding="utf-8")  # Solo whitespace
 
@@ -286,8 +274,6 @@ class TestValidacionConsumoTokens:
     def test_debe_eliminar_token_invalido_despues_validar(self, repo_mock: Path) -> None:
         """Debe eliminar token inválido después de validar."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
         token_path.write_text("   ", encoding="utf-8")  # Token inválido
 
@@ -300,8 +286,6 @@ class TestValidacionConsumoTokens:
     def test_debe_rechazar_repo_sin_directorio_git(self, tmp_path: Path) -> None:
         """Debe rechazar validar en directorio sin .git/."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         dir_no_repo = tmp_path / "no_repo"
         dir_no_repo.mkdir()
 
@@ -312,8 +296,6 @@ class TestValidacionConsumoTokens:
     def test_debe_manejar_errores_permisos_lectura(self, repo_mock: Path) -> None:
         """Debe manejar errores cuando no hay permisos para leer el token."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
         token_path.write_text("valid_token" * 8, encoding="utf-8")
 
@@ -345,8 +327,6 @@ class TestRevocacionCommits:
     ) -> None:
         """Debe ejecutar 'git reset --soft HEAD~1' para revertir commit."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import revertir_ultimo_commit
-
         mock_subprocess.return_value = MagicMock(
             returncode=0, stdout="HEAD is now at abc1234", stderr=""
         )
@@ -370,8 +350,6 @@ class TestRevocacionCommits:
     ) -> None:
         """Debe ejecutar git en el directorio del repositorio (cwd)."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import revertir_ultimo_commit
-
         mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
 
         # Act
@@ -389,8 +367,6 @@ class TestRevocacionCommits:
     ) -> None:
         """Debe retornar (True, mensaje) cuando la reversión es exitosa."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import revertir_ultimo_commit
-
         mock_subprocess.return_value = MagicMock(
             returncode=0, stdout="HEAD is now at abc1234", stderr=""
         )
@@ -410,8 +386,6 @@ class TestRevocacionCommits:
     ) -> None:
         """Debe retornar (False, mensaje) cuando git reset falla."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import revertir_ultimo_commit
-
         mock_subprocess.return_value = MagicMock(
             returncode=1, stdout="", stderr="fatal: ambiguous argument 'HEAD~1'"
         )
@@ -431,8 +405,6 @@ class TestRevocacionCommits:
     ) -> None:
         """Debe manejar caso donde no hay commits para revertir."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import revertir_ultimo_commit
-
         mock_subprocess.return_value = MagicMock(
             returncode=128, stdout="", stderr="fatal: ambiguous argument 'HEAD~1': unknown revision"
         )
@@ -452,8 +424,6 @@ class TestRevocacionCommits:
     ) -> None:
         """Debe ejecutar subprocess con shell=False para prevenir command injection."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import revertir_ultimo_commit
-
         mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
 
         # Act
@@ -471,8 +441,6 @@ class TestRevocacionCommits:
     ) -> None:
         """Debe rechazar revertir en directorio sin .git/."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import revertir_ultimo_commit
-
         dir_no_repo = tmp_path / "no_repo"
         dir_no_repo.mkdir()
 
@@ -501,12 +469,6 @@ class TestWorkflowCompleto:
     ) -> None:
         """Debe validar commit normal (con pre-commit) exitosamente."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import (
-            generar_token_seguro,
-            guardar_token,
-            verificar_commit_sin_hooks,
-        )
-
         # Simular pre-commit: generar y guardar token
         token = generar_token_seguro()
         guardar_token(repo_mock, token)
@@ -526,8 +488,6 @@ class TestWorkflowCompleto:
     ) -> None:
         """Debe revertir commit hecho con --no-verify (sin token)."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import verificar_commit_sin_hooks
-
         # NO crear token (simular --no-verify)
         mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
 
@@ -548,12 +508,6 @@ class TestWorkflowCompleto:
     ) -> None:
         """Debe consumir (eliminar) token después de commit válido."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import (
-            generar_token_seguro,
-            guardar_token,
-            verificar_commit_sin_hooks,
-        )
-
         token = generar_token_seguro()
         guardar_token(repo_mock, token)
         token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
@@ -564,11 +518,14 @@ class TestWorkflowCompleto:
         # Assert
         assert not token_path.exists(), "Token debe ser consumido después de validar"
 
-    def test_debe_detectar_multiples_commits_sin_token(self, repo_mock: Path) -> None:
+    @patch(
+        "ci_guardian.validators.no_verify_blocker.subprocess.run",
+        return_value=Mock(returncode=128, stderr="fatal: not a git repository"),
+    )
+    def test_debe_detectar_multiples_commits_sin_token(
+        self, mock_subprocess: Mock, repo_mock: Path
+    ) -> None:
         """Debe detectar y rechazar múltiples commits consecutivos sin token."""
-        # Arrange
-        from ci_guardian.validators.no_verify_blocker import verificar_commit_sin_hooks
-
         # Act - Múltiples verificaciones sin token
         resultado1 = verificar_commit_sin_hooks(repo_mock)
         resultado2 = verificar_commit_sin_hooks(repo_mock)
@@ -581,13 +538,6 @@ class TestWorkflowCompleto:
 
     def test_workflow_completo_commit_valido(self, repo_mock: Path) -> None:
         """Test del workflow completo: generar token → validar → consumir."""
-        # Arrange
-        from ci_guardian.validators.no_verify_blocker import (
-            generar_token_seguro,
-            guardar_token,
-            validar_y_consumir_token,
-        )
-
         # Act
         # 1. Pre-commit: generar y guardar token
         token = generar_token_seguro()
@@ -618,8 +568,6 @@ class TestEdgeCasesSeguridad:
     def test_debe_rechazar_token_con_command_injection_attempt(self, repo_mock: Path) -> None:
         """Debe rechazar tokens con intentos de command injection."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         token_malicioso = "abc123; rm -rf /; echo"  # noqa: S105 (test value, not real password)
 
         # Act & Assert
@@ -630,8 +578,6 @@ class TestEdgeCasesSeguridad:
     def test_debe_rechazar_token_con_caracteres_especiales(self, repo_mock: Path) -> None:
         """Debe rechazar tokens con caracteres especiales peligrosos."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         tokens_peligrosos = [
             "abc$(whoami)def",
             "abc`ls -la`def",
@@ -647,8 +593,6 @@ class TestEdgeCasesSeguridad:
     def test_debe_validar_solo_caracteres_hexadecimales_en_token(self, repo_mock: Path) -> None:
         """Debe validar que token solo contenga caracteres hexadecimales."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         token_valido = "abc123def456" * 5  # Solo hex
         token_invalido = "abc123XYZ456" * 5  # Contiene X, Y, Z (no hex minúsculas)
 
@@ -665,8 +609,6 @@ class TestEdgeCasesSeguridad:
     def test_debe_prevenir_path_traversal_en_nombre_archivo(self, repo_mock: Path) -> None:
         """Debe prevenir path traversal en el path del archivo de token."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
-
         token = "a" * 64
 
         # Act
@@ -689,8 +631,6 @@ class TestEdgeCasesSeguridad:
         # Arrange
         import time
 
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
 
         # Test con token válido
@@ -718,12 +658,6 @@ class TestEdgeCasesSeguridad:
     ) -> None:
         """Debe manejar correctamente race conditions con múltiples commits rápidos."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import (
-            generar_token_seguro,
-            guardar_token,
-            verificar_commit_sin_hooks,
-        )
-
         mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
 
         # Act
@@ -744,8 +678,6 @@ class TestEdgeCasesSeguridad:
     def test_debe_manejar_archivo_token_corrupto(self, repo_mock: Path) -> None:
         """Debe manejar archivo de token corrupto o con contenido inválido."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
 
         # Escribir datos binarios inválidos
@@ -764,8 +696,6 @@ class TestEdgeCasesSeguridad:
     def test_debe_detectar_archivo_token_con_permisos_inseguros(self, repo_mock: Path) -> None:
         """Debe detectar y rechazar archivo de token con permisos inseguros."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import validar_y_consumir_token
-
         token_path = repo_mock / ".git" / "CI_GUARDIAN_TOKEN"
         token_path.write_text("a" * 64, encoding="utf-8")
         token_path.chmod(0o777)  # Permisos inseguros (todos pueden leer/escribir)
@@ -777,10 +707,6 @@ class TestEdgeCasesSeguridad:
     def test_debe_manejar_token_extremadamente_largo(self, repo_mock: Path) -> None:
         """Debe manejar tokens extremadamente largos sin problemas."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import (
-            guardar_token,
-        )
-
         # Token de 10KB (mucho más largo que los 64 chars esperados)
         token_largo = "a" * 10000
 
@@ -788,11 +714,17 @@ class TestEdgeCasesSeguridad:
         with pytest.raises(ValueError, match="demasiado largo|excede el límite"):
             guardar_token(repo_mock, token_largo)
 
-    def test_debe_validar_tipo_dato_token(self, repo_mock: Path) -> None:
-        """Debe validar que el token es del tipo correcto (str)."""
+    def test_debe_validar_token_antes_de_acceder_al_repo(self, tmp_path: Path) -> None:
+        """Debe rechazar un token inválido sin llegar a inspeccionar el repositorio."""
         # Arrange
-        from ci_guardian.validators.no_verify_blocker import guardar_token
+        dir_no_repo = tmp_path / "no_repo"
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="demasiado largo|excede el límite"):
+            guardar_token(dir_no_repo, "a" * 10000)
 
+    def test_debe_validar_tipo_dato_token(self, repo_mock: Path) -> None:
+        """Debe validar que el token es del tipo correcto (str)."""
         # Act & Assert
         with pytest.raises(TypeError, match="debe ser una cadena|debe ser str"):
             guardar_token(repo_mock, 12345)  # type: ignore[arg-type]
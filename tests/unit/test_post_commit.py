@@ -4,79 +4,78 @@ Este hook valida que el commit haya pasado por pre-commit (sistema de tokens)
 y revierte commits hechos con --no-verify.
 """
 
+import io
+import re
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from ci_guardian.hooks.post_commit import main, obtener_branch_ref
+
+# Patrones de los mensajes de bypass (compilados una vez por módulo).
+# El orden sigue al de la salida del hook: alerta → bypass → --no-verify,
+# y el tip (💡) antes del comando para rehacer el commit.
+PATRON_BYPASS_DETECTADO = re.compile(
+    r"🚨.*BYPASS DETECTADO.*--no-verify", re.IGNORECASE | re.DOTALL
+)
+PATRON_INSTRUCCIONES_REHACER = re.compile(r"💡.*git commit", re.DOTALL)
+
+
+@pytest.fixture
+def bypass_mocks(monkeypatch: pytest.MonkeyPatch) -> tuple[MagicMock, MagicMock]:
+    """
+    Escenario de commit con --no-verify: sin token y reversión exitosa.
+
+    Reemplaza validar_y_consumir_token y revertir_ultimo_commit en el
+    módulo del hook (donde se USAN). Los tests pasan tmp_path a main(tmp_path).
+
+    Returns:
+        Tupla (mock_validar, mock_revertir)
+    """
+    mock_validar = MagicMock(return_value=False)
+    mock_revertir = MagicMock(return_value=(True, "Commit revertido exitosamente"))
+    monkeypatch.setattr("ci_guardian.hooks.post_commit.validar_y_consumir_token", mock_validar)
+    monkeypatch.setattr("ci_guardian.hooks.post_commit.revertir_ultimo_commit", mock_revertir)
+    return mock_validar, mock_revertir
+
 
 class TestPostCommitTokenValidation:
     """Tests para validación de token post-commit."""
 
-    def test_debe_pasar_si_token_valido(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_debe_pasar_si_token_valido(self, tmp_path: Path) -> None:
         """Debe permitir commit si token existe (flujo normal)."""
-        # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.post_commit import main
-
         # Mock token válido (patchear donde se USA, no donde se DEFINE)
         with patch(
             "ci_guardian.hooks.post_commit.validar_y_consumir_token",
             return_value=True,
         ):
             # Act
-            resultado = main()
+            resultado = main(tmp_path)
 
         # Assert
         assert resultado == 0, "Debe retornar 0 si token es válido"
 
-    def test_debe_revertir_commit_sin_token(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    @pytest.mark.usefixtures("bypass_mocks")
+    def test_debe_revertir_commit_sin_token(self, tmp_path: Path) -> None:
         """Debe revertir commit si token no existe (--no-verify usado)."""
-        # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.post_commit import main
-
-        # Mock token inválido (--no-verify usado)
-        with patch(
-            "ci_guardian.hooks.post_commit.validar_y_consumir_token",
-            return_value=False,
-        ):
-            # Mock revertir_ultimo_commit exitoso
-            with patch(
-                "ci_guardian.hooks.post_commit.revertir_ultimo_commit",
-                return_value=(True, "Commit revertido exitosamente"),
-            ):
-                # Act
-                resultado = main()
+        # Act
+        resultado = main(tmp_path)
 
         # Assert
         assert resultado == 1, "Debe retornar 1 si commit fue revertido"
 
     def test_debe_llamar_a_revertir_si_no_hay_token(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, tmp_path: Path, bypass_mocks: tuple[MagicMock, MagicMock]
     ) -> None:
         """Debe llamar a revertir_ultimo_commit si no hay token."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
+        _, mock_revertir = bypass_mocks
 
-        from ci_guardian.hooks.post_commit import main
-
-        with patch(
-            "ci_guardian.hooks.post_commit.validar_y_consumir_token",
-            return_value=False,
-        ):
-            with patch(
-                "ci_guardian.hooks.post_commit.revertir_ultimo_commit",
-                return_value=(True, "Revertido"),
-            ) as mock_revertir:
-                # Act
-                main()
+        # Act
+        main(tmp_path)
 
         # Assert
         mock_revertir.assert_called_once_with(tmp_path)
@@ -85,256 +84,208 @@ class TestPostCommitTokenValidation:
 class TestPostCommitRootCommit:
     """Tests para manejo de root commit (primer commit del repo)."""
 
-    def test_debe_manejar_root_commit_sin_token(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_debe_manejar_root_commit_sin_token(self, tmp_path: Path) -> None:
         """Debe manejar root commit (primer commit) sin token."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        # Mock token inválido
-        with patch(
-            "ci_guardian.hooks.post_commit.validar_y_consumir_token",
-            return_value=False,
-        ):
-            # Mock revertir_ultimo_commit que falla porque es root commit
-            with patch(
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/master\n", encoding="utf-8")
+
+        # Mock subprocess para git update-ref (eliminar branch)
+        mock_update = subprocess.CompletedProcess(
+            args=["git", "update-ref", "-d", "refs/heads/master"],
+            returncode=0,
+            stdout="",
+            stderr="",
+        )
+
+        # Mock token inválido + revertir_ultimo_commit que falla porque es root commit
+        with (
+            patch("ci_guardian.hooks.post_commit.validar_y_consumir_token", return_value=False),
+            patch(
                 "ci_guardian.hooks.post_commit.revertir_ultimo_commit",
                 return_value=(False, "No hay commits para revertir"),
-            ):
-                # Mock subprocess para git symbolic-ref (detectar branch)
-                mock_symbolic = MagicMock()
-                mock_symbolic.returncode = 0
-                mock_symbolic.stdout = "refs/heads/master"
-
-                # Mock subprocess para git update-ref (eliminar branch)
-                mock_update = MagicMock()
-                mock_update.returncode = 0
-
-                with patch("subprocess.run", side_effect=[mock_symbolic, mock_update]):
-                    # Act
-                    from ci_guardian.hooks.post_commit import main
-
-                    resultado = main()
+            ),
+            patch("subprocess.run", return_value=mock_update) as mock_run,
+        ):
+            # Act
+            resultado = main(tmp_path)
 
         # Assert
         assert resultado == 1, "Debe retornar 1 después de revertir root commit"
-
-    def test_debe_manejar_error_al_revertir_root_commit(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Debe manejar error al revertir root commit."""
-        # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        with patch(
-            "ci_guardian.hooks.post_commit.validar_y_consumir_token",
-            return_value=False,
-        ):
-            with patch(
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0] == ["git", "update-ref", "-d", "refs/heads/master"]
+
+    def test_debe_manejar_error_al_revertir_root_commit(self, tmp_path: Path) -> None:
+        """Debe manejar error al revertir root commit (HEAD no legible)."""
+        with (
+            patch("ci_guardian.hooks.post_commit.validar_y_consumir_token", return_value=False),
+            patch(
                 "ci_guardian.hooks.post_commit.revertir_ultimo_commit",
                 return_value=(False, "No hay commits para revertir"),
-            ):
-                # Mock git symbolic-ref que falla
-                mock_symbolic = MagicMock()
-                mock_symbolic.returncode = 1
-
-                with patch("subprocess.run", return_value=mock_symbolic):
-                    # Act
-                    from ci_guardian.hooks.post_commit import main
-
-                    resultado = main()
+            ),
+            patch("subprocess.run") as mock_run,
+        ):
+            # Act
+            resultado = main(tmp_path)
 
         # Assert
         assert resultado == 1, "Debe retornar 1 en caso de error"
+        mock_run.assert_not_called()
 
-
-class TestPostCommitErrorHandling:
-    """Tests para manejo de errores del hook post-commit."""
-
-    def test_debe_manejar_error_al_revertir_commit_normal(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Debe manejar error al revertir commit normal (no root)."""
+    def test_obtener_branch_ref_debe_leer_head_simbolico(self, tmp_path: Path) -> None:
+        """Debe obtener la referencia del branch desde .git/HEAD."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        with patch(
-            "ci_guardian.hooks.post_commit.validar_y_consumir_token",
-            return_value=False,
-        ):
-            # Mock revertir_ultimo_commit que falla por otro motivo
-            with patch(
-                "ci_guardian.hooks.post_commit.revertir_ultimo_commit",
-                return_value=(False, "Error al ejecutar git reset"),
-            ):
-                # Act
-                from ci_guardian.hooks.post_commit import main
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
 
-                resultado = main()
+        # Act & Assert
+        assert obtener_branch_ref(tmp_path) == "refs/heads/main"
 
-        # Assert
-        assert resultado == 1, "Debe retornar 1 si falla al revertir"
-
-    def test_debe_manejar_value_error(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Debe manejar ValueError de validación."""
+    def test_obtener_branch_ref_debe_retornar_none_si_head_detached(self, tmp_path: Path) -> None:
+        """No debe devolver referencia si HEAD está detached (contiene un SHA)."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text("a" * 40 + "\n", encoding="utf-8")
 
-        # Mock que lanza ValueError
-        with patch(
-            "ci_guardian.hooks.post_commit.validar_y_consumir_token",
-            side_effect=ValueError("Error de validación"),
-        ):
-            # Act
-            from ci_guardian.hooks.post_commit import main
+        # Act & Assert
+        assert obtener_branch_ref(tmp_path) is None
 
-            resultado = main()
 
-        # Assert
-        assert resultado == 1, "Debe retornar 1 en caso de ValueError"
+class TestPostCommitErrorHandling:
+    """Tests para manejo de errores del hook post-commit."""
 
-    def test_debe_manejar_exception_generica(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    @pytest.mark.parametrize(
+        ("validar_kwargs", "resultado_revertir"),
+        [
+            pytest.param(
+                {"return_value": False},
+                (False, "Error al ejecutar git reset"),
+                id="error_al_revertir_commit_normal",
+            ),
+            pytest.param(
+                {"side_effect": ValueError("Error de validación")},
+                (True, "Revertido"),
+                id="value_error",
+            ),
+            pytest.param(
+                {"side_effect": Exception("Error inesperado")},
+                (True, "Revertido"),
+                id="exception_generica",
+            ),
+        ],
+    )
+    def test_debe_retornar_1_ante_errores(
+        self,
+        tmp_path: Path,
+        validar_kwargs: dict[str, object],
+        resultado_revertir: tuple[bool, str],
     ) -> None:
-        """Debe manejar excepciones genéricas."""
+        """Debe retornar 1 si falla la reversión (no root) o si la validación lanza excepción."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        # Mock que lanza Exception
-        with patch(
-            "ci_guardian.hooks.post_commit.validar_y_consumir_token",
-            side_effect=Exception("Error inesperado"),
+        with (
+            patch("ci_guardian.hooks.post_commit.validar_y_consumir_token", **validar_kwargs),
+            patch(
+                "ci_guardian.hooks.post_commit.revertir_ultimo_commit",
+                return_value=resultado_revertir,
+            ),
         ):
             # Act
-            from ci_guardian.hooks.post_commit import main
-
-            resultado = main()
+            resultado = main(tmp_path)
 
         # Assert
-        assert resultado == 1, "Debe retornar 1 en caso de excepción"
+        assert resultado == 1, "Debe retornar 1 en caso de error"
 
 
 class TestPostCommitMensajes:
-    """Tests para mensajes de salida del hook post-commit."""
+    """
+    Tests para mensajes de salida del hook post-commit.
 
+    El hook escribe con print(..., file=sys.stderr), así que basta con
+    reemplazar sys.stderr/sys.stdout por un io.StringIO (sin capsys).
+    """
+
+    @pytest.mark.usefixtures("bypass_mocks")
     def test_debe_mostrar_mensaje_de_bypass_detectado(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Debe mostrar mensaje claro cuando se detecta bypass."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
+        stderr = io.StringIO()
+        monkeypatch.setattr(sys, "stderr", stderr)
 
-        with patch(
-            "ci_guardian.hooks.post_commit.validar_y_consumir_token",
-            return_value=False,
-        ):
-            with patch(
-                "ci_guardian.hooks.post_commit.revertir_ultimo_commit",
-                return_value=(True, "Revertido"),
-            ):
-                # Act
-                from ci_guardian.hooks.post_commit import main
-
-                main()
+        # Act
+        main(tmp_path)
 
         # Assert
-        captured = capsys.readouterr()
-        assert "🚨" in captured.err, "Debe mostrar emoji de alerta"
-        assert "BYPASS DETECTADO" in captured.err.upper(), "Debe indicar bypass"
-        assert "--no-verify" in captured.err, "Debe mencionar --no-verify"
+        assert PATRON_BYPASS_DETECTADO.search(
+            stderr.getvalue()
+        ), "Debe mostrar alerta 🚨, indicar bypass detectado y mencionar --no-verify"
 
+    @pytest.mark.usefixtures("bypass_mocks")
     def test_debe_mostrar_instrucciones_para_rehacer_commit(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Debe mostrar instrucciones para rehacer commit sin --no-verify."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
+        stderr = io.StringIO()
+        monkeypatch.setattr(sys, "stderr", stderr)
 
-        with patch(
-            "ci_guardian.hooks.post_commit.validar_y_consumir_token",
-            return_value=False,
-        ):
-            with patch(
-                "ci_guardian.hooks.post_commit.revertir_ultimo_commit",
-                return_value=(True, "Revertido"),
-            ):
-                # Act
-                from ci_guardian.hooks.post_commit import main
-
-                main()
+        # Act
+        main(tmp_path)
 
         # Assert
-        captured = capsys.readouterr()
-        assert "git commit" in captured.err, "Debe mostrar comando git commit"
-        assert "💡" in captured.err, "Debe mostrar emoji de tip"
+        assert PATRON_INSTRUCCIONES_REHACER.search(
+            stderr.getvalue()
+        ), "Debe mostrar tip 💡 con el comando git commit"
 
     def test_no_debe_mostrar_mensajes_si_token_valido(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """No debe mostrar mensajes de error si token es válido."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", stdout)
+        monkeypatch.setattr(sys, "stderr", stderr)
 
         with patch(
             "ci_guardian.hooks.post_commit.validar_y_consumir_token",
             return_value=True,
         ):
             # Act
-            from ci_guardian.hooks.post_commit import main
-
-            main()
+            main(tmp_path)
 
         # Assert
-        captured = capsys.readouterr()
-        assert len(captured.err) == 0, "No debe mostrar mensajes de error en flujo normal"
-        assert len(captured.out) == 0, "No debe mostrar mensajes en stdout en flujo normal"
+        assert stderr.getvalue() == "", "No debe mostrar mensajes de error en flujo normal"
+        assert stdout.getvalue() == "", "No debe mostrar mensajes en stdout en flujo normal"
 
 
 class TestPostCommitIntegracion:
     """Tests de integración del hook post-commit."""
 
-    def test_workflow_completo_commit_normal(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_workflow_completo_commit_normal(self, tmp_path: Path) -> None:
         """Test de workflow completo para commit normal (con token)."""
         # Arrange - Simular commit normal que pasó por pre-commit
-        monkeypatch.chdir(tmp_path)
-
         with patch(
             "ci_guardian.hooks.post_commit.validar_y_consumir_token",
             return_value=True,
         ) as mock_validar:
             # Act
-            from ci_guardian.hooks.post_commit import main
-
-            resultado = main()
+            resultado = main(tmp_path)
 
         # Assert
         assert resultado == 0
         mock_validar.assert_called_once_with(tmp_path)
 
     def test_workflow_completo_commit_con_no_verify(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, tmp_path: Path, bypass_mocks: tuple[MagicMock, MagicMock]
     ) -> None:
         """Test de workflow completo para commit con --no-verify."""
         # Arrange - Simular commit con --no-verify (sin token)
-        monkeypatch.chdir(tmp_path)
+        mock_validar, mock_revertir = bypass_mocks
 
-        with patch(
-            "ci_guardian.hooks.post_commit.validar_y_consumir_token",
-            return_value=False,
-        ) as mock_validar:
-            with patch(
-                "ci_guardian.hooks.post_commit.revertir_ultimo_commit",
-                return_value=(True, "Commit revertido"),
-            ) as mock_revertir:
-                # Act
-                from ci_guardian.hooks.post_commit import main
-
-                resultado = main()
+        # Act
+        resultado = main(tmp_path)
 
         # Assert
         assert resultado == 1
@@ -353,8 +304,6 @@ class TestPostCommitIntegracion:
             return_value=True,
         ) as mock_validar:
             # Act
-            from ci_guardian.hooks.post_commit import main
-
             main()
 
         # Assert
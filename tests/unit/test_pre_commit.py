@@ -4,34 +4,68 @@ Este hook ejecuta validaciones (Ruff, Black, Bandit) antes de cada commit
 y genera un token anti --no-verify.
 """
 
+import subprocess
+from collections.abc import Iterator
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import DEFAULT, MagicMock, patch
 
 import pytest
+from pytest_mock import MockerFixture
+
+from ci_guardian.hooks.pre_commit import main, obtener_archivos_python_staged
+
+# Archivo Python staged que devuelven los mocks de obtener_archivos_python_staged
+ARCHIVO_MAIN_PY = Path("main.py")
+
+# Comando con el que el hook lista los archivos staged
+GIT_DIFF_CACHED = ["git", "diff", "--cached", "--name-only", "--diff-filter=ACM"]
+
+# Resultado de Bandit con una vulnerabilidad HIGH. El hook cuenta desde
+# results[], no desde metrics._totals.
+BANDIT_RESULTADOS_HIGH = {
+    "metrics": {"_totals": {"HIGH": 2}},
+    "results": [
+        {
+            "issue_severity": "HIGH",
+            "filename": "main.py",
+            "line_number": 10,
+            "issue_text": "SQL injection vulnerability",
+        }
+    ],
+}
+
+# Resultado de ejecutar_bandit cuando Bandit no está instalado (solo warning)
+BANDIT_NO_INSTALADO = {"error": "bandit no está instalado"}
+
+
+@pytest.fixture
+def venv_ok() -> Iterator[None]:
+    """Simula un entorno virtual activo (el hook lo verifica antes de validar)."""
+    with patch(
+        "ci_guardian.hooks.pre_commit.esta_venv_activo", return_value=(True, "✓ Venv activo")
+    ):
+        yield
+
+
+pytestmark = pytest.mark.usefixtures("venv_ok")
 
 
 class TestPreCommitObtenerArchivos:
     """Tests para la función obtener_archivos_python_staged."""
 
-    def test_debe_obtener_archivos_python_staged(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_debe_obtener_archivos_python_staged(self, tmp_path: Path) -> None:
         """Debe obtener archivos Python desde git diff --cached."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        # Crear archivos de prueba
+        # Crear archivos de prueba (obtener_archivos_python_staged descarta los que no existen)
         (tmp_path / "main.py").write_text("print('main')")
         (tmp_path / "utils.py").write_text("print('utils')")
 
         # Mock subprocess.run para simular git diff --cached
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "main.py\nutils.py\n"
+        mock_result = subprocess.CompletedProcess(
+            args=GIT_DIFF_CACHED, returncode=0, stdout="main.py\nutils.py\n", stderr=""
+        )
 
         with patch("subprocess.run", return_value=mock_result):
-            from ci_guardian.hooks.pre_commit import obtener_archivos_python_staged
-
             archivos = obtener_archivos_python_staged(tmp_path)
 
         # Assert
@@ -39,82 +73,58 @@ class TestPreCommitObtenerArchivos:
         assert any("main.py" in str(f) for f in archivos)
         assert any("utils.py" in str(f) for f in archivos)
 
-    def test_debe_retornar_vacio_si_no_hay_archivos_staged(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_debe_retornar_vacio_si_no_hay_archivos_staged(self, tmp_path: Path) -> None:
         """Debe retornar lista vacía si no hay archivos staged."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
         # Mock subprocess sin archivos
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = ""
+        mock_result = subprocess.CompletedProcess(
+            args=GIT_DIFF_CACHED, returncode=0, stdout="", stderr=""
+        )
 
         with patch("subprocess.run", return_value=mock_result):
-            from ci_guardian.hooks.pre_commit import obtener_archivos_python_staged
-
             archivos = obtener_archivos_python_staged(tmp_path)
 
         # Assert
         assert archivos == []
 
-    def test_debe_filtrar_solo_archivos_python(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_debe_filtrar_solo_archivos_python(self, tmp_path: Path) -> None:
         """Debe filtrar solo archivos .py."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        # Crear archivos de diferentes tipos
+        # Crear archivos de diferentes tipos (deben existir en disco para no ser descartados)
         (tmp_path / "main.py").write_text("python")
         (tmp_path / "README.md").write_text("readme")
 
         # Mock subprocess que retorna ambos
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "main.py\nREADME.md\n"
+        mock_result = subprocess.CompletedProcess(
+            args=GIT_DIFF_CACHED, returncode=0, stdout="main.py\nREADME.md\n", stderr=""
+        )
 
         with patch("subprocess.run", return_value=mock_result):
-            from ci_guardian.hooks.pre_commit import obtener_archivos_python_staged
-
             archivos = obtener_archivos_python_staged(tmp_path)
 
         # Assert
         assert len(archivos) == 1
         assert archivos[0].suffix == ".py"
 
-    def test_debe_manejar_git_diff_error(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_debe_manejar_git_diff_error(self, tmp_path: Path) -> None:
         """Debe manejar error al ejecutar git diff."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
         # Mock subprocess que falla
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stderr = "fatal: not a git repository"
+        mock_result = subprocess.CompletedProcess(
+            args=GIT_DIFF_CACHED, returncode=1, stdout="", stderr="fatal: not a git repository"
+        )
 
         with patch("subprocess.run", return_value=mock_result):
-            from ci_guardian.hooks.pre_commit import obtener_archivos_python_staged
-
             archivos = obtener_archivos_python_staged(tmp_path)
 
         # Assert
         assert archivos == [], "Debe retornar lista vacía en caso de error"
 
-    def test_debe_manejar_timeout(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_debe_manejar_timeout(self, tmp_path: Path) -> None:
         """Debe manejar timeout al ejecutar git diff."""
         # Arrange
-        import subprocess
-
-        monkeypatch.chdir(tmp_path)
-
         # Mock subprocess que hace timeout (subprocess.TimeoutExpired, no TimeoutError)
         with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("git", 30)):
-            from ci_guardian.hooks.pre_commit import obtener_archivos_python_staged
-
             archivos = obtener_archivos_python_staged(tmp_path)
 
         # Assert
@@ -124,225 +134,128 @@ class TestPreCommitObtenerArchivos:
 class TestPreCommitMain:
     """Tests para la función main del hook pre-commit."""
 
-    def test_debe_pasar_todas_las_validaciones(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Debe pasar si todas las validaciones son exitosas."""
-        # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.pre_commit import main
-
-        # Mock archivos staged
-        with patch(
-            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            return_value=[Path("main.py")],
-        ):
-            # Mock validadores exitosos
-            with patch(
-                "ci_guardian.hooks.pre_commit.ejecutar_ruff", return_value=(True, "✓ Ruff OK")
-            ):
-                with patch(
-                    "ci_guardian.hooks.pre_commit.ejecutar_black", return_value=(True, "✓ Black OK")
-                ):
-                    with patch(
-                        "ci_guardian.hooks.pre_commit.ejecutar_bandit", return_value=(True, {})
-                    ):
-                        with patch(
-                            "ci_guardian.hooks.pre_commit.generar_token_seguro",
-                            return_value="token123",
-                        ):
-                            with patch("ci_guardian.hooks.pre_commit.guardar_token"):
-                                # Act
-                                resultado = main()
-
-        # Assert
-        assert resultado == 0, "Debe retornar 0 si todas las validaciones pasan"
-
-    def test_debe_fallar_si_ruff_falla(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    @pytest.mark.parametrize(
+        ("resultado_ruff", "resultado_black", "resultado_bandit", "esperado"),
+        [
+            pytest.param(
+                (True, "✓ Ruff OK"),
+                (True, "✓ Black OK"),
+                (True, {}),
+                0,
+                id="todas_las_validaciones_pasan",
+            ),
+            pytest.param((False, "❌ E501 line too long"), None, None, 1, id="ruff_falla"),
+            pytest.param((True, "✓"), (False, "❌ would reformat"), None, 1, id="black_falla"),
+            pytest.param(
+                (True, "✓"),
+                (True, "✓"),
+                (False, BANDIT_RESULTADOS_HIGH),
+                1,
+                id="bandit_encuentra_vulnerabilidades_high",
+            ),
+        ],
+    )
+    def test_debe_retornar_segun_resultado_de_validadores(
+        self,
+        tmp_path: Path,
+        resultado_ruff: tuple[bool, str],
+        resultado_black: tuple[bool, str] | None,
+        resultado_bandit: tuple[bool, dict] | None,
+        esperado: int,
     ) -> None:
-        """Debe rechazar commit si Ruff encuentra errores."""
+        """Debe rechazar el commit si Ruff, Black o Bandit (HIGH) fallan; si no, permitirlo."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.pre_commit import main
-
-        with patch(
-            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            return_value=[Path("main.py")],
-        ):
-            # Mock Ruff que falla
-            with patch(
-                "ci_guardian.hooks.pre_commit.ejecutar_ruff",
-                return_value=(False, "❌ E501 line too long"),
-            ):
-                # Act
-                resultado = main()
-
-        # Assert
-        assert resultado == 1, "Debe retornar 1 si Ruff falla"
-
-    def test_debe_fallar_si_black_falla(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Debe rechazar commit si Black encuentra errores de formato."""
-        # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.pre_commit import main
-
-        with patch(
-            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            return_value=[Path("main.py")],
-        ):
-            with patch("ci_guardian.hooks.pre_commit.ejecutar_ruff", return_value=(True, "✓")):
-                # Mock Black que falla
-                with patch(
-                    "ci_guardian.hooks.pre_commit.ejecutar_black",
-                    return_value=(False, "❌ would reformat"),
-                ):
-                    # Act
-                    resultado = main()
-
-        # Assert
-        assert resultado == 1, "Debe retornar 1 si Black falla"
-
-    def test_debe_fallar_si_bandit_encuentra_vulnerabilidades_high(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Debe rechazar commit si Bandit encuentra vulnerabilidades HIGH."""
-        # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.pre_commit import main
-
-        bandit_results = {
-            "metrics": {"_totals": {"HIGH": 2}},
-            "results": [
-                {
-                    "issue_severity": "HIGH",
-                    "filename": "main.py",
-                    "line_number": 10,
-                    "issue_text": "SQL injection vulnerability",
-                }
-            ],
+        # Solo se parchean los validadores que llegan a ejecutarse (None = no alcanzado)
+        validadores = {
+            "ejecutar_ruff": resultado_ruff,
+            "ejecutar_black": resultado_black,
+            "ejecutar_bandit": resultado_bandit,
+        }
+        mocks_validadores = {
+            nombre: MagicMock(return_value=resultado)
+            for nombre, resultado in validadores.items()
+            if resultado is not None
         }
 
-        with patch(
-            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            return_value=[Path("main.py")],
+        with patch.multiple(
+            "ci_guardian.hooks.pre_commit",
+            obtener_archivos_python_staged=MagicMock(return_value=[ARCHIVO_MAIN_PY]),
+            generar_token_seguro=MagicMock(return_value="token123"),
+            guardar_token=DEFAULT,
+            **mocks_validadores,
         ):
-            with patch("ci_guardian.hooks.pre_commit.ejecutar_ruff", return_value=(True, "✓")):
-                with patch("ci_guardian.hooks.pre_commit.ejecutar_black", return_value=(True, "✓")):
-                    # Mock Bandit con vulnerabilidades HIGH
-                    with patch(
-                        "ci_guardian.hooks.pre_commit.ejecutar_bandit",
-                        return_value=(False, bandit_results),
-                    ):
-                        # Act
-                        resultado = main()
+            # Act
+            resultado = main(tmp_path)
 
         # Assert
-        assert resultado == 1, "Debe retornar 1 si Bandit encuentra vulnerabilidades HIGH"
+        assert resultado == esperado
 
     def test_debe_permitir_commit_sin_archivos_python(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, tmp_path: Path, mocker: MockerFixture
     ) -> None:
         """Debe permitir commit si no hay archivos Python staged."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
+        mocker.patch("ci_guardian.hooks.pre_commit.obtener_archivos_python_staged", return_value=[])
+        mocker.patch("ci_guardian.hooks.pre_commit.generar_token_seguro", return_value="token123")
+        mocker.patch("ci_guardian.hooks.pre_commit.guardar_token")
 
-        from ci_guardian.hooks.pre_commit import main
-
-        with patch(
-            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            return_value=[],
-        ):
-            with patch(
-                "ci_guardian.hooks.pre_commit.generar_token_seguro", return_value="token123"
-            ):
-                with patch("ci_guardian.hooks.pre_commit.guardar_token"):
-                    # Act
-                    resultado = main()
+        # Act
+        resultado = main(tmp_path)
 
         # Assert
         assert resultado == 0, "Debe permitir commit sin archivos Python"
 
     def test_debe_generar_token_si_no_hay_archivos_python(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, tmp_path: Path, mocker: MockerFixture
     ) -> None:
         """Debe generar token incluso si no hay archivos Python staged."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
+        mocker.patch("ci_guardian.hooks.pre_commit.obtener_archivos_python_staged", return_value=[])
+        mock_generar = mocker.patch(
+            "ci_guardian.hooks.pre_commit.generar_token_seguro", return_value="token"
+        )
+        mock_guardar = mocker.patch("ci_guardian.hooks.pre_commit.guardar_token")
 
-        from ci_guardian.hooks.pre_commit import main
-
-        with patch(
-            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            return_value=[],
-        ):
-            with patch(
-                "ci_guardian.hooks.pre_commit.generar_token_seguro", return_value="token"
-            ) as mock_generar:
-                with patch("ci_guardian.hooks.pre_commit.guardar_token") as mock_guardar:
-                    # Act
-                    main()
+        # Act
+        main(tmp_path)
 
         # Assert
         mock_generar.assert_called_once()
         mock_guardar.assert_called_once()
 
     def test_debe_generar_token_solo_si_todas_las_validaciones_pasan(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, tmp_path: Path, mocker: MockerFixture
     ) -> None:
         """Debe generar token SOLO si todas las validaciones pasan."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.pre_commit import main
-
-        with patch(
+        mocker.patch(
             "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            return_value=[Path("main.py")],
-        ):
-            # Ruff falla
-            with patch("ci_guardian.hooks.pre_commit.ejecutar_ruff", return_value=(False, "error")):
-                with patch("ci_guardian.hooks.pre_commit.generar_token_seguro") as mock_generar:
-                    # Act
-                    main()
+            return_value=[ARCHIVO_MAIN_PY],
+        )
+        # Ruff falla
+        mocker.patch("ci_guardian.hooks.pre_commit.ejecutar_ruff", return_value=(False, "error"))
+        mock_generar = mocker.patch("ci_guardian.hooks.pre_commit.generar_token_seguro")
+
+        # Act
+        main(tmp_path)
 
         # Assert
         mock_generar.assert_not_called(), "NO debe generar token si Ruff falla"
 
-    def test_debe_omitir_bandit_si_no_esta_instalado(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_debe_omitir_bandit_si_no_esta_instalado(self, tmp_path: Path) -> None:
         """Debe omitir Bandit si no está instalado."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.pre_commit import main
-
-        bandit_error = {"error": "bandit no está instalado"}
-
-        with patch(
-            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            return_value=[Path("main.py")],
+        with patch.multiple(
+            "ci_guardian.hooks.pre_commit",
+            obtener_archivos_python_staged=MagicMock(return_value=[ARCHIVO_MAIN_PY]),
+            ejecutar_ruff=MagicMock(return_value=(True, "✓")),
+            ejecutar_black=MagicMock(return_value=(True, "✓")),
+            ejecutar_bandit=MagicMock(return_value=(False, BANDIT_NO_INSTALADO)),
+            generar_token_seguro=MagicMock(return_value="token"),
+            guardar_token=DEFAULT,
         ):
-            with patch("ci_guardian.hooks.pre_commit.ejecutar_ruff", return_value=(True, "✓")):
-                with patch("ci_guardian.hooks.pre_commit.ejecutar_black", return_value=(True, "✓")):
-                    with patch(
-                        "ci_guardian.hooks.pre_commit.ejecutar_bandit",
-                        return_value=(False, bandit_error),
-                    ):
-                        with patch(
-                            "ci_guardian.hooks.pre_commit.generar_token_seguro",
-                            return_value="token",
-                        ):
-                            with patch("ci_guardian.hooks.pre_commit.guardar_token"):
-                                # Act
-                                resultado = main()
+            # Act
+            resultado = main(tmp_path)
 
         # Assert
         assert resultado == 0, "Debe pasar si Bandit no está instalado (warning only)"
@@ -351,42 +264,24 @@ class TestPreCommitMain:
 class TestPreCommitErrorHandling:
     """Tests para manejo de errores del hook pre-commit."""
 
-    def test_debe_manejar_value_error(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Debe manejar ValueError de validación."""
-        # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.pre_commit import main
-
-        # Mock que lanza ValueError
-        with patch(
-            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            side_effect=ValueError("Error de validación"),
-        ):
-            # Act
-            resultado = main()
-
-        # Assert
-        assert resultado == 1, "Debe retornar 1 en caso de ValueError"
-
-    def test_debe_manejar_exception_generica(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Debe manejar excepciones genéricas."""
+    @pytest.mark.parametrize(
+        "excepcion",
+        [
+            pytest.param(ValueError("Error de validación"), id="value_error"),
+            pytest.param(Exception("Error inesperado"), id="exception_generica"),
+            pytest.param(RuntimeError("Error en tiempo de ejecución"), id="runtime_error"),
+            pytest.param(KeyError("clave"), id="key_error"),
+        ],
+    )
+    def test_debe_retornar_1_ante_excepciones(self, tmp_path: Path, excepcion: Exception) -> None:
+        """Debe manejar ValueError y cualquier otra excepción retornando 1."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.pre_commit import main
-
-        # Mock que lanza Exception
         with patch(
             "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            side_effect=Exception("Error inesperado"),
+            side_effect=excepcion,
         ):
             # Act
-            resultado = main()
+            resultado = main(tmp_path)
 
         # Assert
         assert resultado == 1, "Debe retornar 1 en caso de excepción"
@@ -395,63 +290,48 @@ class TestPreCommitErrorHandling:
 class TestPreCommitIntegracion:
     """Tests de integración del hook pre-commit."""
 
-    def test_workflow_completo_exitoso(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_workflow_completo_exitoso(self, tmp_path: Path) -> None:
         """Test de workflow completo exitoso."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.pre_commit import main
+        # Simular workflow completo (DEFAULT crea un MagicMock accesible por nombre)
+        with patch.multiple(
+            "ci_guardian.hooks.pre_commit",
+            obtener_archivos_python_staged=DEFAULT,
+            ejecutar_ruff=DEFAULT,
+            ejecutar_black=DEFAULT,
+            ejecutar_bandit=DEFAULT,
+            generar_token_seguro=DEFAULT,
+            guardar_token=DEFAULT,
+        ) as mocks:
+            mocks["obtener_archivos_python_staged"].return_value = [ARCHIVO_MAIN_PY]
+            mocks["ejecutar_ruff"].return_value = (True, "✓")
+            mocks["ejecutar_black"].return_value = (True, "✓")
+            mocks["ejecutar_bandit"].return_value = (True, {})
+            mocks["generar_token_seguro"].return_value = "tok"
 
-        # Simular workflow completo
-        with patch(
-            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            return_value=[Path("main.py")],
-        ) as mock_archivos:
-            with patch(
-                "ci_guardian.hooks.pre_commit.ejecutar_ruff", return_value=(True, "✓")
-            ) as mock_ruff:
-                with patch(
-                    "ci_guardian.hooks.pre_commit.ejecutar_black", return_value=(True, "✓")
-                ) as mock_black:
-                    with patch(
-                        "ci_guardian.hooks.pre_commit.ejecutar_bandit", return_value=(True, {})
-                    ) as mock_bandit:
-                        with patch(
-                            "ci_guardian.hooks.pre_commit.generar_token_seguro", return_value="tok"
-                        ) as mock_gen:
-                            with patch("ci_guardian.hooks.pre_commit.guardar_token") as mock_save:
-                                # Act
-                                resultado = main()
+            # Act
+            resultado = main(tmp_path)
 
         # Assert
         assert resultado == 0
         # Verificar que se llamaron todas las funciones
-        mock_archivos.assert_called_once()
-        mock_ruff.assert_called_once()
-        mock_black.assert_called_once()
-        mock_bandit.assert_called_once()
-        mock_gen.assert_called_once()
-        mock_save.assert_called_once()
+        for mock in mocks.values():
+            mock.assert_called_once()
 
     def test_debe_usar_path_cwd_como_repo_path(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
     ) -> None:
         """Debe usar Path.cwd() como repo_path."""
         # Arrange
         monkeypatch.chdir(tmp_path)
-
-        from ci_guardian.hooks.pre_commit import main
-
-        with patch(
-            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged",
-            return_value=[],
-        ) as mock_archivos:
-            with patch("ci_guardian.hooks.pre_commit.generar_token_seguro", return_value="token"):
-                with patch("ci_guardian.hooks.pre_commit.guardar_token") as mock_guardar:
-                    # Act
-                    main()
+        mock_archivos = mocker.patch(
+            "ci_guardian.hooks.pre_commit.obtener_archivos_python_staged", return_value=[]
+        )
+        mocker.patch("ci_guardian.hooks.pre_commit.generar_token_seguro", return_value="token")
+        mock_guardar = mocker.patch("ci_guardian.hooks.pre_commit.guardar_token")
+
+        # Act
+        main()
 
         # Assert
         # Verificar que se llamó con tmp_path (que es el cwd)
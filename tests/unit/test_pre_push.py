@@ -6,164 +6,209 @@ Los tests se escriben PRIMERO siguiendo TDD estricto.
 
 from __future__ import annotations
 
+import platform
 import subprocess
+from collections.abc import Iterator
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
+from pytest_mock import MockerFixture
+
+from ci_guardian.core.config import cargar_configuracion
+from ci_guardian.hooks.pre_push import main
+
+# Resultados de subprocess.run para pytest (compartidos, el hook solo los lee)
+RESULTADO_PYTEST_OK = subprocess.CompletedProcess(
+    args=["pytest", "-v"], returncode=0, stdout="===== 10 passed in 1.23s =====", stderr=""
+)
+RESULTADO_PYTEST_FALLA = subprocess.CompletedProcess(
+    args=["pytest", "-v"],
+    returncode=1,
+    stdout="FAILED tests/test_example.py::test_func\n===== 1 failed, 9 passed in 2.34s =====",
+    stderr="",
+)
+
+
+# Config que habilita tests y GitHub Actions en pre-push
+CONFIG_PRE_PUSH_YAML = """
+hooks:
+  pre-push:
+    enabled: true
+    validadores:
+      - tests
+      - github-actions
+"""
+
+
+# Config que habilita tests y la auditoría de seguridad en pre-push
+CONFIG_PRE_PUSH_SECURITY_YAML = """
+hooks:
+  pre-push:
+    enabled: true
+    validadores:
+      - tests
+      - security
+"""
+
+
+@pytest.fixture(scope="module")
+def repo_con_config(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Repositorio con .ci-guardian.yaml, creado una vez por módulo.
+
+    Los tests que lo usan solo LEEN la configuración, así que es seguro compartirlo.
+
+    Returns:
+        Path al directorio con .ci-guardian.yaml
+    """
+    repo = tmp_path_factory.mktemp("config")
+    (repo / ".ci-guardian.yaml").write_text(CONFIG_PRE_PUSH_YAML)
+    return repo
+
+
+@pytest.fixture
+def venv_ok() -> Iterator[None]:
+    """Simula un entorno virtual activo (el hook lo verifica antes de validar)."""
+    with patch("ci_guardian.hooks.pre_push.esta_venv_activo", return_value=(True, "✓ Venv activo")):
+        yield
+
+
+pytestmark = pytest.mark.usefixtures("venv_ok")
 
 
 class TestPrePushHookExecution:
     """Tests para la ejecución del hook pre-push."""
 
-    def test_debe_ejecutar_pytest_exitosamente_cuando_tests_pasan(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_debe_ejecutar_pytest_exitosamente_cuando_tests_pasan(self, tmp_path: Path) -> None:
         """Debe ejecutar pytest y permitir push si tests pasan."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        # Mock subprocess.run para simular pytest exitoso
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "===== 10 passed in 1.23s ====="
-        mock_result.stderr = ""
-
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
-            # Mock venv validator (pre_push lo llama ahora)
-            with patch(
-                "ci_guardian.hooks.pre_push.esta_venv_activo", return_value=(True, "✓ Venv activo")
-            ):
-                # Act
-                from ci_guardian.hooks.pre_push import main
-
-                resultado = main()
-
-                # Assert
-                assert resultado == 0, "Debe retornar 0 cuando tests pasan"
-                mock_run.assert_called_once()
-                # Verificar que se llamó a pytest
-                args = mock_run.call_args[0][0]
-                assert "pytest" in args
-
-    def test_debe_fallar_cuando_pytest_falla(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+        with patch("subprocess.run", return_value=RESULTADO_PYTEST_OK) as mock_run:
+            # Act
+            resultado = main(tmp_path)
+
+            # Assert
+            assert resultado == 0, "Debe retornar 0 cuando tests pasan"
+            mock_run.assert_called_once()
+            # Verificar que se llamó a pytest
+            args = mock_run.call_args[0][0]
+            assert "pytest" in args
+
+    def test_debe_fallar_cuando_pytest_falla(self, tmp_path: Path) -> None:
         """Debe rechazar push si pytest falla."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        # Mock subprocess.run para simular pytest fallando
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = "===== 5 failed, 5 passed in 2.34s ====="
-        mock_result.stderr = ""
+        with patch("subprocess.run", return_value=RESULTADO_PYTEST_FALLA):
+            # Act
+            resultado = main(tmp_path)
 
-        with patch("subprocess.run", return_value=mock_result):
-            # Mock venv validator
-            with patch(
-                "ci_guardian.hooks.pre_push.esta_venv_activo", return_value=(True, "✓ Venv activo")
-            ):
-                # Act
-                from ci_guardian.hooks.pre_push import main
-
-                resultado = main()
-
-                # Assert
-                assert resultado == 1, "Debe retornar 1 cuando tests fallan"
+            # Assert
+            assert resultado == 1, "Debe retornar 1 cuando tests fallan"
 
     # NOTE: test_debe_permitir_skip_con_variable_entorno ELIMINADO en v0.3.1
     # CI_GUARDIAN_SKIP_TESTS fue removido porque contradecía el objetivo de seguridad.
     # Para deshabilitar validadores temporalmente, usar .ci-guardian.yaml con config protegida.
 
     def test_debe_ejecutar_github_actions_localmente_si_configurado(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, repo_con_config: Path, mocker: MockerFixture
     ) -> None:
         """Debe ejecutar GitHub Actions localmente usando act."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        # Crear config que habilita GitHub Actions
-        config_file = tmp_path / ".ci-guardian.yaml"
-        config_file.write_text(
-            """
-hooks:
-  pre-push:
-    enabled: true
-    validadores:
-      - tests
-      - github-actions
-"""
+        mocker.patch("subprocess.run", return_value=RESULTADO_PYTEST_OK)
+        # Mock ejecutar_workflow para GitHub Actions
+        mocker.patch(
+            "ci_guardian.hooks.pre_push._ejecutar_github_actions",
+            return_value=(True, "✓ GitHub Actions pasaron"),
         )
 
-        # Mock subprocess.run para pytest
-        mock_pytest_result = MagicMock()
-        mock_pytest_result.returncode = 0
-        mock_pytest_result.stdout = "===== 10 passed ====="
-        mock_pytest_result.stderr = ""
+        # Act
+        resultado = main(repo_con_config)
 
-        # Mock ejecutar_workflow para GitHub Actions
-        with patch("subprocess.run", return_value=mock_pytest_result):
-            with patch(
-                "ci_guardian.hooks.pre_push._ejecutar_github_actions",
-                return_value=(True, "✓ GitHub Actions pasaron"),
-            ):
-                # Mock venv validator
-                with patch(
-                    "ci_guardian.hooks.pre_push.esta_venv_activo",
-                    return_value=(True, "✓ Venv activo"),
-                ):
-                    # Act
-                    from ci_guardian.hooks.pre_push import main
+        # Assert
+        assert resultado == 0, "Debe retornar 0 cuando todo pasa"
 
-                    resultado = main()
 
-                    # Assert
-                    assert resultado == 0, "Debe retornar 0 cuando todo pasa"
+class TestPrePushAuditoriaSeguridad:
+    """Tests para el validador "security" (Bandit + Safety en paralelo)."""
 
+    @pytest.fixture
+    def repo_con_security(self, tmp_path: Path, mocker: MockerFixture) -> Path:
+        """Repositorio con el validador security habilitado y pytest pasando."""
+        (tmp_path / ".ci-guardian.yaml").write_text(CONFIG_PRE_PUSH_SECURITY_YAML)
+        (tmp_path / "pyproject.toml").write_text("[project]\nname = 'demo'\n")
+        mocker.patch("subprocess.run", return_value=RESULTADO_PYTEST_OK)
+        return tmp_path
 
-class TestPrePushConfiguration:
-    """Tests para la configuración del hook pre-push."""
+    def test_debe_ejecutar_auditoria_con_archivo_de_dependencias(
+        self, repo_con_security: Path, mocker: MockerFixture
+    ) -> None:
+        """Debe lanzar Bandit y Safety juntos sobre el repo y su pyproject.toml."""
+        # Arrange
+        auditoria = mocker.patch(
+            "ci_guardian.validators.security.ejecutar_auditoria_seguridad",
+            return_value=(True, {"results": []}, []),
+        )
+
+        # Act
+        resultado = main(repo_con_security)
+
+        # Assert
+        assert resultado == 0
+        auditoria.assert_called_once_with(repo_con_security, repo_con_security / "pyproject.toml")
 
-    def test_debe_cargar_configuracion_desde_yaml(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    def test_debe_bloquear_push_con_vulnerabilidades_high(
+        self, repo_con_security: Path, mocker: MockerFixture, capsys: pytest.CaptureFixture
     ) -> None:
-        """Debe cargar configuración desde .ci-guardian.yaml."""
+        """Debe rechazar el push si Bandit encuentra vulnerabilidades HIGH."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
+        mocker.patch(
+            "ci_guardian.validators.security.ejecutar_auditoria_seguridad",
+            return_value=(False, {"results": [{"issue_severity": "HIGH"}]}, []),
+        )
 
-        config_file = tmp_path / ".ci-guardian.yaml"
-        config_file.write_text(
-            """
-hooks:
-  pre-push:
-    enabled: true
-    validadores:
-      - tests
-"""
+        # Act
+        resultado = main(repo_con_security)
+
+        # Assert
+        assert resultado == 1
+        assert "1 vulnerabilidad(es) HIGH" in capsys.readouterr().out
+
+    def test_debe_avisar_sin_bloquear_si_bandit_no_esta_instalado(
+        self, repo_con_security: Path, mocker: MockerFixture, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Un Bandit no instalado solo genera un aviso, igual que en pre-commit."""
+        # Arrange
+        mocker.patch(
+            "ci_guardian.validators.security.ejecutar_auditoria_seguridad",
+            return_value=(False, {"error": "bandit no está instalado"}, []),
         )
 
         # Act
-        from ci_guardian.core.config import cargar_configuracion
+        resultado = main(repo_con_security)
+
+        # Assert
+        assert resultado == 0
+        assert "Bandit omitido: bandit no está instalado" in capsys.readouterr().out
 
-        config = cargar_configuracion(tmp_path)
+
+class TestPrePushConfiguration:
+    """Tests para la configuración del hook pre-push."""
+
+    def test_debe_cargar_configuracion_desde_yaml(self, repo_con_config: Path) -> None:
+        """Debe cargar configuración desde .ci-guardian.yaml."""
+        # Act
+        config = cargar_configuracion(repo_con_config)
 
         # Assert
         assert config is not None, "Debe cargar configuración"
         assert "pre-push" in config.hooks
         assert config.hooks["pre-push"].enabled is True
 
-    def test_debe_usar_configuracion_por_defecto_si_no_existe_yaml(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_debe_usar_configuracion_por_defecto_si_no_existe_yaml(self, tmp_path: Path) -> None:
         """Debe usar configuración por defecto si no existe .ci-guardian.yaml."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
         # No crear archivo de configuración
 
         # Act
-        from ci_guardian.core.config import cargar_configuracion
-
         config = cargar_configuracion(tmp_path)
 
         # Assert
@@ -174,165 +219,74 @@ hooks:
 class TestPrePushSecurity:
     """Tests de seguridad para el hook pre-push."""
 
-    def test_no_debe_usar_shell_true_con_comandos(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_no_debe_usar_shell_true_con_comandos(self, tmp_path: Path) -> None:
         """Debe usar subprocess de forma segura (shell=False)."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        # Mock subprocess.run
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = ""
-        mock_result.stderr = ""
-
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
-            # Mock venv validator
-            with patch(
-                "ci_guardian.hooks.pre_push.esta_venv_activo", return_value=(True, "✓ Venv activo")
-            ):
-                # Act
-                from ci_guardian.hooks.pre_push import main
-
-                main()
-
-                # Assert - verificar que NO se usa shell=True
-                for call in mock_run.call_args_list:
-                    kwargs = call[1]
-                    assert (
-                        kwargs.get("shell", False) is False
-                    ), "NUNCA debe usar shell=True (previene command injection)"
-
-    def test_debe_manejar_timeout_en_ejecucion(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+        with patch("subprocess.run", return_value=RESULTADO_PYTEST_OK) as mock_run:
+            # Act
+            main(tmp_path)
+
+            # Assert - verificar que NO se usa shell=True (pytest se ejecuta una sola vez)
+            mock_run.assert_called_once()
+            assert (
+                mock_run.call_args.kwargs.get("shell", False) is False
+            ), "NUNCA debe usar shell=True (previene command injection)"
+
+    def test_debe_manejar_timeout_en_ejecucion(self, tmp_path: Path) -> None:
         """Debe manejar timeout en ejecución de pytest."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
         with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("pytest", 60)):
-            # Mock venv validator
-            with patch(
-                "ci_guardian.hooks.pre_push.esta_venv_activo", return_value=(True, "✓ Venv activo")
-            ):
-                # Act
-                from ci_guardian.hooks.pre_push import main
-
-                resultado = main()
+            # Act
+            resultado = main(tmp_path)
 
-                # Assert
-                assert resultado == 1, "Debe fallar si hay timeout"
+            # Assert
+            assert resultado == 1, "Debe fallar si hay timeout"
 
 
 class TestPrePushCrossPlatform:
     """Tests de compatibilidad multiplataforma."""
 
-    @pytest.mark.skipif(
-        __import__("platform").system() != "Windows",
-        reason="Test específico de Windows",
-    )
-    def test_debe_funcionar_en_windows(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Debe funcionar correctamente en Windows."""
-        # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "===== 10 passed ====="
-        mock_result.stderr = ""
-
-        with patch("subprocess.run", return_value=mock_result):
-            # Mock venv validator
-            with patch(
-                "ci_guardian.hooks.pre_push.esta_venv_activo", return_value=(True, "✓ Venv activo")
-            ):
-                # Act
-                from ci_guardian.hooks.pre_push import main
-
-                resultado = main()
-
-                # Assert
-                assert resultado == 0, "Debe funcionar en Windows"
-
-    @pytest.mark.skipif(
-        __import__("platform").system() != "Linux",
-        reason="Test específico de Linux",
-    )
-    def test_debe_funcionar_en_linux(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Debe funcionar correctamente en Linux."""
-        # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "===== 10 passed ====="
-        mock_result.stderr = ""
+    def test_debe_funcionar_en_la_plataforma_actual(self, tmp_path: Path) -> None:
+        """
+        Debe funcionar en la plataforma donde corre el test (Linux, macOS o Windows).
 
-        with patch("subprocess.run", return_value=mock_result):
-            # Mock venv validator
-            with patch(
-                "ci_guardian.hooks.pre_push.esta_venv_activo", return_value=(True, "✓ Venv activo")
-            ):
-                # Act
-                from ci_guardian.hooks.pre_push import main
-
-                resultado = main()
+        Con subprocess.run mockeado el hook no depende del sistema operativo;
+        el comportamiento específico de cada SO se cubre en tests de integración.
+        """
+        # Arrange
+        with patch("subprocess.run", return_value=RESULTADO_PYTEST_OK):
+            # Act
+            resultado = main(tmp_path)
 
-                # Assert
-                assert resultado == 0, "Debe funcionar en Linux"
+            # Assert
+            assert resultado == 0, f"Debe funcionar en {platform.system()}"
 
 
 class TestPrePushErrorHandling:
     """Tests de manejo de errores."""
 
-    def test_debe_manejar_pytest_no_instalado(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_debe_manejar_pytest_no_instalado(self, tmp_path: Path) -> None:
         """Debe manejar el caso donde pytest no está instalado."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
         with patch("subprocess.run", side_effect=FileNotFoundError("pytest not found")):
-            # Mock venv validator
-            with patch(
-                "ci_guardian.hooks.pre_push.esta_venv_activo", return_value=(True, "✓ Venv activo")
-            ):
-                # Act
-                from ci_guardian.hooks.pre_push import main
-
-                resultado = main()
+            # Act
+            resultado = main(tmp_path)
 
-                # Assert
-                assert resultado == 1, "Debe fallar si pytest no está instalado"
+            # Assert
+            assert resultado == 1, "Debe fallar si pytest no está instalado"
 
     def test_debe_proporcionar_mensaje_claro_al_fallar(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+        self, tmp_path: Path, capsys: pytest.CaptureFixture
     ) -> None:
         """Debe proporcionar mensaje claro cuando las validaciones fallan."""
         # Arrange
-        monkeypatch.chdir(tmp_path)
-
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = "FAILED tests/test_example.py::test_func"
-        mock_result.stderr = ""
-
-        with patch("subprocess.run", return_value=mock_result):
-            # Mock venv validator
-            with patch(
-                "ci_guardian.hooks.pre_push.esta_venv_activo", return_value=(True, "✓ Venv activo")
-            ):
-                # Act
-                from ci_guardian.hooks.pre_push import main
-
-                resultado = main()
-
-                # Assert
-                captured = capsys.readouterr()
-                assert resultado == 1, "Debe fallar"
-                assert (
-                    "tests" in captured.out.lower() or "failed" in captured.out.lower()
-                ), "Debe mostrar mensaje claro sobre tests fallidos"
+        with patch("subprocess.run", return_value=RESULTADO_PYTEST_FALLA):
+            # Act
+            resultado = main(tmp_path)
+
+            # Assert
+            captured = capsys.readouterr()
+            assert resultado == 1, "Debe fallar"
+            assert (
+                "tests" in captured.out.lower() or "failed" in captured.out.lower()
+            ), "Debe mostrar mensaje claro sobre tests fallidos"
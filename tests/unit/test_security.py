@@ -6,21 +6,123 @@ Siguiendo TDD: Estos tests están diseñados para FALLAR primero (RED),
 luego se implementará el código mínimo para que pasen (GREEN).
 """
 
+import gc
 import json
+import logging
+import re
 import subprocess
-from unittest.mock import MagicMock, patch
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from ci_guardian.validators.security import (
+    _escanear_bandit_en_proceso,
+    ejecutar_auditoria_seguridad,
+    ejecutar_bandit,
+    ejecutar_safety,
+    generar_reporte_seguridad,
+)
+
+# Raíz de los proyectos de prueba. Los fixtures la crean en el filesystem en
+# memoria de pyfakefs (fixture `fs`): ejecutar_bandit/ejecutar_safety están
+# mockeados, así que nunca necesitan archivos reales.
+RAIZ_PROYECTO = Path("/proyecto")
+
+# Patrones de los mensajes de error de validación (compilados una vez por módulo)
+PATRON_PATH_TRAVERSAL = re.compile(r"path traversal|ruta inválida|fuera del proyecto")
+PATRON_DIRECTORIO_INEXISTENTE = re.compile(r"no existe|directorio inválido")
+PATRON_ARCHIVO_INEXISTENTE = re.compile(r"no existe|no encontrado")
+
+# Salidas JSON de Bandit/Safety, serializadas una sola vez al importar el módulo.
+# Bandit se ejecuta con text=False, así que su salida son bytes.
+BANDIT_SIN_VULNERABILIDADES_JSON = json.dumps(
+    {"results": [], "metrics": {"_totals": {"HIGH": 0, "MEDIUM": 0, "LOW": 0}}}
+).encode()
+BANDIT_HIGH_JSON = json.dumps(
+    {
+        "results": [
+            {
+                "issue_severity": "HIGH",
+                "issue_confidence": "HIGH",
+                "issue_text": "Use of exec detected.",
+                "line_number": 42,
+                "filename": "src/vulnerable.py",
+                "test_id": "B102",
+            },
+            {
+                "issue_severity": "MEDIUM",
+                "issue_confidence": "MEDIUM",
+                "issue_text": "Use of assert detected.",
+                "line_number": 10,
+                "filename": "src/test.py",
+                "test_id": "B101",
+            },
+        ],
+        "metrics": {"_totals": {"HIGH": 1, "MEDIUM": 1, "LOW": 0}},
+    }
+).encode()
+SAFETY_CVES_JSON = json.dumps(
+    [
+        {
+            "vulnerability": "CVE-2023-12345",
+            "package_name": "requests",
+            "installed_version": "2.25.0",
+            "vulnerable_spec": "<2.26.0",
+            "advisory": "Request package has SSRF vulnerability",
+        },
+        {
+            "vulnerability": "CVE-2023-67890",
+            "package_name": "click",
+            "installed_version": "8.0.0",
+            "vulnerable_spec": "<8.0.2",
+            "advisory": "Click has arbitrary code execution vulnerability",
+        },
+    ]
+)
+
+
+def despachar_por_comando(respuestas):
+    """
+    Crea un side_effect para subprocess.run que responde según el ejecutable.
+
+    Args:
+        respuestas: Dict ejecutable (cmd[0]) -> CompletedProcess o excepción a lanzar
+
+    Returns:
+        Función compatible con subprocess.run(cmd, **kwargs)
+    """
+
+    def run(cmd, **kwargs):
+        respuesta = respuestas[cmd[0]]
+        if isinstance(respuesta, Exception):
+            raise respuesta
+        return respuesta
+
+    return run
+
+
+@pytest.fixture(autouse=True)
+def bandit_por_cli(monkeypatch):
+    """
+    Fuerza a ejecutar_bandit a usar el CLI (subprocess.run mockeado).
+
+    Los tests de escaneo en proceso (TestBanditEnProceso) lo sobrescriben.
+    """
+    monkeypatch.setattr("ci_guardian.validators.security._api_bandit_disponible", lambda: False)
+
 
 class TestEjecutorBandit:
     """Tests para el ejecutor de Bandit (SAST)."""
 
     @pytest.fixture
-    def directorio_python_valido(self, tmp_path):
-        """Crea directorio con código Python válido."""
-        src_dir = tmp_path / "src"
-        src_dir.mkdir()
+    def directorio_python_valido(self, fs):
+        """Crea directorio con código Python válido (en el filesystem en memoria)."""
+        src_dir = RAIZ_PROYECTO / "src"
+        src_dir.mkdir(parents=True)
 
         # Archivo sin vulnerabilidades
         archivo_seguro = src_dir / "seguro.py"
@@ -31,297 +133,342 @@ class TestEjecutorBandit:
 
         return src_dir
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_subprocess_bandit_sin_vulnerabilidades(self):
-        """Mock de subprocess.run simulando Bandit sin vulnerabilidades."""
-        return MagicMock(
+        """Resultado de subprocess.run simulando Bandit sin vulnerabilidades."""
+        return subprocess.CompletedProcess(
+            args=["bandit"],
             returncode=0,
-            stdout=json.dumps(
-                {"results": [], "metrics": {"_totals": {"HIGH": 0, "MEDIUM": 0, "LOW": 0}}}
-            ),
-            stderr="",
+            stdout=BANDIT_SIN_VULNERABILIDADES_JSON,
+            stderr=b"",
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_subprocess_bandit_con_vulnerabilidades_high(self):
-        """Mock de subprocess.run simulando Bandit con vulnerabilidades HIGH."""
-        return MagicMock(
+        """Resultado de subprocess.run simulando Bandit con vulnerabilidades HIGH."""
+        return subprocess.CompletedProcess(
+            args=["bandit"],
             returncode=1,
-            stdout=json.dumps(
-                {
-                    "results": [
-                        {
-                            "issue_severity": "HIGH",
-                            "issue_confidence": "HIGH",
-                            "issue_text": "Use of exec detected.",
-                            "line_number": 42,
-                            "filename": "src/vulnerable.py",
-                            "test_id": "B102",
-                        },
-                        {
-                            "issue_severity": "MEDIUM",
-                            "issue_confidence": "MEDIUM",
-                            "issue_text": "Use of assert detected.",
-                            "line_number": 10,
-                            "filename": "src/test.py",
-                            "test_id": "B101",
-                        },
-                    ],
-                    "metrics": {"_totals": {"HIGH": 1, "MEDIUM": 1, "LOW": 0}},
-                }
-            ),
-            stderr="",
+            stdout=BANDIT_HIGH_JSON,
+            stderr=b"",
         )
 
-    def test_debe_ejecutar_bandit_con_argumentos_correctos(
-        self, directorio_python_valido, mock_subprocess_bandit_sin_vulnerabilidades
+    def test_debe_invocar_bandit_cumpliendo_contrato(
+        self, directorio_python_valido, mock_subprocess_bandit_sin_vulnerabilidades, subprocess_run
     ):
-        """Debe ejecutar Bandit con argumentos correctos."""
-        from ci_guardian.validators.security import ejecutar_bandit
+        """
+        Debe invocar subprocess.run con el contrato esperado.
 
+        Una sola ejecución de ejecutar_bandit verifica todo el contrato de la
+        llamada: comando, flags, exclusiones, timeout, shell=False y captura de output.
+        """
         # Arrange
-        with patch(
-            "subprocess.run", return_value=mock_subprocess_bandit_sin_vulnerabilidades
-        ) as mock_run:
-            # Act
-            exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+        subprocess_run.return_value = mock_subprocess_bandit_sin_vulnerabilidades
 
-            # Assert
-            assert mock_run.called, "Debe ejecutar Bandit"
-            args_llamada = mock_run.call_args[0][0]
-            assert args_llamada[0] == "bandit", "Debe ejecutar el comando 'bandit'"
-            assert "-r" in args_llamada, "Debe usar modo recursivo (-r)"
-            assert "-f" in args_llamada and "json" in args_llamada, "Debe usar formato JSON"
-            assert str(directorio_python_valido) in " ".join(
-                args_llamada
-            ), "Debe incluir el directorio a escanear"
-
-            # Verificar que NO se usa shell=True (seguridad)
-            assert (
-                mock_run.call_args.kwargs.get("shell", False) is False
-            ), "NUNCA debe usar shell=True (vulnerabilidad de command injection)"
+        # Act
+        ejecutar_bandit(directorio_python_valido, formato="json")
+
+        # Assert
+        subprocess_run.assert_called_once()
+        (args_llamada,), kwargs = subprocess_run.call_args
+        args_str = " ".join(args_llamada)
+
+        # Comando y argumentos
+        assert args_llamada[0] == "bandit", "Debe ejecutar el comando 'bandit'"
+        assert "-r" in args_llamada, "Debe usar modo recursivo (-r)"
+        assert "-f" in args_llamada and "json" in args_llamada, "Debe usar formato especificado"
+        assert str(directorio_python_valido) in args_str, "Debe incluir el directorio a escanear"
+
+        # Exclusión de tests/ y venv/ (con -x o --exclude)
+        assert "-x" in args_llamada or "--exclude" in args_str, "Debe usar flag de exclusión"
+        assert any(
+            "test" in arg.lower() or "venv" in arg.lower() for arg in args_llamada
+        ), "Debe excluir tests/ y venv/"
+
+        # Timeout para prevenir bloqueos
+        assert "timeout" in kwargs, "Debe configurar timeout"
+        assert 60 <= kwargs["timeout"] <= 180, "Timeout debe estar entre 60 y 180 segundos"
+
+        # CRÍTICO: shell=False previene command injection
+        assert (
+            kwargs.get("shell", False) is False
+        ), "NUNCA debe usar shell=True - vulnerabilidad crítica de command injection"
+
+        # Captura de stdout y stderr como texto
+        assert kwargs.get("capture_output") is True or (
+            kwargs.get("stdout") == subprocess.PIPE and kwargs.get("stderr") == subprocess.PIPE
+        ), "Debe capturar stdout y stderr"
+        assert not kwargs.get("text"), "Debe capturar bytes (el JSON se parsea sin decodificar)"
 
     def test_debe_parsear_output_json_correctamente(
-        self, directorio_python_valido, mock_subprocess_bandit_con_vulnerabilidades_high
+        self,
+        directorio_python_valido,
+        mock_subprocess_bandit_con_vulnerabilidades_high,
+        subprocess_run,
     ):
         """Debe parsear output JSON de Bandit correctamente."""
-        from ci_guardian.validators.security import ejecutar_bandit
-
         # Arrange
-        with patch("subprocess.run", return_value=mock_subprocess_bandit_con_vulnerabilidades_high):
-            # Act
-            exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+        subprocess_run.return_value = mock_subprocess_bandit_con_vulnerabilidades_high
 
-            # Assert
-            assert isinstance(resultados, dict), "Debe retornar dict con resultados parseados"
-            assert "results" in resultados, "Debe incluir 'results' del JSON"
-            assert len(resultados["results"]) == 2, "Debe parsear todas las vulnerabilidades"
+        # Act
+        exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+
+        # Assert
+        assert isinstance(resultados, dict), "Debe retornar dict con resultados parseados"
+        assert "results" in resultados, "Debe incluir 'results' del JSON"
+        assert len(resultados["results"]) == 2, "Debe parsear todas las vulnerabilidades"
 
     def test_debe_retornar_true_cuando_no_hay_vulnerabilidades_high(
-        self, directorio_python_valido, mock_subprocess_bandit_sin_vulnerabilidades
+        self, directorio_python_valido, mock_subprocess_bandit_sin_vulnerabilidades, subprocess_run
     ):
         """Debe retornar True si no hay vulnerabilidades HIGH/CRITICAL."""
-        from ci_guardian.validators.security import ejecutar_bandit
-
         # Arrange
-        with patch("subprocess.run", return_value=mock_subprocess_bandit_sin_vulnerabilidades):
-            # Act
-            exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+        subprocess_run.return_value = mock_subprocess_bandit_sin_vulnerabilidades
 
-            # Assert
-            assert exitoso is True, "Debe retornar True cuando no hay vulnerabilidades HIGH"
+        # Act
+        exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+
+        # Assert
+        assert exitoso is True, "Debe retornar True cuando no hay vulnerabilidades HIGH"
 
     def test_debe_retornar_false_cuando_hay_vulnerabilidades_high(
-        self, directorio_python_valido, mock_subprocess_bandit_con_vulnerabilidades_high
+        self,
+        directorio_python_valido,
+        mock_subprocess_bandit_con_vulnerabilidades_high,
+        subprocess_run,
     ):
         """Debe retornar False si hay vulnerabilidades HIGH."""
-        from ci_guardian.validators.security import ejecutar_bandit
-
         # Arrange
-        with patch("subprocess.run", return_value=mock_subprocess_bandit_con_vulnerabilidades_high):
-            # Act
-            exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+        subprocess_run.return_value = mock_subprocess_bandit_con_vulnerabilidades_high
 
-            # Assert
-            assert exitoso is False, "Debe retornar False cuando hay vulnerabilidades HIGH"
+        # Act
+        exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+
+        # Assert
+        assert exitoso is False, "Debe retornar False cuando hay vulnerabilidades HIGH"
 
     def test_debe_filtrar_vulnerabilidades_por_severidad(
-        self, directorio_python_valido, mock_subprocess_bandit_con_vulnerabilidades_high
+        self,
+        directorio_python_valido,
+        mock_subprocess_bandit_con_vulnerabilidades_high,
+        subprocess_run,
     ):
         """Debe filtrar vulnerabilidades por severidad (HIGH, MEDIUM, LOW)."""
-        from ci_guardian.validators.security import ejecutar_bandit
-
         # Arrange
-        with patch("subprocess.run", return_value=mock_subprocess_bandit_con_vulnerabilidades_high):
-            # Act
-            exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+        subprocess_run.return_value = mock_subprocess_bandit_con_vulnerabilidades_high
 
-            # Assert
-            assert "metrics" in resultados, "Debe incluir métricas de severidad"
-            assert (
-                resultados["metrics"]["_totals"]["HIGH"] == 1
-            ), "Debe contar 1 vulnerabilidad HIGH"
-            assert (
-                resultados["metrics"]["_totals"]["MEDIUM"] == 1
-            ), "Debe contar 1 vulnerabilidad MEDIUM"
-
-    def test_debe_excluir_directorios_tests_y_venv(
-        self, directorio_python_valido, mock_subprocess_bandit_sin_vulnerabilidades
-    ):
-        """Debe excluir directorios tests/, venv/ del escaneo."""
-        from ci_guardian.validators.security import ejecutar_bandit
-
-        # Arrange
-        with patch(
-            "subprocess.run", return_value=mock_subprocess_bandit_sin_vulnerabilidades
-        ) as mock_run:
-            # Act
-            ejecutar_bandit(directorio_python_valido)
+        # Act
+        exitoso, resultados = ejecutar_bandit(directorio_python_valido)
 
-            # Assert
-            args_llamada = mock_run.call_args[0][0]
-            args_str = " ".join(args_llamada)
-
-            # Debe incluir flags de exclusión
-            assert "-x" in args_llamada or "--exclude" in args_str, "Debe usar flag de exclusión"
-            # La implementación puede excluir usando -x o --exclude-dirs
-            # Verificamos que se mencionan los directorios a excluir
-            assert any(
-                "test" in arg.lower() or "venv" in arg.lower() for arg in args_llamada
-            ), "Debe excluir tests/ y venv/"
-
-    def test_debe_manejar_timeout_de_120_segundos(
-        self, directorio_python_valido, mock_subprocess_bandit_sin_vulnerabilidades
+        # Assert
+        assert "metrics" in resultados, "Debe incluir métricas de severidad"
+        assert resultados["metrics"]["_totals"]["HIGH"] == 1, "Debe contar 1 vulnerabilidad HIGH"
+        assert (
+            resultados["metrics"]["_totals"]["MEDIUM"] == 1
+        ), "Debe contar 1 vulnerabilidad MEDIUM"
+
+    def test_debe_manejar_error_cuando_bandit_no_esta_instalado(
+        self, directorio_python_valido, subprocess_run
     ):
-        """Debe configurar timeout de 120 segundos para prevenir bloqueos."""
-        from ci_guardian.validators.security import ejecutar_bandit
-
+        """Debe manejar FileNotFoundError cuando Bandit no está instalado."""
         # Arrange
-        with patch(
-            "subprocess.run", return_value=mock_subprocess_bandit_sin_vulnerabilidades
-        ) as mock_run:
-            # Act
-            ejecutar_bandit(directorio_python_valido)
+        subprocess_run.side_effect = FileNotFoundError("bandit not found")
 
-            # Assert
-            assert "timeout" in mock_run.call_args.kwargs, "Debe configurar timeout"
-            timeout_usado = mock_run.call_args.kwargs["timeout"]
-            assert timeout_usado >= 60, "Timeout debe ser al menos 60 segundos"
-            assert timeout_usado <= 180, "Timeout no debe exceder 180 segundos"
+        # Act
+        exitoso, resultados = ejecutar_bandit(directorio_python_valido)
 
-    def test_debe_usar_shell_false_por_seguridad(
-        self, directorio_python_valido, mock_subprocess_bandit_sin_vulnerabilidades
-    ):
-        """CRÍTICO: Debe usar shell=False para prevenir command injection."""
-        from ci_guardian.validators.security import ejecutar_bandit
+        # Assert
+        assert exitoso is False, "Debe retornar False cuando Bandit no está instalado"
+        assert "bandit" in str(resultados).lower(), "Debe indicar que Bandit no está instalado"
 
+    def test_no_debe_ejecutar_bandit_si_no_hay_archivos_python(self, fs, subprocess_run):
+        """Debe retornar un reporte vacío sin ejecutar Bandit si no hay archivos .py."""
         # Arrange
-        with patch(
-            "subprocess.run", return_value=mock_subprocess_bandit_sin_vulnerabilidades
-        ) as mock_run:
-            # Act
-            ejecutar_bandit(directorio_python_valido)
-
-            # Assert
-            assert (
-                mock_run.call_args.kwargs.get("shell", False) is False
-            ), "NUNCA debe usar shell=True - vulnerabilidad crítica de command injection"
-
-    def test_debe_manejar_error_cuando_bandit_no_esta_instalado(self, directorio_python_valido):
-        """Debe manejar FileNotFoundError cuando Bandit no está instalado."""
-        from ci_guardian.validators.security import ejecutar_bandit
+        directorio_sin_python = RAIZ_PROYECTO / "docs"
+        directorio_sin_python.mkdir(parents=True)
+        (directorio_sin_python / "README.md").write_text("# Docs\n", encoding="utf-8")
 
-        # Arrange
-        with patch("subprocess.run", side_effect=FileNotFoundError("bandit not found")):
-            # Act
-            exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+        # Act
+        exitoso, resultados = ejecutar_bandit(directorio_sin_python)
 
-            # Assert
-            assert exitoso is False, "Debe retornar False cuando Bandit no está instalado"
-            assert "bandit" in str(resultados).lower(), "Debe indicar que Bandit no está instalado"
+        # Assert
+        assert exitoso is True, "Sin archivos Python no hay vulnerabilidades"
+        assert resultados["results"] == []
+        subprocess_run.assert_not_called()
 
-    def test_debe_validar_path_para_prevenir_path_traversal(self, tmp_path):
+    def test_debe_validar_path_para_prevenir_path_traversal(self):
         """Debe validar path para prevenir path traversal."""
-        from ci_guardian.validators.security import ejecutar_bandit
-
         # Arrange
-        directorio_malicioso = tmp_path / ".." / ".." / "etc"
+        directorio_malicioso = RAIZ_PROYECTO / ".." / ".." / "etc"
 
         # Act & Assert
-        with pytest.raises(ValueError, match="path traversal|ruta inválida|fuera del proyecto"):
+        with pytest.raises(ValueError, match=PATRON_PATH_TRAVERSAL):
             ejecutar_bandit(directorio_malicioso)
 
-    def test_debe_rechazar_directorio_inexistente(self, tmp_path):
+    def test_debe_rechazar_directorio_inexistente(self, fs):
         """Debe rechazar directorios que no existen."""
-        from ci_guardian.validators.security import ejecutar_bandit
-
         # Arrange
-        directorio_inexistente = tmp_path / "no_existe"
+        directorio_inexistente = RAIZ_PROYECTO / "no_existe"
 
         # Act & Assert
-        with pytest.raises(ValueError, match="no existe|directorio inválido"):
+        with pytest.raises(ValueError, match=PATRON_DIRECTORIO_INEXISTENTE):
             ejecutar_bandit(directorio_inexistente)
 
-    def test_debe_capturar_stdout_y_stderr(
-        self, directorio_python_valido, mock_subprocess_bandit_sin_vulnerabilidades
+    def test_debe_manejar_timeout_exception(self, directorio_python_valido, subprocess_run):
+        """Debe manejar TimeoutExpired cuando Bandit tarda demasiado."""
+        # Arrange
+        subprocess_run.side_effect = subprocess.TimeoutExpired("bandit", 120)
+
+        # Act
+        exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+
+        # Assert
+        assert exitoso is False, "Debe retornar False cuando hay timeout"
+        assert (
+            "timeout" in str(resultados).lower() or "tiempo" in str(resultados).lower()
+        ), "Debe indicar que hubo timeout"
+
+
+def _escaneo_colgado(directorio: Path) -> dict:
+    """Sustituto de _escanear_bandit_en_proceso que nunca termina a tiempo."""
+    time.sleep(60)
+    return {}
+
+
+class TestBanditEnProceso:
+    """Tests para el escaneo de Bandit con su API (sin lanzar el CLI)."""
+
+    @pytest.fixture
+    def bandit_por_cli(self):
+        """Deja que ejecutar_bandit use la API de Bandit si está instalada."""
+
+    @pytest.fixture(autouse=True)
+    def _recolectar_procesos_del_pool(self):
+        """
+        Libera los procesos del Pool de Bandit al terminar cada test.
+
+        Sus finalizadores cierran descriptores reales: si el GC los ejecuta
+        más tarde, durante un test con pyfakefs, os.close falla con EBADF.
+        """
+        yield
+        gc.collect()
+
+    @pytest.fixture
+    def proyecto_con_shell_injection(self, tmp_path):
+        """Proyecto real (Bandit lee los archivos) con una vulnerabilidad HIGH."""
+        pytest.importorskip("bandit")
+        (tmp_path / "app.py").write_text(
+            "import subprocess\n\n\ndef ejecutar(cmd):\n"
+            "    return subprocess.call(cmd, shell=True)\n",
+            encoding="utf-8",
+        )
+        return tmp_path
+
+    def test_debe_escanear_sin_lanzar_subproceso(self, proyecto_con_shell_injection):
+        """Con formato JSON debe escanear en proceso, con la misma forma que el CLI."""
+        # Act (el conftest hace fallar cualquier subprocess.run sin mockear)
+        exitoso, resultados = ejecutar_bandit(proyecto_con_shell_injection)
+
+        # Assert
+        assert exitoso is False, "Debe retornar False cuando hay vulnerabilidades HIGH"
+        assert {"results", "errors", "metrics"} <= resultados.keys()
+        assert any(
+            r["issue_severity"] == "HIGH" and r["test_id"] == "B602" for r in resultados["results"]
+        ), "Debe detectar subprocess con shell=True"
+        assert all("more_info" in r for r in resultados["results"]), "Igual que el JSON del CLI"
+
+    def test_debe_restaurar_nivel_del_logger_de_bandit(self, proyecto_con_shell_injection):
+        """Silenciar el logger de Bandit no debe cambiar el estado global del proceso."""
+        # Arrange
+        logger_bandit = logging.getLogger("bandit")
+        nivel_original = logger_bandit.level
+
+        # Act
+        _escanear_bandit_en_proceso(proyecto_con_shell_injection)
+
+        # Assert
+        assert logger_bandit.level == nivel_original
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="El hijo hereda el monkeypatch con fork")
+    def test_debe_retornar_error_si_bandit_falla_en_proceso(
+        self, proyecto_con_shell_injection, monkeypatch
     ):
-        """Debe capturar stdout y stderr para procesar resultados."""
-        from ci_guardian.validators.security import ejecutar_bandit
+        """Una excepción dentro de BanditManager debe devolverse como error, no propagarse."""
 
         # Arrange
-        with patch(
-            "subprocess.run", return_value=mock_subprocess_bandit_sin_vulnerabilidades
-        ) as mock_run:
-            # Act
-            ejecutar_bandit(directorio_python_valido)
+        def manager_roto(*args, **kwargs):
+            raise RuntimeError("perfil inválido")
 
-            # Assert
-            assert mock_run.call_args.kwargs.get("capture_output") is True or (
-                mock_run.call_args.kwargs.get("stdout") == subprocess.PIPE
-                and mock_run.call_args.kwargs.get("stderr") == subprocess.PIPE
-            ), "Debe capturar stdout y stderr"
-            assert mock_run.call_args.kwargs.get("text") is True, "Debe procesar output como texto"
+        monkeypatch.setattr("bandit.core.manager.BanditManager", manager_roto)
 
-    def test_debe_manejar_timeout_exception(self, directorio_python_valido):
-        """Debe manejar TimeoutExpired cuando Bandit tarda demasiado."""
-        from ci_guardian.validators.security import ejecutar_bandit
+        # Act
+        exitoso, resultados = ejecutar_bandit(proyecto_con_shell_injection)
 
+        # Assert
+        assert exitoso is False
+        assert resultados == {"error": "Error al ejecutar Bandit: perfil inválido"}
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="El hijo hereda el monkeypatch con fork")
+    def test_debe_matar_el_escaneo_si_supera_el_timeout(
+        self, proyecto_con_shell_injection, monkeypatch
+    ):
+        """El timeout debe ser un límite real: el hook no espera a que el escaneo termine."""
         # Arrange
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("bandit", 120)):
-            # Act
-            exitoso, resultados = ejecutar_bandit(directorio_python_valido)
+        monkeypatch.setattr("ci_guardian.validators.security._TIMEOUT_BANDIT", 0.5)
+        monkeypatch.setattr(
+            "ci_guardian.validators.security._escanear_bandit_en_proceso", _escaneo_colgado
+        )
 
-            # Assert
-            assert exitoso is False, "Debe retornar False cuando hay timeout"
-            assert (
-                "timeout" in str(resultados).lower() or "tiempo" in str(resultados).lower()
-            ), "Debe indicar que hubo timeout"
+        # Act
+        inicio = time.monotonic()
+        exitoso, resultados = ejecutar_bandit(proyecto_con_shell_injection)
 
-    def test_debe_soportar_parametro_formato(
-        self, directorio_python_valido, mock_subprocess_bandit_sin_vulnerabilidades
+        # Assert
+        assert exitoso is False
+        assert "timeout" in resultados["error"]
+        assert time.monotonic() - inicio < 10, "Debe matar el proceso hijo, no esperarlo"
+
+    def test_debe_usar_cli_si_el_proyecto_tiene_archivo_bandit(
+        self, proyecto_con_shell_injection, subprocess_run
     ):
-        """Debe soportar parámetro formato (json, txt, html)."""
-        from ci_guardian.validators.security import ejecutar_bandit
+        """Con un .bandit en el proyecto debe usar el CLI, que es quien aplica esa configuración."""
+        # Arrange
+        (proyecto_con_shell_injection / ".bandit").write_text("[bandit]\nskips: B602\n")
+        subprocess_run.return_value = subprocess.CompletedProcess(
+            args=["bandit"], returncode=0, stdout=b'{"results": [], "errors": []}', stderr=b""
+        )
+
+        # Act
+        exitoso, _ = ejecutar_bandit(proyecto_con_shell_injection)
+
+        # Assert
+        subprocess_run.assert_called_once()
+        assert exitoso is True
 
+    def test_debe_usar_cli_para_formatos_no_json(
+        self, proyecto_con_shell_injection, subprocess_run
+    ):
+        """Con formatos distintos de JSON debe seguir ejecutando el CLI de Bandit."""
         # Arrange
-        with patch(
-            "subprocess.run", return_value=mock_subprocess_bandit_sin_vulnerabilidades
-        ) as mock_run:
-            # Act
-            ejecutar_bandit(directorio_python_valido, formato="json")
+        subprocess_run.return_value = subprocess.CompletedProcess(
+            args=["bandit"], returncode=1, stdout=b"Issue: [B602]", stderr=b""
+        )
+        # Act
+        _, resultados = ejecutar_bandit(proyecto_con_shell_injection, formato="txt")
 
-            # Assert
-            args_llamada = mock_run.call_args[0][0]
-            assert "-f" in args_llamada and "json" in args_llamada, "Debe usar formato especificado"
+        # Assert
+        subprocess_run.assert_called_once()
+        assert resultados == {"raw": "Issue: [B602]"}
 
 
 class TestEjecutorSafety:
     """Tests para el ejecutor de Safety (vulnerability scanner)."""
 
     @pytest.fixture
-    def pyproject_toml_mock(self, tmp_path):
-        """Crea un pyproject.toml mock."""
-        pyproject = tmp_path / "pyproject.toml"
+    def pyproject_toml_mock(self, fs):
+        """Crea un pyproject.toml mock (en el filesystem en memoria)."""
+        RAIZ_PROYECTO.mkdir()
+        pyproject = RAIZ_PROYECTO / "pyproject.toml"
         pyproject.write_text(
             """
 [tool.poetry]
@@ -337,251 +484,214 @@ requests = "2.25.0"
         return pyproject
 
     @pytest.fixture
-    def requirements_txt_mock(self, tmp_path):
-        """Crea un requirements.txt mock."""
-        requirements = tmp_path / "requirements.txt"
+    def requirements_txt_mock(self, fs):
+        """Crea un requirements.txt mock (en el filesystem en memoria)."""
+        RAIZ_PROYECTO.mkdir()
+        requirements = RAIZ_PROYECTO / "requirements.txt"
         requirements.write_text("requests==2.25.0\nclick==8.0.0\n", encoding="utf-8")
         return requirements
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_subprocess_safety_sin_vulnerabilidades(self):
-        """Mock de subprocess.run simulando Safety sin vulnerabilidades."""
-        return MagicMock(returncode=0, stdout="[]", stderr="")
+        """Resultado de subprocess.run simulando Safety sin vulnerabilidades."""
+        return subprocess.CompletedProcess(
+            args=["safety", "check", "--json"], returncode=0, stdout="[]", stderr=""
+        )
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_subprocess_safety_con_cves(self):
-        """Mock de subprocess.run simulando Safety con CVEs encontrados."""
-        return MagicMock(
+        """Resultado de subprocess.run simulando Safety con CVEs encontrados."""
+        return subprocess.CompletedProcess(
+            args=["safety", "check", "--json"],
             returncode=1,
-            stdout=json.dumps(
-                [
-                    {
-                        "vulnerability": "CVE-2023-12345",
-                        "package_name": "requests",
-                        "installed_version": "2.25.0",
-                        "vulnerable_spec": "<2.26.0",
-                        "advisory": "Request package has SSRF vulnerability",
-                    },
-                    {
-                        "vulnerability": "CVE-2023-67890",
-                        "package_name": "click",
-                        "installed_version": "8.0.0",
-                        "vulnerable_spec": "<8.0.2",
-                        "advisory": "Click has arbitrary code execution vulnerability",
-                    },
-                ]
-            ),
+            stdout=SAFETY_CVES_JSON,
             stderr="",
         )
 
-    def test_debe_ejecutar_safety_check(self, mock_subprocess_safety_sin_vulnerabilidades):
+    def test_debe_ejecutar_safety_check(
+        self, mock_subprocess_safety_sin_vulnerabilidades, subprocess_run
+    ):
         """Debe ejecutar safety check correctamente."""
-        from ci_guardian.validators.security import ejecutar_safety
-
         # Arrange
-        with patch(
-            "subprocess.run", return_value=mock_subprocess_safety_sin_vulnerabilidades
-        ) as mock_run:
-            # Act
-            exitoso, vulnerabilidades = ejecutar_safety()
+        subprocess_run.return_value = mock_subprocess_safety_sin_vulnerabilidades
 
-            # Assert
-            assert mock_run.called, "Debe ejecutar Safety"
-            args_llamada = mock_run.call_args[0][0]
-            assert args_llamada[0] == "safety", "Debe ejecutar el comando 'safety'"
-            assert "check" in args_llamada, "Debe usar subcomando 'check'"
-            assert "--json" in args_llamada, "Debe usar formato JSON"
-
-            # Verificar que NO se usa shell=True
-            assert (
-                mock_run.call_args.kwargs.get("shell", False) is False
-            ), "NUNCA debe usar shell=True"
-
-    def test_debe_parsear_output_json(self, mock_subprocess_safety_con_cves):
-        """Debe parsear output JSON de Safety correctamente."""
-        from ci_guardian.validators.security import ejecutar_safety
+        # Act
+        exitoso, vulnerabilidades = ejecutar_safety()
+
+        # Assert
+        assert subprocess_run.called, "Debe ejecutar Safety"
+        (args_llamada,), kwargs = subprocess_run.call_args
+        assert args_llamada[0] == "safety", "Debe ejecutar el comando 'safety'"
+        assert "check" in args_llamada, "Debe usar subcomando 'check'"
+        assert "--json" in args_llamada, "Debe usar formato JSON"
+
+        # Verificar que NO se usa shell=True
+        assert kwargs.get("shell", False) is False, "NUNCA debe usar shell=True"
 
+    def test_debe_parsear_output_json(self, mock_subprocess_safety_con_cves, subprocess_run):
+        """Debe parsear output JSON de Safety correctamente."""
         # Arrange
-        with patch("subprocess.run", return_value=mock_subprocess_safety_con_cves):
-            # Act
-            exitoso, vulnerabilidades = ejecutar_safety()
+        subprocess_run.return_value = mock_subprocess_safety_con_cves
 
-            # Assert
-            assert isinstance(vulnerabilidades, list), "Debe retornar lista de vulnerabilidades"
-            assert len(vulnerabilidades) == 2, "Debe parsear todos los CVEs"
-            assert vulnerabilidades[0]["vulnerability"] == "CVE-2023-12345", "Debe incluir CVE ID"
+        # Act
+        exitoso, vulnerabilidades = ejecutar_safety()
+
+        # Assert
+        assert isinstance(vulnerabilidades, list), "Debe retornar lista de vulnerabilidades"
+        assert len(vulnerabilidades) == 2, "Debe parsear todos los CVEs"
+        assert vulnerabilidades[0]["vulnerability"] == "CVE-2023-12345", "Debe incluir CVE ID"
 
     def test_debe_detectar_pyproject_toml_automaticamente(
-        self, pyproject_toml_mock, mock_subprocess_safety_sin_vulnerabilidades
+        self, pyproject_toml_mock, mock_subprocess_safety_sin_vulnerabilidades, subprocess_run
     ):
         """Debe detectar pyproject.toml automáticamente cuando archivo_deps=None."""
-        from ci_guardian.validators.security import ejecutar_safety
-
         # Arrange
-        with (
-            patch(
-                "subprocess.run", return_value=mock_subprocess_safety_sin_vulnerabilidades
-            ) as mock_run,
-            patch("pathlib.Path.cwd", return_value=pyproject_toml_mock.parent),
-        ):
+        subprocess_run.return_value = mock_subprocess_safety_sin_vulnerabilidades
+        with patch("pathlib.Path.cwd", return_value=pyproject_toml_mock.parent):
             # Act
             ejecutar_safety(archivo_deps=None)
 
             # Assert
             # Debe detectar automáticamente el archivo de dependencias
             # La implementación puede usar diferentes flags según el archivo
-            assert mock_run.called, "Debe ejecutar Safety con auto-detección"
+            assert subprocess_run.called, "Debe ejecutar Safety con auto-detección"
 
     def test_debe_detectar_requirements_txt_automaticamente(
-        self, requirements_txt_mock, mock_subprocess_safety_sin_vulnerabilidades
+        self, requirements_txt_mock, mock_subprocess_safety_sin_vulnerabilidades, subprocess_run
     ):
         """Debe detectar requirements.txt automáticamente cuando archivo_deps=None."""
-        from ci_guardian.validators.security import ejecutar_safety
-
         # Arrange
-        with (
-            patch(
-                "subprocess.run", return_value=mock_subprocess_safety_sin_vulnerabilidades
-            ) as mock_run,
-            patch("pathlib.Path.cwd", return_value=requirements_txt_mock.parent),
-        ):
+        subprocess_run.return_value = mock_subprocess_safety_sin_vulnerabilidades
+        with patch("pathlib.Path.cwd", return_value=requirements_txt_mock.parent):
             # Act
             ejecutar_safety(archivo_deps=None)
 
             # Assert
-            assert mock_run.called, "Debe ejecutar Safety con auto-detección"
+            assert subprocess_run.called, "Debe ejecutar Safety con auto-detección"
 
     def test_debe_retornar_true_cuando_no_hay_vulnerabilidades(
-        self, mock_subprocess_safety_sin_vulnerabilidades
+        self, mock_subprocess_safety_sin_vulnerabilidades, subprocess_run
     ):
         """Debe retornar True si no hay vulnerabilidades."""
-        from ci_guardian.validators.security import ejecutar_safety
-
         # Arrange
-        with patch("subprocess.run", return_value=mock_subprocess_safety_sin_vulnerabilidades):
-            # Act
-            exitoso, vulnerabilidades = ejecutar_safety()
+        subprocess_run.return_value = mock_subprocess_safety_sin_vulnerabilidades
 
-            # Assert
-            assert exitoso is True, "Debe retornar True cuando no hay CVEs"
-            assert len(vulnerabilidades) == 0, "Lista de vulnerabilidades debe estar vacía"
+        # Act
+        exitoso, vulnerabilidades = ejecutar_safety()
 
-    def test_debe_retornar_false_cuando_hay_cves(self, mock_subprocess_safety_con_cves):
-        """Debe retornar False si hay CVEs."""
-        from ci_guardian.validators.security import ejecutar_safety
+        # Assert
+        assert exitoso is True, "Debe retornar True cuando no hay CVEs"
+        assert len(vulnerabilidades) == 0, "Lista de vulnerabilidades debe estar vacía"
 
+    def test_debe_retornar_false_cuando_hay_cves(
+        self, mock_subprocess_safety_con_cves, subprocess_run
+    ):
+        """Debe retornar False si hay CVEs."""
         # Arrange
-        with patch("subprocess.run", return_value=mock_subprocess_safety_con_cves):
-            # Act
-            exitoso, vulnerabilidades = ejecutar_safety()
+        subprocess_run.return_value = mock_subprocess_safety_con_cves
 
-            # Assert
-            assert exitoso is False, "Debe retornar False cuando hay CVEs"
-            assert len(vulnerabilidades) > 0, "Debe incluir lista de CVEs"
+        # Act
+        exitoso, vulnerabilidades = ejecutar_safety()
 
-    def test_debe_listar_cves_con_detalles(self, mock_subprocess_safety_con_cves):
-        """Debe listar CVEs con detalles (CVE-ID, package, version, advisory)."""
-        from ci_guardian.validators.security import ejecutar_safety
+        # Assert
+        assert exitoso is False, "Debe retornar False cuando hay CVEs"
+        assert len(vulnerabilidades) > 0, "Debe incluir lista de CVEs"
 
+    def test_debe_listar_cves_con_detalles(self, mock_subprocess_safety_con_cves, subprocess_run):
+        """Debe listar CVEs con detalles (CVE-ID, package, version, advisory)."""
         # Arrange
-        with patch("subprocess.run", return_value=mock_subprocess_safety_con_cves):
-            # Act
-            exitoso, vulnerabilidades = ejecutar_safety()
+        subprocess_run.return_value = mock_subprocess_safety_con_cves
 
-            # Assert
-            cve_primera = vulnerabilidades[0]
-            assert "vulnerability" in cve_primera, "Debe incluir CVE ID"
-            assert "package_name" in cve_primera, "Debe incluir nombre del paquete"
-            assert "installed_version" in cve_primera, "Debe incluir versión instalada"
-            assert "vulnerable_spec" in cve_primera, "Debe incluir especificación vulnerable"
-            assert "advisory" in cve_primera, "Debe incluir descripción del advisory"
-
-    def test_debe_usar_shell_false_por_seguridad(self, mock_subprocess_safety_sin_vulnerabilidades):
-        """CRÍTICO: Debe usar shell=False para prevenir command injection."""
-        from ci_guardian.validators.security import ejecutar_safety
+        # Act
+        exitoso, vulnerabilidades = ejecutar_safety()
 
+        # Assert
+        cve_primera = vulnerabilidades[0]
+        assert "vulnerability" in cve_primera, "Debe incluir CVE ID"
+        assert "package_name" in cve_primera, "Debe incluir nombre del paquete"
+        assert "installed_version" in cve_primera, "Debe incluir versión instalada"
+        assert "vulnerable_spec" in cve_primera, "Debe incluir especificación vulnerable"
+        assert "advisory" in cve_primera, "Debe incluir descripción del advisory"
+
+    def test_debe_usar_shell_false_por_seguridad(
+        self, mock_subprocess_safety_sin_vulnerabilidades, subprocess_run
+    ):
+        """CRÍTICO: Debe usar shell=False para prevenir command injection."""
         # Arrange
-        with patch(
-            "subprocess.run", return_value=mock_subprocess_safety_sin_vulnerabilidades
-        ) as mock_run:
-            # Act
-            ejecutar_safety()
+        subprocess_run.return_value = mock_subprocess_safety_sin_vulnerabilidades
 
-            # Assert
-            assert (
-                mock_run.call_args.kwargs.get("shell", False) is False
-            ), "NUNCA debe usar shell=True"
+        # Act
+        ejecutar_safety()
 
-    def test_debe_manejar_timeout(self, mock_subprocess_safety_sin_vulnerabilidades):
-        """Debe configurar timeout para prevenir bloqueos."""
-        from ci_guardian.validators.security import ejecutar_safety
+        # Assert
+        _, kwargs = subprocess_run.call_args
+        assert kwargs.get("shell", False) is False, "NUNCA debe usar shell=True"
 
+    def test_debe_manejar_timeout(
+        self, mock_subprocess_safety_sin_vulnerabilidades, subprocess_run
+    ):
+        """Debe configurar timeout para prevenir bloqueos."""
         # Arrange
-        with patch(
-            "subprocess.run", return_value=mock_subprocess_safety_sin_vulnerabilidades
-        ) as mock_run:
-            # Act
-            ejecutar_safety()
+        subprocess_run.return_value = mock_subprocess_safety_sin_vulnerabilidades
 
-            # Assert
-            assert "timeout" in mock_run.call_args.kwargs, "Debe configurar timeout"
-            timeout_usado = mock_run.call_args.kwargs["timeout"]
-            assert timeout_usado >= 30, "Timeout debe ser al menos 30 segundos"
+        # Act
+        ejecutar_safety()
 
-    def test_debe_manejar_error_cuando_safety_no_esta_instalado(self):
-        """Debe manejar FileNotFoundError cuando Safety no está instalado."""
-        from ci_guardian.validators.security import ejecutar_safety
+        # Assert
+        _, kwargs = subprocess_run.call_args
+        assert "timeout" in kwargs, "Debe configurar timeout"
+        assert kwargs["timeout"] >= 30, "Timeout debe ser al menos 30 segundos"
 
+    def test_debe_manejar_error_cuando_safety_no_esta_instalado(self, subprocess_run):
+        """Debe manejar FileNotFoundError cuando Safety no está instalado."""
         # Arrange
-        with patch("subprocess.run", side_effect=FileNotFoundError("safety not found")):
-            # Act
-            exitoso, vulnerabilidades = ejecutar_safety()
+        subprocess_run.side_effect = FileNotFoundError("safety not found")
 
-            # Assert
-            assert exitoso is False, "Debe retornar False cuando Safety no está instalado"
-            assert isinstance(
-                vulnerabilidades, (list, str)
-            ), "Debe retornar mensaje de error o lista vacía"
+        # Act
+        exitoso, vulnerabilidades = ejecutar_safety()
 
-    def test_debe_manejar_timeout_exception(self):
-        """Debe manejar TimeoutExpired cuando Safety tarda demasiado."""
-        from ci_guardian.validators.security import ejecutar_safety
+        # Assert
+        assert exitoso is False, "Debe retornar False cuando Safety no está instalado"
+        assert isinstance(
+            vulnerabilidades, (list, str)
+        ), "Debe retornar mensaje de error o lista vacía"
 
+    def test_debe_manejar_timeout_exception(self, subprocess_run):
+        """Debe manejar TimeoutExpired cuando Safety tarda demasiado."""
         # Arrange
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("safety", 60)):
-            # Act
-            exitoso, vulnerabilidades = ejecutar_safety()
+        subprocess_run.side_effect = subprocess.TimeoutExpired("safety", 60)
 
-            # Assert
-            assert exitoso is False, "Debe retornar False cuando hay timeout"
+        # Act
+        exitoso, vulnerabilidades = ejecutar_safety()
 
-    def test_debe_rechazar_archivo_inexistente(self, tmp_path):
-        """Debe rechazar archivo de dependencias que no existe."""
-        from ci_guardian.validators.security import ejecutar_safety
+        # Assert
+        assert exitoso is False, "Debe retornar False cuando hay timeout"
 
+    def test_debe_rechazar_archivo_inexistente(self, fs):
+        """Debe rechazar archivo de dependencias que no existe."""
         # Arrange
-        archivo_inexistente = tmp_path / "no_existe.txt"
+        archivo_inexistente = RAIZ_PROYECTO / "no_existe.txt"
 
         # Act & Assert
-        with pytest.raises(FileNotFoundError, match="no existe|no encontrado"):
+        with pytest.raises(FileNotFoundError, match=PATRON_ARCHIVO_INEXISTENTE):
             ejecutar_safety(archivo_deps=archivo_inexistente)
 
-    def test_debe_capturar_stdout_y_stderr(self, mock_subprocess_safety_sin_vulnerabilidades):
+    def test_debe_capturar_stdout_y_stderr(
+        self, mock_subprocess_safety_sin_vulnerabilidades, subprocess_run
+    ):
         """Debe capturar stdout y stderr."""
-        from ci_guardian.validators.security import ejecutar_safety
-
         # Arrange
-        with patch(
-            "subprocess.run", return_value=mock_subprocess_safety_sin_vulnerabilidades
-        ) as mock_run:
-            # Act
-            ejecutar_safety()
+        subprocess_run.return_value = mock_subprocess_safety_sin_vulnerabilidades
 
-            # Assert
-            assert mock_run.call_args.kwargs.get("capture_output") is True or (
-                mock_run.call_args.kwargs.get("stdout") == subprocess.PIPE
-            ), "Debe capturar output"
-            assert mock_run.call_args.kwargs.get("text") is True, "Debe usar modo texto"
+        # Act
+        ejecutar_safety()
+
+        # Assert
+        _, kwargs = subprocess_run.call_args
+        assert kwargs.get("capture_output") is True or (
+            kwargs.get("stdout") == subprocess.PIPE
+        ), "Debe capturar output"
+        assert kwargs.get("text") is True, "Debe usar modo texto"
 
 
 class TestGeneradorReporteSeguridad:
@@ -646,8 +756,6 @@ class TestGeneradorReporteSeguridad:
         self, resultados_bandit_sin_issues, vulnerabilidades_safety_vacias
     ):
         """Debe generar reporte con secciones claras (Bandit, Safety)."""
-        from ci_guardian.validators.security import generar_reporte_seguridad
-
         # Act
         reporte = generar_reporte_seguridad(
             resultados_bandit_sin_issues, vulnerabilidades_safety_vacias
@@ -662,8 +770,6 @@ class TestGeneradorReporteSeguridad:
         self, resultados_bandit_con_issues, vulnerabilidades_safety_vacias
     ):
         """Debe incluir summary de Bandit (contadores por severidad)."""
-        from ci_guardian.validators.security import generar_reporte_seguridad
-
         # Act
         reporte = generar_reporte_seguridad(
             resultados_bandit_con_issues, vulnerabilidades_safety_vacias
@@ -678,8 +784,6 @@ class TestGeneradorReporteSeguridad:
         self, resultados_bandit_sin_issues, vulnerabilidades_safety_con_cves
     ):
         """Debe incluir lista de CVEs de Safety."""
-        from ci_guardian.validators.security import generar_reporte_seguridad
-
         # Act
         reporte = generar_reporte_seguridad(
             resultados_bandit_sin_issues, vulnerabilidades_safety_con_cves
@@ -694,8 +798,6 @@ class TestGeneradorReporteSeguridad:
         self, resultados_bandit_con_issues, vulnerabilidades_safety_vacias
     ):
         """Debe usar códigos de color para indicar severidad."""
-        from ci_guardian.validators.security import generar_reporte_seguridad
-
         # Act
         reporte = generar_reporte_seguridad(
             resultados_bandit_con_issues, vulnerabilidades_safety_vacias
@@ -710,8 +812,6 @@ class TestGeneradorReporteSeguridad:
         self, resultados_bandit_con_issues, vulnerabilidades_safety_con_cves
     ):
         """Debe incluir contadores totales de vulnerabilidades."""
-        from ci_guardian.validators.security import generar_reporte_seguridad
-
         # Act
         reporte = generar_reporte_seguridad(
             resultados_bandit_con_issues, vulnerabilidades_safety_con_cves
@@ -729,11 +829,11 @@ class TestIntegracionSeguridad:
     """Tests de integración para el módulo de seguridad."""
 
     @pytest.fixture
-    def proyecto_mock_completo(self, tmp_path):
-        """Crea un proyecto Python completo para testing."""
+    def proyecto_mock_completo(self, fs):
+        """Crea un proyecto Python completo para testing (en el filesystem en memoria)."""
         # Crear estructura de directorios
-        src_dir = tmp_path / "src"
-        src_dir.mkdir()
+        src_dir = RAIZ_PROYECTO / "src"
+        src_dir.mkdir(parents=True)
 
         # Archivo Python
         (src_dir / "app.py").write_text(
@@ -741,7 +841,7 @@ class TestIntegracionSeguridad:
         )
 
         # pyproject.toml
-        (tmp_path / "pyproject.toml").write_text(
+        (RAIZ_PROYECTO / "pyproject.toml").write_text(
             """
 [tool.poetry.dependencies]
 python = "^3.9"
@@ -750,121 +850,135 @@ requests = "2.28.0"
             encoding="utf-8",
         )
 
-        return tmp_path
+        return RAIZ_PROYECTO
 
-    def test_workflow_completo_sin_vulnerabilidades(self, proyecto_mock_completo):
-        """Debe ejecutar workflow completo: Bandit + Safety + Reporte."""
-        from ci_guardian.validators.security import (
-            ejecutar_bandit,
-            ejecutar_safety,
-            generar_reporte_seguridad,
+    @pytest.mark.parametrize(
+        ("respuesta_bandit", "respuesta_safety", "bandit_ok", "safety_ok", "en_reporte"),
+        [
+            pytest.param(
+                subprocess.CompletedProcess(
+                    args=["bandit"],
+                    returncode=0,
+                    stdout=BANDIT_SIN_VULNERABILIDADES_JSON,
+                    stderr=b"",
+                ),
+                subprocess.CompletedProcess(args=["safety"], returncode=0, stdout="[]", stderr=""),
+                True,
+                True,
+                ("BANDIT", "SAFETY"),
+                id="sin_vulnerabilidades",
+            ),
+            pytest.param(
+                subprocess.CompletedProcess(
+                    args=["bandit"], returncode=1, stdout=BANDIT_HIGH_JSON, stderr=b""
+                ),
+                subprocess.CompletedProcess(
+                    args=["safety"], returncode=1, stdout=SAFETY_CVES_JSON, stderr=""
+                ),
+                False,
+                False,
+                ("CVE-2023-12345", "HIGH"),
+                id="con_vulnerabilidades",
+            ),
+            pytest.param(
+                subprocess.TimeoutExpired("bandit", 120),
+                subprocess.CompletedProcess(args=["safety"], returncode=0, stdout="[]", stderr=""),
+                False,
+                True,
+                ("SAFETY",),
+                id="errores_en_cascada",
+            ),
+        ],
+    )
+    def test_workflow_completo(
+        self,
+        proyecto_mock_completo,
+        subprocess_run,
+        respuesta_bandit,
+        respuesta_safety,
+        bandit_ok,
+        safety_ok,
+        en_reporte,
+    ):
+        """
+        Debe ejecutar el workflow completo: Bandit + Safety + Reporte.
+
+        Cada herramienta responde según el escenario; si Bandit falla (timeout),
+        Safety debe continuar y el reporte debe generarse igualmente.
+        """
+        # Arrange - Respuesta de subprocess.run según la herramienta invocada
+        subprocess_run.side_effect = despachar_por_comando(
+            {"bandit": respuesta_bandit, "safety": respuesta_safety}
         )
 
-        # Arrange - Mocks de subprocess para Bandit y Safety
-        def mock_run(cmd, **kwargs):
-            if cmd[0] == "bandit":
-                return MagicMock(
-                    returncode=0,
-                    stdout=json.dumps(
-                        {"results": [], "metrics": {"_totals": {"HIGH": 0, "MEDIUM": 0, "LOW": 0}}}
-                    ),
-                    stderr="",
-                )
-            if cmd[0] == "safety":
-                return MagicMock(returncode=0, stdout="[]", stderr="")
-            return MagicMock(returncode=0, stdout="", stderr="")
-
-        with patch("subprocess.run", side_effect=mock_run):
-            # Act
-            bandit_exitoso, bandit_resultados = ejecutar_bandit(proyecto_mock_completo / "src")
-            safety_exitoso, safety_vulnerabilidades = ejecutar_safety()
-            reporte = generar_reporte_seguridad(bandit_resultados, safety_vulnerabilidades)
+        # Act
+        bandit_exitoso, bandit_resultados = ejecutar_bandit(proyecto_mock_completo / "src")
+        safety_exitoso, safety_vulnerabilidades = ejecutar_safety()
+        reporte = generar_reporte_seguridad(bandit_resultados, safety_vulnerabilidades)
 
-            # Assert
-            assert bandit_exitoso is True, "Bandit debe pasar"
-            assert safety_exitoso is True, "Safety debe pasar"
-            assert len(reporte) > 0, "Debe generar reporte"
-            assert "bandit" in reporte.lower(), "Reporte debe incluir resultados de Bandit"
-            assert "safety" in reporte.lower(), "Reporte debe incluir resultados de Safety"
-
-    def test_workflow_completo_con_vulnerabilidades(self, proyecto_mock_completo):
-        """Debe ejecutar workflow completo cuando hay vulnerabilidades."""
-        from ci_guardian.validators.security import (
-            ejecutar_bandit,
-            ejecutar_safety,
-            generar_reporte_seguridad,
+        # Assert
+        assert bandit_exitoso is bandit_ok, "Resultado de Bandit inesperado"
+        assert safety_exitoso is safety_ok, "Resultado de Safety inesperado"
+        for fragmento in en_reporte:
+            assert fragmento in reporte, f"Reporte debe incluir {fragmento!r}"
+
+    def test_auditoria_debe_ejecutar_bandit_y_safety_concurrentemente(
+        self, proyecto_mock_completo, subprocess_run
+    ):
+        """Debe lanzar Bandit y Safety en paralelo y combinar sus resultados."""
+        # Arrange - La barrera solo se libera si ambos procesos corren a la vez
+        barrera = threading.Barrier(2, timeout=5)
+        despachar = despachar_por_comando(
+            {
+                "bandit": subprocess.CompletedProcess(
+                    args=["bandit"],
+                    returncode=0,
+                    stdout=BANDIT_SIN_VULNERABILIDADES_JSON,
+                    stderr=b"",
+                ),
+                "safety": subprocess.CompletedProcess(
+                    args=["safety"], returncode=0, stdout="[]", stderr=""
+                ),
+            }
         )
 
-        # Arrange - Mocks con vulnerabilidades
         def mock_run(cmd, **kwargs):
-            if cmd[0] == "bandit":
-                return MagicMock(
-                    returncode=1,
-                    stdout=json.dumps(
-                        {
-                            "results": [
-                                {
-                                    "issue_severity": "HIGH",
-                                    "issue_confidence": "HIGH",
-                                    "issue_text": "Use of eval",
-                                    "line_number": 10,
-                                    "filename": "src/app.py",
-                                    "test_id": "B307",
-                                }
-                            ],
-                            "metrics": {"_totals": {"HIGH": 1, "MEDIUM": 0, "LOW": 0}},
-                        }
-                    ),
-                    stderr="",
-                )
-            if cmd[0] == "safety":
-                return MagicMock(
-                    returncode=1,
-                    stdout=json.dumps(
-                        [
-                            {
-                                "vulnerability": "CVE-2023-99999",
-                                "package_name": "requests",
-                                "installed_version": "2.28.0",
-                                "vulnerable_spec": "<2.28.2",
-                                "advisory": "Security issue",
-                            }
-                        ]
-                    ),
-                    stderr="",
-                )
-            return MagicMock(returncode=0, stdout="", stderr="")
-
-        with patch("subprocess.run", side_effect=mock_run):
-            # Act
-            bandit_exitoso, bandit_resultados = ejecutar_bandit(proyecto_mock_completo / "src")
-            safety_exitoso, safety_vulnerabilidades = ejecutar_safety()
-            reporte = generar_reporte_seguridad(bandit_resultados, safety_vulnerabilidades)
+            barrera.wait()
+            return despachar(cmd, **kwargs)
 
-            # Assert
-            assert bandit_exitoso is False, "Bandit debe fallar con vulnerabilidades HIGH"
-            assert safety_exitoso is False, "Safety debe fallar con CVEs"
-            assert "CVE-2023-99999" in reporte, "Reporte debe incluir CVE encontrado"
-            assert "HIGH" in reporte or "high" in reporte.lower(), "Reporte debe indicar severidad"
+        subprocess_run.side_effect = mock_run
 
-    def test_manejo_de_errores_en_cascada(self, proyecto_mock_completo):
-        """Debe manejar errores en cascada (Bandit falla, Safety continúa)."""
-        from ci_guardian.validators.security import ejecutar_bandit, ejecutar_safety
+        # Act
+        exitoso, resultados_bandit, vulnerabilidades = ejecutar_auditoria_seguridad(
+            proyecto_mock_completo / "src", proyecto_mock_completo / "pyproject.toml"
+        )
 
+        # Assert
+        assert exitoso is True, "Debe pasar si Bandit y Safety pasan"
+        assert resultados_bandit["results"] == []
+        assert vulnerabilidades == []
+        assert subprocess_run.call_count == 2, "Debe ejecutar Bandit y Safety"
+
+    def test_auditoria_debe_fallar_si_alguna_herramienta_falla(
+        self, proyecto_mock_completo, subprocess_run
+    ):
+        """Debe fallar si Bandit falla aunque Safety pase."""
         # Arrange - Bandit falla por timeout, Safety OK
-        def mock_run(cmd, **kwargs):
-            if cmd[0] == "bandit":
-                raise subprocess.TimeoutExpired("bandit", 120)
-            if cmd[0] == "safety":
-                return MagicMock(returncode=0, stdout="[]", stderr="")
-            return MagicMock(returncode=0, stdout="", stderr="")
+        subprocess_run.side_effect = despachar_por_comando(
+            {
+                "bandit": subprocess.TimeoutExpired("bandit", 120),
+                "safety": subprocess.CompletedProcess(
+                    args=["safety"], returncode=0, stdout="[]", stderr=""
+                ),
+            }
+        )
 
-        with patch("subprocess.run", side_effect=mock_run):
-            # Act
-            bandit_exitoso, bandit_resultados = ejecutar_bandit(proyecto_mock_completo / "src")
-            safety_exitoso, safety_vulnerabilidades = ejecutar_safety()
+        # Act
+        exitoso, resultados_bandit, vulnerabilidades = ejecutar_auditoria_seguridad(
+            proyecto_mock_completo / "src", proyecto_mock_completo / "pyproject.toml"
+        )
 
-            # Assert
-            assert bandit_exitoso is False, "Bandit debe fallar por timeout"
-            assert safety_exitoso is True, "Safety debe continuar y pasar"
-            # El sistema debe ser resiliente y no crashear
+        # Assert
+        assert exitoso is False, "Debe fallar si Bandit falla"
+        assert "error" in resultados_bandit
+        assert vulnerabilidades == []
@@ -7,10 +7,21 @@ Los tests se escriben PRIMERO siguiendo TDD estricto (fase RED).
 
 from __future__ import annotations
 
+import re
 from pathlib import Path
 
 import pytest
 
+from ci_guardian.validators.common import validar_path_seguro
+
+# Patrones de los mensajes de error (compilados una vez por módulo)
+PATRON_PATH_TRAVERSAL = re.compile(r"Path traversal detectado")
+PATRON_CONTEXTO_PATH = re.compile(r"path.*\.\.")
+PATRON_CONTEXTO_ARCHIVO = re.compile(r"archivo.*\.\.")
+PATRON_TRAVERSAL_RUTA_INVALIDA = re.compile(
+    r"path traversal detectado.*ruta inválida", re.IGNORECASE
+)
+
 
 class TestValidarPathSeguro:
     """Tests para la función validar_path_seguro()."""
@@ -18,8 +29,6 @@ class TestValidarPathSeguro:
     def test_debe_aceptar_path_normal_relativo(self) -> None:
         """Debe aceptar paths relativos normales sin '..'."""
         # Arrange & Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         path_resultado = validar_path_seguro("src/main.py")
 
         # Assert
@@ -31,8 +40,6 @@ class TestValidarPathSeguro:
         path_absoluto = tmp_path / "proyecto" / "archivo.py"
 
         # Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         path_resultado = validar_path_seguro(str(path_absoluto))
 
         # Assert
@@ -41,33 +48,25 @@ class TestValidarPathSeguro:
     def test_debe_rechazar_path_con_doble_punto_simple(self) -> None:
         """Debe rechazar path con '..' simple."""
         # Arrange & Act & Assert
-        from ci_guardian.validators.common import validar_path_seguro
-
-        with pytest.raises(ValueError, match="Path traversal detectado"):
+        with pytest.raises(ValueError, match=PATRON_PATH_TRAVERSAL):
             validar_path_seguro("../etc/passwd")
 
     def test_debe_rechazar_path_con_doble_punto_multiple(self) -> None:
         """Debe rechazar path con múltiples '..'."""
         # Arrange & Act & Assert
-        from ci_guardian.validators.common import validar_path_seguro
-
-        with pytest.raises(ValueError, match="Path traversal detectado"):
+        with pytest.raises(ValueError, match=PATRON_PATH_TRAVERSAL):
             validar_path_seguro("../../etc/passwd")
 
     def test_debe_rechazar_path_con_doble_punto_intermedio(self) -> None:
         """Debe rechazar path con '..' en medio de la ruta."""
         # Arrange & Act & Assert
-        from ci_guardian.validators.common import validar_path_seguro
-
-        with pytest.raises(ValueError, match="Path traversal detectado"):
+        with pytest.raises(ValueError, match=PATRON_PATH_TRAVERSAL):
             validar_path_seguro("foo/../bar/baz.py")
 
     def test_debe_rechazar_path_con_doble_punto_al_final(self) -> None:
         """Debe rechazar path que termina con '..'."""
         # Arrange & Act & Assert
-        from ci_guardian.validators.common import validar_path_seguro
-
-        with pytest.raises(ValueError, match="Path traversal detectado"):
+        with pytest.raises(ValueError, match=PATRON_PATH_TRAVERSAL):
             validar_path_seguro("foo/bar/..")
 
     def test_debe_aceptar_path_object_en_lugar_de_string(self) -> None:
@@ -76,8 +75,6 @@ class TestValidarPathSeguro:
         path_obj = Path("src") / "archivo.py"
 
         # Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         path_resultado = validar_path_seguro(path_obj)
 
         # Assert
@@ -89,17 +86,13 @@ class TestValidarPathSeguro:
         path_obj = Path("..") / "etc" / "passwd"
 
         # Act & Assert
-        from ci_guardian.validators.common import validar_path_seguro
-
-        with pytest.raises(ValueError, match="Path traversal detectado"):
+        with pytest.raises(ValueError, match=PATRON_PATH_TRAVERSAL):
             validar_path_seguro(path_obj)
 
     def test_mensaje_error_debe_incluir_nombre_contexto_por_defecto(self) -> None:
         """El mensaje de error debe incluir 'path' por defecto."""
         # Arrange & Act & Assert
-        from ci_guardian.validators.common import validar_path_seguro
-
-        with pytest.raises(ValueError, match="path.*\\.\\."):
+        with pytest.raises(ValueError, match=PATRON_CONTEXTO_PATH):
             validar_path_seguro("../malicious")
 
     def test_mensaje_error_debe_incluir_nombre_contexto_personalizado(
@@ -107,9 +100,7 @@ class TestValidarPathSeguro:
     ) -> None:
         """El mensaje de error debe incluir el contexto personalizado."""
         # Arrange & Act & Assert
-        from ci_guardian.validators.common import validar_path_seguro
-
-        with pytest.raises(ValueError, match="archivo.*\\.\\."):
+        with pytest.raises(ValueError, match=PATRON_CONTEXTO_ARCHIVO):
             validar_path_seguro("../malicious", nombre_contexto="archivo")
 
     def test_debe_incluir_path_en_mensaje_de_error(self) -> None:
@@ -118,16 +109,12 @@ class TestValidarPathSeguro:
         path_malicioso = "../../etc/shadow"
 
         # Act & Assert
-        from ci_guardian.validators.common import validar_path_seguro
-
         with pytest.raises(ValueError, match=path_malicioso):
             validar_path_seguro(path_malicioso)
 
     def test_debe_manejar_paths_vacios(self) -> None:
         """Debe manejar gracefully paths vacíos."""
         # Arrange & Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         path_resultado = validar_path_seguro("")
 
         # Assert - path vacío es técnicamente válido (current dir)
@@ -136,8 +123,6 @@ class TestValidarPathSeguro:
     def test_debe_manejar_punto_simple_como_directorio_actual(self) -> None:
         """Debe aceptar '.' como directorio actual."""
         # Arrange & Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         path_resultado = validar_path_seguro(".")
 
         # Assert
@@ -149,22 +134,18 @@ class TestValidarPathSeguro:
         # Ej: "version..backup.txt" (aunque inusual, es válido)
 
         # Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         # Este caso es edge - si el archivo se llama literalmente "test..py"
         # sin separadores de directorio, no es path traversal
         # Sin embargo, nuestra implementación simple detectará ".." en el string
         # Esto es CORRECTO desde una perspectiva de seguridad (better safe than sorry)
 
         # Por ahora, el test verifica que ".." se rechaza siempre
-        with pytest.raises(ValueError, match="Path traversal detectado"):
+        with pytest.raises(ValueError, match=PATRON_PATH_TRAVERSAL):
             validar_path_seguro("test..py")
 
     def test_debe_retornar_path_object_siempre(self) -> None:
         """Debe retornar siempre un objeto Path, nunca string."""
         # Arrange & Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         resultado_desde_str = validar_path_seguro("src/main.py")
         resultado_desde_path = validar_path_seguro(Path("src/main.py"))
 
@@ -181,8 +162,6 @@ class TestValidarPathSeguroCompatibilidad:
         # Arrange - simular uso actual en cli.py:_validar_path_traversal
 
         # Act & Assert - debe rechazar lo mismo que la función original
-        from ci_guardian.validators.common import validar_path_seguro
-
         # Caso que cli.py rechaza: paths con ".."
         with pytest.raises(ValueError):
             validar_path_seguro("../malicious", "repositorio")
@@ -203,8 +182,6 @@ class TestValidarPathSeguroCompatibilidad:
         ]
 
         # Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         # Validar todos los archivos
         archivos_seguros = [validar_path_seguro(str(f), "archivo") for f in archivos]
 
@@ -218,9 +195,7 @@ class TestValidarPathSeguroCompatibilidad:
         archivo_malicioso = Path("../../../etc/passwd")
 
         # Act & Assert
-        from ci_guardian.validators.common import validar_path_seguro
-
-        with pytest.raises(ValueError, match="(?i)path traversal detectado.*ruta inválida"):
+        with pytest.raises(ValueError, match=PATRON_TRAVERSAL_RUTA_INVALIDA):
             validar_path_seguro(str(archivo_malicioso), "archivo")
 
     def test_compatibilidad_con_security_validacion_directorio(self) -> None:
@@ -228,10 +203,8 @@ class TestValidarPathSeguroCompatibilidad:
         # Arrange - simular uso actual en security.py:37-38
 
         # Act & Assert - debe rechazar lo mismo
-        from ci_guardian.validators.common import validar_path_seguro
-
         # Directorio malicioso
-        with pytest.raises(ValueError, match="Path traversal detectado"):
+        with pytest.raises(ValueError, match=PATRON_PATH_TRAVERSAL):
             validar_path_seguro("../malicious", "directorio")
 
         # Directorio válido
@@ -248,8 +221,6 @@ class TestValidarPathSeguroEdgeCases:
         path_windows = "src\\main.py"
 
         # Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         path_resultado = validar_path_seguro(path_windows)
 
         # Assert - debe aceptar backslashes normales
@@ -261,19 +232,15 @@ class TestValidarPathSeguroEdgeCases:
         path_windows_malicioso = "..\\windows\\system32"
 
         # Act & Assert
-        from ci_guardian.validators.common import validar_path_seguro
-
-        with pytest.raises(ValueError, match="Path traversal detectado"):
+        with pytest.raises(ValueError, match=PATRON_PATH_TRAVERSAL):
             validar_path_seguro(path_windows_malicioso)
 
     def test_debe_manejar_paths_muy_largos(self) -> None:
         """Debe manejar paths muy largos sin problemas de performance."""
         # Arrange - path muy largo pero sin ".."
-        path_largo = "/".join([f"dir{i}" for i in range(100)]) + "/archivo.py"
+        path_largo = "/".join(f"dir{i}" for i in range(100)) + "/archivo.py"
 
         # Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         path_resultado = validar_path_seguro(path_largo)
 
         # Assert
@@ -285,8 +252,6 @@ class TestValidarPathSeguroEdgeCases:
         path_con_espacios = "Mi Proyecto/archivo con espacios.py"
 
         # Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         path_resultado = validar_path_seguro(path_con_espacios)
 
         # Assert
@@ -298,8 +263,6 @@ class TestValidarPathSeguroEdgeCases:
         path_unicode = "código/archivo_español.py"
 
         # Act
-        from ci_guardian.validators.common import validar_path_seguro
-
         path_resultado = validar_path_seguro(path_unicode)
 
         # Assert
@@ -16,9 +16,12 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pyfakefs.fake_filesystem import FakeFilesystem
+from pyfakefs.helpers import reset_ids, set_uid
 
 # Importaciones del módulo bajo prueba (fallará hasta implementar el código)
 from ci_guardian.core.venv_manager import (
+    _sistema,
     crear_venv,
     detectar_venv,
     esta_en_venv,
@@ -26,45 +29,86 @@ from ci_guardian.core.venv_manager import (
     validar_venv,
 )
 
+# Resultados de `python -m venv` (compartidos, crear_venv solo los lee)
+RESULTADO_VENV_OK = subprocess.CompletedProcess(
+    args=[sys.executable, "-m", "venv"], returncode=0, stdout="", stderr=""
+)
+RESULTADO_VENV_ERROR = subprocess.CompletedProcess(
+    args=[sys.executable, "-m", "venv"], returncode=1, stdout="", stderr="Error al crear venv"
+)
+
+
+def crear_estructura_venv(venv: Path, *ejecutables: str) -> None:
+    """
+    Crea la estructura venv/bin/ con los ejecutables indicados (modo 0o755).
+
+    touch(mode=...) crea cada archivo ya con permisos de ejecución, sin chmod aparte.
+    """
+    bin_dir = venv / "bin"
+    bin_dir.mkdir(parents=True)
+    for nombre in ejecutables:
+        (bin_dir / nombre).touch(mode=0o755)
+
+
+@pytest.fixture(autouse=True)
+def _sin_cache_sistema() -> None:
+    """
+    Limpia la caché de platform.system() del gestor de venvs.
+
+    Así los tests sin sistema_linux/sistema_windows ven el sistema real y no
+    un valor cacheado por un test anterior.
+    """
+    _sistema.cache_clear()
+
+
+@pytest.fixture
+def sistema_linux(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Hace que venv_manager se comporte como en Linux."""
+    monkeypatch.setattr("ci_guardian.core.venv_manager._sistema", lambda: "Linux")
+
+
+@pytest.fixture
+def sistema_windows(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Hace que venv_manager se comporte como en Windows."""
+    monkeypatch.setattr("ci_guardian.core.venv_manager._sistema", lambda: "Windows")
+
 
 class TestDetectarVenv:
     """Tests para la función detectar_venv()."""
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_detectar_venv_en_linux(self, proyecto_con_venv_linux: Path) -> None:
         """Debe detectar venv/ con estructura bin/python en Linux."""
-        # Arrange
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto_con_venv_linux)
+        # Act
+        resultado = detectar_venv(proyecto_con_venv_linux)
 
-            # Assert
-            assert resultado is not None, "Debe detectar el venv en Linux"
-            assert resultado.name == "venv", "Debe retornar el directorio venv/"
-            assert (resultado / "bin" / "python").exists(), "Debe tener bin/python"
+        # Assert
+        assert resultado is not None, "Debe detectar el venv en Linux"
+        assert resultado.name == "venv", "Debe retornar el directorio venv/"
+        assert (resultado / "bin" / "python").exists(), "Debe tener bin/python"
 
+    @pytest.mark.usefixtures("sistema_windows")
     def test_debe_detectar_venv_en_windows(self, proyecto_con_venv_windows: Path) -> None:
         """Debe detectar venv/ con estructura Scripts/python.exe en Windows."""
-        # Arrange
-        with patch("platform.system", return_value="Windows"):
-            # Act
-            resultado = detectar_venv(proyecto_con_venv_windows)
+        # Act
+        resultado = detectar_venv(proyecto_con_venv_windows)
 
-            # Assert
-            assert resultado is not None, "Debe detectar el venv en Windows"
-            assert resultado.name == "venv", "Debe retornar el directorio venv/"
-            assert (resultado / "Scripts" / "python.exe").exists(), "Debe tener Scripts/python.exe"
+        # Assert
+        assert resultado is not None, "Debe detectar el venv en Windows"
+        assert resultado.name == "venv", "Debe retornar el directorio venv/"
+        assert (resultado / "Scripts" / "python.exe").exists(), "Debe tener Scripts/python.exe"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_detectar_dotvenv_en_linux(self, proyecto_con_dotvenv: Path) -> None:
         """Debe detectar .venv/ como alternativa a venv/."""
-        # Arrange
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto_con_dotvenv)
+        # Act
+        resultado = detectar_venv(proyecto_con_dotvenv)
 
-            # Assert
-            assert resultado is not None, "Debe detectar .venv/"
-            assert resultado.name == ".venv", "Debe retornar el directorio .venv/"
+        # Assert
+        assert resultado is not None, "Debe detectar .venv/"
+        assert resultado.name == ".venv", "Debe retornar el directorio .venv/"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_priorizar_venv_sobre_dotvenv(self, tmp_path: Path) -> None:
         """Debe priorizar venv/ sobre .venv/ cuando ambos existen."""
         # Arrange
@@ -73,27 +117,21 @@ class TestDetectarVenv:
 
         # Crear venv/
         venv = proyecto / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
-        (venv / "bin" / "python").touch()
-        (venv / "bin" / "python").chmod(0o755)
+        crear_estructura_venv(venv, "python")
 
         # Crear .venv/
         dotvenv = proyecto / ".venv"
-        dotvenv.mkdir()
-        (dotvenv / "bin").mkdir()
-        (dotvenv / "bin" / "python").touch()
-        (dotvenv / "bin" / "python").chmod(0o755)
+        crear_estructura_venv(dotvenv, "python")
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto)
+        # Act
+        resultado = detectar_venv(proyecto)
 
-            # Assert
-            assert (
-                resultado is not None and resultado.name == "venv"
-            ), "Debe priorizar venv/ sobre .venv/"
+        # Assert
+        assert (
+            resultado is not None and resultado.name == "venv"
+        ), "Debe priorizar venv/ sobre .venv/"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_buscar_env_y_ENV_como_alternativas(self, tmp_path: Path) -> None:
         """Debe buscar env/, .env/, ENV/ si no existe venv/."""
         # Arrange
@@ -102,29 +140,37 @@ class TestDetectarVenv:
 
         # Crear solo env/
         env = proyecto / "env"
-        env.mkdir()
-        (env / "bin").mkdir()
-        (env / "bin" / "python").touch()
-        (env / "bin" / "python").chmod(0o755)
+        crear_estructura_venv(env, "python")
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto)
+        # Act
+        resultado = detectar_venv(proyecto)
 
-            # Assert
-            assert resultado is not None, "Debe detectar env/"
-            assert resultado.name == "env", "Debe retornar el directorio env/"
+        # Assert
+        assert resultado is not None, "Debe detectar env/"
+        assert resultado.name == "env", "Debe retornar el directorio env/"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_retornar_none_si_no_existe_venv(self, directorio_no_git: Path) -> None:
         """Debe retornar None si no existe ningún venv en el proyecto."""
+        # Act
+        resultado = detectar_venv(directorio_no_git)
+
+        # Assert
+        assert resultado is None, "Debe retornar None si no hay venv"
+
+    @pytest.mark.usefixtures("sistema_linux")
+    def test_debe_retornar_none_si_proyecto_no_existe(self, tmp_path: Path) -> None:
+        """Debe retornar None (sin excepción) si el directorio del proyecto no existe."""
         # Arrange
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(directorio_no_git)
+        proyecto_inexistente = tmp_path / "no_existe"
 
-            # Assert
-            assert resultado is None, "Debe retornar None si no hay venv"
+        # Act
+        resultado = detectar_venv(proyecto_inexistente)
+
+        # Assert
+        assert resultado is None, "Debe retornar None si el proyecto no existe"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_retornar_none_si_directorio_existe_pero_no_es_venv(self, tmp_path: Path) -> None:
         """Debe retornar None si el directorio venv/ existe pero no es válido."""
         # Arrange
@@ -135,13 +181,13 @@ class TestDetectarVenv:
         venv = proyecto / "venv"
         venv.mkdir()
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto)
+        # Act
+        resultado = detectar_venv(proyecto)
 
-            # Assert
-            assert resultado is None, "Debe retornar None si venv/ existe pero no es válido"
+        # Assert
+        assert resultado is None, "Debe retornar None si venv/ existe pero no es válido"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_resolver_symlinks_correctamente(self, tmp_path: Path) -> None:
         """Debe resolver symlinks y retornar el path absoluto real."""
         # Arrange
@@ -150,25 +196,20 @@ class TestDetectarVenv:
 
         # Crear venv real
         venv_real = tmp_path / "venv_real"
-        venv_real.mkdir()
-        (venv_real / "bin").mkdir()
-        (venv_real / "bin" / "python").touch()
-        (venv_real / "bin" / "python").chmod(0o755)
+        crear_estructura_venv(venv_real, "python")
 
         # Crear symlink en el proyecto
         venv_link = proyecto / "venv"
         venv_link.symlink_to(venv_real)
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto)
+        # Act
+        resultado = detectar_venv(proyecto)
 
-            # Assert
-            assert resultado is not None, "Debe detectar el venv a través del symlink"
-            assert (
-                resultado.resolve() == venv_real.resolve()
-            ), "Debe resolver el symlink al path real"
+        # Assert
+        assert resultado is not None, "Debe detectar el venv a través del symlink"
+        assert resultado.resolve() == venv_real.resolve(), "Debe resolver el symlink al path real"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_detectar_python3_si_no_existe_python(self, tmp_path: Path) -> None:
         """Debe aceptar bin/python3 si no existe bin/python."""
         # Arrange
@@ -176,19 +217,15 @@ class TestDetectarVenv:
         proyecto.mkdir()
 
         venv = proyecto / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
         # Solo crear python3, no python
-        (venv / "bin" / "python3").touch()
-        (venv / "bin" / "python3").chmod(0o755)
+        crear_estructura_venv(venv, "python3")
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto)
+        # Act
+        resultado = detectar_venv(proyecto)
 
-            # Assert
-            assert resultado is not None, "Debe detectar venv con python3"
-            assert (resultado / "bin" / "python3").exists(), "Debe tener bin/python3"
+        # Assert
+        assert resultado is not None, "Debe detectar venv con python3"
+        assert (resultado / "bin" / "python3").exists(), "Debe tener bin/python3"
 
     @pytest.mark.skipif(platform.system() != "Darwin", reason="Test específico de macOS")
     def test_debe_funcionar_en_macos(self, tmp_path: Path) -> None:
@@ -198,10 +235,7 @@ class TestDetectarVenv:
         proyecto.mkdir()
 
         venv = proyecto / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
-        (venv / "bin" / "python").touch()
-        (venv / "bin" / "python").chmod(0o755)
+        crear_estructura_venv(venv, "python")
 
         # Act (sin mock, usa el sistema real)
         resultado = detectar_venv(proyecto)
@@ -214,49 +248,47 @@ class TestDetectarVenv:
 class TestValidarVenv:
     """Tests para la función validar_venv()."""
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_validar_venv_funcional_en_linux(self, venv_linux_mock: Path) -> None:
         """Debe validar un venv funcional en Linux."""
-        # Arrange
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = validar_venv(venv_linux_mock)
+        # Act
+        resultado = validar_venv(venv_linux_mock)
 
-            # Assert
-            assert resultado is True, "Debe validar venv funcional en Linux"
+        # Assert
+        assert resultado is True, "Debe validar venv funcional en Linux"
 
+    @pytest.mark.usefixtures("sistema_windows")
     def test_debe_validar_venv_funcional_en_windows(self, venv_windows_mock: Path) -> None:
         """Debe validar un venv funcional en Windows."""
-        # Arrange
-        with patch("platform.system", return_value="Windows"):
-            # Act
-            resultado = validar_venv(venv_windows_mock)
+        # Act
+        resultado = validar_venv(venv_windows_mock)
 
-            # Assert
-            assert resultado is True, "Debe validar venv funcional en Windows"
+        # Assert
+        assert resultado is True, "Debe validar venv funcional en Windows"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_rechazar_venv_sin_ejecutable_python(self, venv_corrupto: Path) -> None:
         """Debe rechazar venv que no tiene ejecutable Python."""
-        # Arrange
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = validar_venv(venv_corrupto)
+        # Act
+        resultado = validar_venv(venv_corrupto)
 
-            # Assert
-            assert resultado is False, "Debe rechazar venv sin ejecutable Python"
+        # Assert
+        assert resultado is False, "Debe rechazar venv sin ejecutable Python"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_rechazar_directorio_vacio(self, tmp_path: Path) -> None:
         """Debe rechazar un directorio vacío que no es venv."""
         # Arrange
         venv_vacio = tmp_path / "venv"
         venv_vacio.mkdir()
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = validar_venv(venv_vacio)
+        # Act
+        resultado = validar_venv(venv_vacio)
 
-            # Assert
-            assert resultado is False, "Debe rechazar directorio vacío"
+        # Assert
+        assert resultado is False, "Debe rechazar directorio vacío"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_rechazar_venv_sin_bin_o_scripts(self, tmp_path: Path) -> None:
         """Debe rechazar venv sin estructura bin/ o Scripts/."""
         # Arrange
@@ -265,306 +297,269 @@ class TestValidarVenv:
         # Crear python directamente sin bin/
         (venv / "python").touch()
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = validar_venv(venv)
+        # Act
+        resultado = validar_venv(venv)
 
-            # Assert
-            assert resultado is False, "Debe rechazar venv sin estructura bin/ o Scripts/"
+        # Assert
+        assert resultado is False, "Debe rechazar venv sin estructura bin/ o Scripts/"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_rechazar_ejecutable_python_sin_permisos_en_linux(
         self, venv_sin_permisos: Path
     ) -> None:
         """Debe rechazar venv con Python sin permisos de ejecución en Linux."""
-        # Arrange
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = validar_venv(venv_sin_permisos)
+        # Act
+        resultado = validar_venv(venv_sin_permisos)
 
-            # Assert
-            assert resultado is False, "Debe rechazar Python sin permisos de ejecución"
+        # Assert
+        assert resultado is False, "Debe rechazar Python sin permisos de ejecución"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_validar_venv_con_python3_en_linux(self, tmp_path: Path) -> None:
         """Debe validar venv que solo tiene python3 en lugar de python."""
         # Arrange
         venv = tmp_path / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
         # Solo python3
-        (venv / "bin" / "python3").touch()
-        (venv / "bin" / "python3").chmod(0o755)
+        crear_estructura_venv(venv, "python3")
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = validar_venv(venv)
+        # Act
+        resultado = validar_venv(venv)
 
-            # Assert
-            assert resultado is True, "Debe validar venv con python3"
+        # Assert
+        assert resultado is True, "Debe validar venv con python3"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_rechazar_path_que_no_existe(self, tmp_path: Path) -> None:
         """Debe rechazar un path que no existe."""
         # Arrange
         venv_inexistente = tmp_path / "venv_inexistente"
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = validar_venv(venv_inexistente)
+        # Act
+        resultado = validar_venv(venv_inexistente)
 
-            # Assert
-            assert resultado is False, "Debe rechazar path que no existe"
+        # Assert
+        assert resultado is False, "Debe rechazar path que no existe"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_rechazar_path_que_es_archivo(self, tmp_path: Path) -> None:
         """Debe rechazar un path que apunta a un archivo en lugar de directorio."""
         # Arrange
         archivo = tmp_path / "no_es_directorio.txt"
         archivo.touch()
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = validar_venv(archivo)
+        # Act
+        resultado = validar_venv(archivo)
 
-            # Assert
-            assert resultado is False, "Debe rechazar archivo como venv"
+        # Assert
+        assert resultado is False, "Debe rechazar archivo como venv"
 
 
 class TestCrearVenv:
     """Tests para la función crear_venv()."""
 
-    def test_debe_crear_venv_exitosamente_en_linux(self, tmp_path: Path) -> None:
+    @pytest.mark.usefixtures("sistema_linux")
+    def test_debe_crear_venv_exitosamente_en_linux(
+        self, tmp_path: Path, subprocess_run: MagicMock
+    ) -> None:
         """Debe crear un nuevo venv funcional en Linux."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
 
-        mock_subprocess = MagicMock()
-        mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        subprocess_run.return_value = RESULTADO_VENV_OK
 
-        with (
-            patch("platform.system", return_value="Linux"),
-            patch("subprocess.run", mock_subprocess),
-            patch("ci_guardian.core.venv_manager.validar_venv", return_value=True) as mock_validar,
-        ):
+        with patch("ci_guardian.core.venv_manager.validar_venv", return_value=True) as mock_validar:
             # Act
             resultado = crear_venv(proyecto)
 
             # Assert
             assert resultado == proyecto / "venv", "Debe retornar path al venv creado"
-            mock_subprocess.assert_called_once()
+            subprocess_run.assert_called_once()
             # Verificar que el comando es correcto
-            args = mock_subprocess.call_args[0][0]
+            args = subprocess_run.call_args[0][0]
             assert args[0] == sys.executable, "Debe usar sys.executable"
             assert args[1] == "-m", "Debe usar -m para módulo"
             assert args[2] == "venv", "Debe llamar al módulo venv"
             # Verificar que se validó el venv creado
             mock_validar.assert_called_once()
 
-    def test_debe_crear_venv_exitosamente_en_windows(self, tmp_path: Path) -> None:
+    @pytest.mark.usefixtures("sistema_windows")
+    def test_debe_crear_venv_exitosamente_en_windows(
+        self, tmp_path: Path, subprocess_run: MagicMock
+    ) -> None:
         """Debe crear un nuevo venv funcional en Windows."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
 
-        mock_subprocess = MagicMock()
-        mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        subprocess_run.return_value = RESULTADO_VENV_OK
 
-        with (
-            patch("platform.system", return_value="Windows"),
-            patch("subprocess.run", mock_subprocess),
-            patch("ci_guardian.core.venv_manager.validar_venv", return_value=True),
-        ):
+        with patch("ci_guardian.core.venv_manager.validar_venv", return_value=True):
             # Act
             resultado = crear_venv(proyecto)
 
             # Assert
             assert resultado == proyecto / "venv", "Debe retornar path al venv creado"
-            mock_subprocess.assert_called_once()
+            subprocess_run.assert_called_once()
 
-    def test_debe_crear_venv_con_nombre_personalizado(self, tmp_path: Path) -> None:
+    @pytest.mark.usefixtures("sistema_linux")
+    def test_debe_crear_venv_con_nombre_personalizado(
+        self, tmp_path: Path, subprocess_run: MagicMock
+    ) -> None:
         """Debe crear venv con nombre personalizado."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
         nombre_custom = ".venv_custom"
 
-        mock_subprocess = MagicMock()
-        mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        subprocess_run.return_value = RESULTADO_VENV_OK
 
-        with (
-            patch("platform.system", return_value="Linux"),
-            patch("subprocess.run", mock_subprocess),
-            patch("ci_guardian.core.venv_manager.validar_venv", return_value=True),
-        ):
+        with patch("ci_guardian.core.venv_manager.validar_venv", return_value=True):
             # Act
             resultado = crear_venv(proyecto, nombre_venv=nombre_custom)
 
             # Assert
             assert resultado == proyecto / nombre_custom, "Debe crear venv con nombre personalizado"
-            args = mock_subprocess.call_args[0][0]
+            args = subprocess_run.call_args[0][0]
             assert str(proyecto / nombre_custom) in " ".join(
                 args
             ), "Debe usar el nombre personalizado"
 
-    def test_debe_levantar_runtime_error_si_subprocess_falla(self, tmp_path: Path) -> None:
+    @pytest.mark.usefixtures("sistema_linux")
+    def test_debe_levantar_runtime_error_si_subprocess_falla(
+        self, tmp_path: Path, subprocess_run: MagicMock
+    ) -> None:
         """Debe levantar RuntimeError si subprocess.run falla."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
 
-        mock_subprocess = MagicMock()
-        mock_subprocess.return_value = MagicMock(
-            returncode=1, stdout="", stderr="Error al crear venv"
-        )
+        subprocess_run.return_value = RESULTADO_VENV_ERROR
 
-        with (
-            patch("platform.system", return_value="Linux"),
-            patch("subprocess.run", mock_subprocess),
-        ):
-            # Act & Assert
-            with pytest.raises(RuntimeError, match="Error al crear el entorno virtual"):
-                crear_venv(proyecto)
+        # Act & Assert
+        with pytest.raises(RuntimeError, match="Error al crear el entorno virtual"):
+            crear_venv(proyecto)
 
-    def test_debe_levantar_runtime_error_si_venv_creado_no_es_valido(self, tmp_path: Path) -> None:
+    @pytest.mark.usefixtures("sistema_linux")
+    def test_debe_levantar_runtime_error_si_venv_creado_no_es_valido(
+        self, tmp_path: Path, subprocess_run: MagicMock
+    ) -> None:
         """Debe levantar RuntimeError si el venv creado no pasa validación."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
 
-        mock_subprocess = MagicMock()
-        mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        subprocess_run.return_value = RESULTADO_VENV_OK
 
-        with (
-            patch("platform.system", return_value="Linux"),
-            patch("subprocess.run", mock_subprocess),
-            patch("ci_guardian.core.venv_manager.validar_venv", return_value=False),
-        ):  # Validación falla
+        # Validación falla
+        with patch("ci_guardian.core.venv_manager.validar_venv", return_value=False):
             # Act & Assert
             with pytest.raises(RuntimeError, match="El entorno virtual creado no es válido"):
                 crear_venv(proyecto)
 
-    def test_debe_usar_shell_false_por_seguridad(self, tmp_path: Path) -> None:
-        """Debe usar shell=False en subprocess.run por seguridad."""
+    @pytest.mark.usefixtures("sistema_linux")
+    def test_debe_invocar_subprocess_cumpliendo_contrato(
+        self, tmp_path: Path, subprocess_run: MagicMock
+    ) -> None:
+        """Debe llamar a subprocess.run con shell=False, timeout y salida capturada."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
 
-        mock_subprocess = MagicMock()
-        mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        subprocess_run.return_value = RESULTADO_VENV_OK
 
-        with (
-            patch("platform.system", return_value="Linux"),
-            patch("subprocess.run", mock_subprocess),
-            patch("ci_guardian.core.venv_manager.validar_venv", return_value=True),
-        ):
+        with patch("ci_guardian.core.venv_manager.validar_venv", return_value=True):
             # Act
             crear_venv(proyecto)
 
-            # Assert
-            # Verificar que shell NO está en True
-            call_kwargs = mock_subprocess.call_args[1]
-            assert call_kwargs.get("shell") is not True, "NO debe usar shell=True por seguridad"
-
-    def test_debe_tener_timeout_en_subprocess(self, tmp_path: Path) -> None:
-        """Debe configurar un timeout en subprocess.run."""
+        # Assert
+        call_kwargs = subprocess_run.call_args.kwargs
+        assert call_kwargs.get("shell") is not True, "NO debe usar shell=True por seguridad"
+        assert call_kwargs.get("timeout", 0) > 0, "Debe configurar un timeout mayor a 0"
+        assert call_kwargs.get("capture_output") is True or (
+            call_kwargs.get("stdout") is not None and call_kwargs.get("stderr") is not None
+        ), "Debe capturar stdout y stderr"
+
+    @pytest.mark.usefixtures("sistema_linux")
+    def test_debe_manejar_subprocess_timeout_exception(
+        self, tmp_path: Path, subprocess_run: MagicMock
+    ) -> None:
+        """Debe manejar TimeoutExpired exception de subprocess."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
 
-        mock_subprocess = MagicMock()
-        mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        subprocess_run.side_effect = subprocess.TimeoutExpired(cmd="venv", timeout=60)
 
-        with (
-            patch("platform.system", return_value="Linux"),
-            patch("subprocess.run", mock_subprocess),
-            patch("ci_guardian.core.venv_manager.validar_venv", return_value=True),
-        ):
-            # Act
+        # Act & Assert
+        with pytest.raises(RuntimeError, match="Timeout al crear el entorno virtual"):
             crear_venv(proyecto)
 
-            # Assert
-            call_kwargs = mock_subprocess.call_args[1]
-            assert "timeout" in call_kwargs, "Debe configurar timeout en subprocess.run"
-            assert call_kwargs["timeout"] > 0, "Timeout debe ser mayor a 0"
-
-    def test_debe_capturar_output_de_subprocess(self, tmp_path: Path) -> None:
-        """Debe capturar stdout y stderr de subprocess.run."""
+    def test_debe_crear_venv_en_proceso_sin_subprocess(self, tmp_path: Path) -> None:
+        """Con en_proceso=True debe usar venv.EnvBuilder y no lanzar subprocess."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
 
-        mock_subprocess = MagicMock()
-        mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
-
         with (
-            patch("platform.system", return_value="Linux"),
-            patch("subprocess.run", mock_subprocess),
+            patch("ci_guardian.core.venv_manager.venv.EnvBuilder") as mock_builder,
             patch("ci_guardian.core.venv_manager.validar_venv", return_value=True),
         ):
             # Act
-            crear_venv(proyecto)
+            resultado = crear_venv(proyecto, en_proceso=True)
 
-            # Assert
-            call_kwargs = mock_subprocess.call_args[1]
-            assert call_kwargs.get("capture_output") is True or (
-                call_kwargs.get("stdout") is not None and call_kwargs.get("stderr") is not None
-            ), "Debe capturar stdout y stderr"
+        # Assert (el conftest hace fallar cualquier subprocess.run no mockeado)
+        assert resultado == proyecto / "venv"
+        assert mock_builder.call_args.kwargs["with_pip"] is True
+        mock_builder.return_value.create.assert_called_once_with(proyecto / "venv")
 
-    def test_debe_manejar_subprocess_timeout_exception(self, tmp_path: Path) -> None:
-        """Debe manejar TimeoutExpired exception de subprocess."""
+    def test_debe_levantar_runtime_error_si_envbuilder_falla(self, tmp_path: Path) -> None:
+        """Debe convertir los errores de venv.EnvBuilder en RuntimeError."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
 
-        mock_subprocess = MagicMock()
-        mock_subprocess.side_effect = subprocess.TimeoutExpired(cmd="venv", timeout=60)
+        with patch("ci_guardian.core.venv_manager.venv.EnvBuilder") as mock_builder:
+            mock_builder.return_value.create.side_effect = subprocess.CalledProcessError(
+                1, ["python", "-m", "ensurepip"]
+            )
 
-        with (
-            patch("platform.system", return_value="Linux"),
-            patch("subprocess.run", mock_subprocess),
-        ):
             # Act & Assert
-            with pytest.raises(RuntimeError, match="Timeout al crear el entorno virtual"):
-                crear_venv(proyecto)
-
-    def test_debe_rechazar_nombre_venv_con_path_traversal(self, tmp_path: Path) -> None:
-        """Debe rechazar nombres de venv con path traversal (..)."""
-        # Arrange
-        proyecto = tmp_path / "proyecto"
-        proyecto.mkdir()
-
-        # Act & Assert
-        with pytest.raises(ValueError, match="Nombre de venv no válido"):
-            crear_venv(proyecto, nombre_venv="../malicious")
-
-        with pytest.raises(ValueError, match="Nombre de venv no válido"):
-            crear_venv(proyecto, nombre_venv="/etc/passwd")
-
-    def test_debe_rechazar_nombre_venv_con_caracteres_peligrosos(self, tmp_path: Path) -> None:
-        """Debe rechazar nombres de venv con caracteres peligrosos."""
+            with pytest.raises(RuntimeError, match="Error al crear el entorno virtual"):
+                crear_venv(proyecto, en_proceso=True)
+
+    @pytest.mark.parametrize(
+        ("nombre_venv", "patron"),
+        [
+            pytest.param("../malicious", "Nombre de venv no válido", id="path_traversal"),
+            pytest.param("/etc/passwd", "Nombre de venv no válido", id="path_traversal_absoluto"),
+            pytest.param("venv; rm -rf /", "Nombre de venv no válido", id="punto_y_coma"),
+            pytest.param("venv && malicious", "Nombre de venv no válido", id="ampersand"),
+            # En Linux, las letras de unidad se detectan por ":" (caracteres peligrosos);
+            # en Windows, por is_absolute()
+            pytest.param(
+                "C:\\Windows\\System32\\venv",
+                "(path absoluto|caracteres peligrosos)",
+                id="absoluto_windows_backslash",
+            ),
+            pytest.param(
+                "D:/tmp/venv", "(path absoluto|caracteres peligrosos)", id="absoluto_windows_slash"
+            ),
+            pytest.param("/tmp/venv", "path absoluto", id="absoluto_unix_tmp"),  # noqa: S108
+            pytest.param("/etc/malicious_venv", "path absoluto", id="absoluto_unix_etc"),
+        ],
+    )
+    def test_debe_rechazar_nombre_venv_invalido(
+        self, tmp_path: Path, nombre_venv: str, patron: str
+    ) -> None:
+        """Debe rechazar path traversal, caracteres peligrosos y paths absolutos."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
 
         # Act & Assert
-        with pytest.raises(ValueError, match="Nombre de venv no válido"):
-            crear_venv(proyecto, nombre_venv="venv; rm -rf /")
-
-        with pytest.raises(ValueError, match="Nombre de venv no válido"):
-            crear_venv(proyecto, nombre_venv="venv && malicious")
-
-    def test_debe_rechazar_paths_absolutos_windows(self, tmp_path: Path) -> None:
-        """Debe rechazar paths absolutos de Windows (C:\\, D:/, etc.)."""
-        # Arrange
-        proyecto = tmp_path / "proyecto"
-        proyecto.mkdir()
-
-        # Act & Assert - Windows drive letters
-        # En Linux, estos paths se detectan por ":" (caracteres peligrosos)
-        # En Windows, se detectan por is_absolute()
-        with pytest.raises(ValueError, match="(path absoluto|caracteres peligrosos)"):
-            crear_venv(proyecto, nombre_venv="C:\\Windows\\System32\\venv")
-
-        with pytest.raises(ValueError, match="(path absoluto|caracteres peligrosos)"):
-            crear_venv(proyecto, nombre_venv="D:/tmp/venv")
+        with pytest.raises(ValueError, match=patron):
+            crear_venv(proyecto, nombre_venv=nombre_venv)
 
     @pytest.mark.skipif(platform.system() != "Windows", reason="UNC paths only on Windows")
     def test_debe_rechazar_unc_paths_windows(self, tmp_path: Path) -> None:
@@ -579,30 +574,15 @@ class TestCrearVenv:
         with pytest.raises(ValueError, match="path absoluto"):
             crear_venv(proyecto, nombre_venv="\\\\server\\share\\venv")
 
-    def test_debe_rechazar_paths_absolutos_unix(self, tmp_path: Path) -> None:
-        """Debe rechazar paths absolutos Unix (/path)."""
-        # Arrange
-        proyecto = tmp_path / "proyecto"
-        proyecto.mkdir()
-
-        # Act & Assert
-        with pytest.raises(ValueError, match="path absoluto"):
-            crear_venv(proyecto, nombre_venv="/tmp/venv")  # noqa: S108 - Testing path validation
-
-        with pytest.raises(ValueError, match="path absoluto"):
-            crear_venv(
-                proyecto, nombre_venv="/etc/malicious_venv"
-            )  # noqa: S108 - Testing path validation
-
-    @pytest.mark.skipif(platform.system() != "Windows", reason="Windows-specific test")
+    @pytest.mark.usefixtures("sistema_windows")
     def test_debe_rechazar_nombres_reservados_windows(self, tmp_path: Path) -> None:
         """Debe rechazar nombres reservados de Windows (CON, PRN, AUX, etc.)."""
         # Arrange
         proyecto = tmp_path / "proyecto"
         proyecto.mkdir()
 
-        # Act & Assert
-        nombres_reservados = ["CON", "PRN", "AUX", "NUL", "COM1", "LPT1"]
+        # Act & Assert - también con extensión o en minúsculas
+        nombres_reservados = ["CON", "PRN", "AUX", "NUL", "COM1", "LPT1", "con.venv", "Lpt9"]
         for nombre in nombres_reservados:
             with pytest.raises(ValueError, match="nombre reservado"):
                 crear_venv(proyecto, nombre_venv=nombre)
@@ -611,70 +591,62 @@ class TestCrearVenv:
 class TestObtenerPythonEjecutable:
     """Tests para la función obtener_python_ejecutable()."""
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_retornar_bin_python_en_linux(self, venv_linux_mock: Path) -> None:
         """Debe retornar bin/python en Linux/macOS."""
-        # Arrange
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = obtener_python_ejecutable(venv_linux_mock)
+        # Act
+        resultado = obtener_python_ejecutable(venv_linux_mock)
 
-            # Assert
-            assert (
-                resultado == venv_linux_mock / "bin" / "python"
-            ), "Debe retornar bin/python en Linux"
-            assert resultado.exists(), "El ejecutable debe existir"
+        # Assert
+        assert resultado == venv_linux_mock / "bin" / "python", "Debe retornar bin/python en Linux"
+        assert resultado.exists(), "El ejecutable debe existir"
 
+    @pytest.mark.usefixtures("sistema_windows")
     def test_debe_retornar_scripts_python_exe_en_windows(self, venv_windows_mock: Path) -> None:
         """Debe retornar Scripts/python.exe en Windows."""
-        # Arrange
-        with patch("platform.system", return_value="Windows"):
-            # Act
-            resultado = obtener_python_ejecutable(venv_windows_mock)
+        # Act
+        resultado = obtener_python_ejecutable(venv_windows_mock)
 
-            # Assert
-            assert (
-                resultado == venv_windows_mock / "Scripts" / "python.exe"
-            ), "Debe retornar Scripts/python.exe en Windows"
-            assert resultado.exists(), "El ejecutable debe existir"
+        # Assert
+        assert (
+            resultado == venv_windows_mock / "Scripts" / "python.exe"
+        ), "Debe retornar Scripts/python.exe en Windows"
+        assert resultado.exists(), "El ejecutable debe existir"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_resolver_path_correctamente(self, venv_linux_mock: Path) -> None:
         """Debe resolver el path con .resolve()."""
-        # Arrange
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = obtener_python_ejecutable(venv_linux_mock)
+        # Act
+        resultado = obtener_python_ejecutable(venv_linux_mock)
 
-            # Assert
-            assert resultado.is_absolute(), "Debe retornar path absoluto"
-            assert resultado == resultado.resolve(), "Debe estar resuelto"
+        # Assert
+        assert resultado.is_absolute(), "Debe retornar path absoluto"
+        assert resultado == resultado.resolve(), "Debe estar resuelto"
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_levantar_filenotfound_si_no_existe_ejecutable(self, venv_corrupto: Path) -> None:
         """Debe levantar FileNotFoundError si no existe el ejecutable."""
         # Arrange
-        with patch("platform.system", return_value="Linux"):
-            # Act & Assert
-            with pytest.raises(FileNotFoundError, match="Ejecutable Python no encontrado"):
-                obtener_python_ejecutable(venv_corrupto)
+        # Act & Assert
+        with pytest.raises(FileNotFoundError, match="Ejecutable Python no encontrado"):
+            obtener_python_ejecutable(venv_corrupto)
 
+    @pytest.mark.usefixtures("sistema_linux")
     def test_debe_levantar_filenotfound_si_venv_no_existe(self, tmp_path: Path) -> None:
         """Debe levantar FileNotFoundError si el venv no existe."""
         # Arrange
         venv_inexistente = tmp_path / "venv_inexistente"
 
-        with patch("platform.system", return_value="Linux"):
-            # Act & Assert
-            with pytest.raises(FileNotFoundError, match="Ejecutable Python no encontrado"):
-                obtener_python_ejecutable(venv_inexistente)
+        # Act & Assert
+        with pytest.raises(FileNotFoundError, match="Ejecutable Python no encontrado"):
+            obtener_python_ejecutable(venv_inexistente)
 
     @pytest.mark.skipif(platform.system() != "Darwin", reason="Test específico de macOS")
     def test_debe_funcionar_en_macos(self, tmp_path: Path) -> None:
         """Debe funcionar correctamente en macOS (misma lógica que Linux)."""
         # Arrange
         venv = tmp_path / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
-        (venv / "bin" / "python").touch()
-        (venv / "bin" / "python").chmod(0o755)
+        crear_estructura_venv(venv, "python")
 
         # Act (sin mock, usa el sistema real)
         resultado = obtener_python_ejecutable(venv)
@@ -775,72 +747,72 @@ class TestEstaEnVenv:
 
 
 class TestEdgeCases:
-    """Tests para casos límite y de seguridad."""
-
-    def test_debe_manejar_venv_en_ruta_con_espacios(self, tmp_path: Path) -> None:
-        """Debe manejar correctamente venvs en rutas con espacios."""
-        # Arrange
-        proyecto = tmp_path / "proyecto con espacios"
-        proyecto.mkdir()
-
-        venv = proyecto / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
-        (venv / "bin" / "python").touch()
-        (venv / "bin" / "python").chmod(0o755)
-
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto)
-
-            # Assert
-            assert resultado is not None, "Debe manejar rutas con espacios"
-            assert "espacios" in str(resultado.parent), "Debe mantener la ruta correcta"
-
-    def test_debe_manejar_venv_en_ruta_con_unicode(self, tmp_path: Path) -> None:
-        """Debe manejar correctamente venvs en rutas con caracteres Unicode."""
+    """
+    Tests para casos límite y de seguridad.
+
+    Salvo crear_venv (que lanza `python -m venv`), trabajan sobre el
+    filesystem en memoria de pyfakefs: solo ejercitan lógica de paths.
+    """
+
+    @pytest.fixture
+    def raiz(self, fs: FakeFilesystem) -> Path:
+        """Directorio base de los proyectos en el filesystem en memoria."""
+        raiz = Path("/trabajo")
+        raiz.mkdir()
+        return raiz
+
+    @pytest.mark.usefixtures("sistema_linux")
+    @pytest.mark.parametrize(
+        ("nombre_proyecto", "archivos_extra"),
+        [
+            pytest.param("proyecto con espacios", (), id="ruta_con_espacios"),
+            pytest.param("proyecto_ñoño_测试", (), id="ruta_con_unicode"),
+            # pyenv-virtualenv usa la misma estructura que venv
+            pytest.param("proyecto", (".python-version",), id="pyenv_virtualenv"),
+        ],
+    )
+    def test_debe_detectar_venv_en_proyectos_variados(
+        self, raiz: Path, nombre_proyecto: str, archivos_extra: tuple[str, ...]
+    ) -> None:
+        """Debe detectar venv/ con espacios o Unicode en la ruta y con pyenv."""
         # Arrange
-        proyecto = tmp_path / "proyecto_ñoño_测试"
+        proyecto = raiz / nombre_proyecto
         proyecto.mkdir()
+        for nombre in archivos_extra:
+            (proyecto / nombre).touch()
 
-        venv = proyecto / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
-        (venv / "bin" / "python").touch()
-        (venv / "bin" / "python").chmod(0o755)
+        crear_estructura_venv(proyecto / "venv", "python")
 
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto)
+        # Act
+        resultado = detectar_venv(proyecto)
 
-            # Assert
-            assert resultado is not None, "Debe manejar rutas con Unicode"
+        # Assert
+        assert resultado is not None, f"Debe detectar el venv en {nombre_proyecto!r}"
+        assert resultado == proyecto / "venv", "Debe mantener la ruta correcta"
 
-    def test_debe_validar_permisos_de_lectura_en_directorio(self, tmp_path: Path) -> None:
+    @pytest.mark.usefixtures("sistema_linux")
+    def test_debe_validar_permisos_de_lectura_en_directorio(self, raiz: Path) -> None:
         """Debe manejar directorios sin permisos de lectura."""
         # Arrange
-        proyecto = tmp_path / "proyecto"
+        proyecto = raiz / "proyecto"
         proyecto.mkdir()
 
         venv = proyecto / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
-        (venv / "bin" / "python").touch()
-        (venv / "bin" / "python").chmod(0o755)
+        crear_estructura_venv(venv, "python")
 
-        # Quitar permisos de lectura al proyecto
+        # Quitar permisos de lectura al proyecto y actuar como usuario sin
+        # privilegios (root ignora los permisos, también en pyfakefs)
         proyecto.chmod(0o000)
+        set_uid(1000)
 
         try:
-            with patch("platform.system", return_value="Linux"):
-                # Act
-                resultado = detectar_venv(proyecto)
+            # Act
+            resultado = detectar_venv(proyecto)
 
-                # Assert
-                assert resultado is None, "Debe manejar directorios sin permisos de lectura"
+            # Assert
+            assert resultado is None, "Debe manejar directorios sin permisos de lectura"
         finally:
-            # Restaurar permisos para cleanup
-            proyecto.chmod(0o755)
+            reset_ids()
 
     def test_debe_rechazar_crear_venv_en_directorio_sin_permisos_escritura(
         self, tmp_path: Path
@@ -862,96 +834,58 @@ class TestEdgeCases:
             # Restaurar permisos para cleanup
             proyecto.chmod(0o755)
 
-    def test_debe_manejar_multiples_versiones_python_en_venv(self, tmp_path: Path) -> None:
-        """Debe detectar venv con múltiples versiones de Python."""
-        # Arrange
-        venv = tmp_path / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
-        (venv / "bin" / "python").touch()
-        (venv / "bin" / "python3").touch()
-        (venv / "bin" / "python3.12").touch()
-        (venv / "bin" / "python").chmod(0o755)
-        (venv / "bin" / "python3").chmod(0o755)
-        (venv / "bin" / "python3.12").chmod(0o755)
-
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = validar_venv(venv)
-
-            # Assert
-            assert resultado is True, "Debe validar venv con múltiples versiones Python"
-
-    def test_debe_resolver_paths_relativos_correctamente(self, tmp_path: Path) -> None:
-        """Debe resolver correctamente paths relativos."""
-        # Arrange
-        proyecto = tmp_path / "proyecto"
-        proyecto.mkdir()
-
-        venv = proyecto / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
-        (venv / "bin" / "python").touch()
-        (venv / "bin" / "python").chmod(0o755)
+    def test_debe_levantar_permission_error_si_proyecto_no_es_escribible(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, subprocess_run: MagicMock
+    ) -> None:
+        """Debe levantar PermissionError sin lanzar subprocess si no hay permisos de escritura."""
+        monkeypatch.setattr("ci_guardian.core.venv_manager.os.access", lambda *_: False)
 
-        # Usar path relativo
-        import os
+        with pytest.raises(PermissionError, match="sin permisos de escritura"):
+            crear_venv(tmp_path)
 
-        cwd_original = os.getcwd()
-        try:
-            os.chdir(tmp_path)
-            proyecto_relativo = Path("proyecto")
+        subprocess_run.assert_not_called()
 
-            with patch("platform.system", return_value="Linux"):
-                # Act
-                resultado = detectar_venv(proyecto_relativo)
+    def test_debe_levantar_runtime_error_si_proyecto_no_existe(
+        self, tmp_path: Path, subprocess_run: MagicMock
+    ) -> None:
+        """Debe distinguir un proyecto inexistente de un problema de permisos."""
+        with pytest.raises(RuntimeError, match="el directorio del proyecto no existe"):
+            crear_venv(tmp_path / "no_existe")
 
-                # Assert
-                assert resultado is not None, "Debe manejar paths relativos"
-                assert resultado.is_absolute(), "Debe retornar path absoluto"
-        finally:
-            os.chdir(cwd_original)
+        subprocess_run.assert_not_called()
 
-    def test_debe_detectar_pyenv_virtualenv(self, tmp_path: Path) -> None:
-        """Debe detectar virtualenvs creados con pyenv."""
+    @pytest.mark.usefixtures("sistema_linux")
+    def test_debe_manejar_multiples_versiones_python_en_venv(self, raiz: Path) -> None:
+        """Debe detectar venv con múltiples versiones de Python."""
         # Arrange
-        # pyenv-virtualenv usa la misma estructura que venv
-        proyecto = tmp_path / "proyecto"
-        proyecto.mkdir()
+        venv = raiz / "venv"
+        crear_estructura_venv(venv, "python", "python3", "python3.12")
 
-        venv = proyecto / ".python-version"  # Indicador de pyenv
-        venv.touch()
+        # Act
+        resultado = validar_venv(venv)
 
-        venv_dir = proyecto / "venv"
-        venv_dir.mkdir()
-        (venv_dir / "bin").mkdir()
-        (venv_dir / "bin" / "python").touch()
-        (venv_dir / "bin" / "python").chmod(0o755)
-
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto)
-
-            # Assert
-            assert resultado is not None, "Debe detectar pyenv-virtualenv"
+        # Assert
+        assert resultado is True, "Debe validar venv con múltiples versiones Python"
 
-    def test_debe_manejar_venv_en_wsl(self, tmp_path: Path) -> None:
-        """Debe funcionar correctamente en WSL (Windows Subsystem for Linux)."""
+    @pytest.mark.usefixtures("sistema_linux")
+    def test_debe_resolver_paths_relativos_correctamente(
+        self, raiz: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Debe resolver correctamente paths relativos."""
         # Arrange
-        proyecto = tmp_path / "proyecto"
+        proyecto = raiz / "proyecto"
         proyecto.mkdir()
 
         venv = proyecto / "venv"
-        venv.mkdir()
-        (venv / "bin").mkdir()
-        (venv / "bin" / "python").touch()
-        (venv / "bin" / "python").chmod(0o755)
+        crear_estructura_venv(venv, "python")
 
-        # WSL reporta Linux como sistema
-        with patch("platform.system", return_value="Linux"):
-            # Act
-            resultado = detectar_venv(proyecto)
+        # Usar path relativo (monkeypatch restaura el cwd en el teardown)
+        monkeypatch.chdir(raiz)
+        proyecto_relativo = Path("proyecto")
 
-            # Assert
-            assert resultado is not None, "Debe funcionar en WSL"
-            assert resultado.name == "venv"
+        # Act
+        resultado = detectar_venv(proyecto_relativo)
+
+        # Assert
+        assert resultado is not None, "Debe manejar paths relativos"
+        assert resultado.is_absolute(), "Debe retornar path absoluto"